@@ -1,41 +1,96 @@
 from __future__ import annotations
-import time, sys, pygame
+import time, sys, threading, pygame
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import TYPE_CHECKING, Optional, List, Protocol, Tuple
 
 from . import config, screens, render
-from .songs import list_songs
 from .charts import (
+    ChartReader,
     list_charts,
     next_new_chart_path,
-    load_chart_from_path,
-    save_chart_to_path,
     delete_chart,
 )
-from .gameplay import Note, GameplayManager, spawn_notes, cleanup_notes
+from .gameplay import NoteTrack, GameplayManager
+from .judge import Judge, Judgement
+from .input_capture import InputCapture
+from .journal import RecordingJournal, recover_journals
+from .profiler import PROFILER
+from .replay import Ghost, Replay, load_ghost, pb_path, quantize, save_replay
+from .telemetry import RunTelemetry
+from .timing import FramePacer, FrameStats, target_hz
 from .data_manager import DataManager, Profile
 
+if TYPE_CHECKING:
+    # Imported by the startup loader, off the path to the first frame
+    from .library import SongLibrary
+    from .prefetch import Prefetcher
+
+
+class MusicBackend(Protocol):
+    """The slice of pygame.mixer.music the game uses."""
+
+    def load(self, filename, namehint: str = "") -> None: ...
+    def play(self) -> None: ...
+    def stop(self) -> None: ...
+    def pause(self) -> None: ...
+    def unpause(self) -> None: ...
+    def get_busy(self) -> bool: ...
+    def get_pos(self) -> int: ...
+
+
+# States that change every frame and are always redrawn in full
+LIVE_STATES = ("game", "pause_countdown")
+
 
 @dataclass
 class Message:
     text: str
     until_ts: float
     next_action: Optional[str] = None
+    # Queued notices wait for each other instead of replacing one another
+    notice: bool = False
 
 
 class App:
-    def __init__(self) -> None:
-        pygame.init()
-        pygame.mixer.init()
-        self.screen = pygame.display.set_mode((config.WIDTH, config.HEIGHT))
-        self.clock = pygame.time.Clock()
+    def __init__(
+        self,
+        music: Optional[MusicBackend] = None,
+        assets_dir: Path = config.ASSETS_DIR,
+    ) -> None:
+        # Only what the splash needs; the mixer, save data and the song
+        # library load on a background thread behind it (see _load)
+        self.assets_dir = assets_dir
+        pygame.display.init()
+        pygame.font.init()
         pygame.display.set_caption("Python Hero")
-
-        self.gameplay_manager = GameplayManager()
+        # pygame.mixer.music unless a test harness supplies its own player
+        self.music = music or pygame.mixer.music
+        if config.FRAME_MODE == "vsync":
+            self.screen = pygame.display.set_mode(
+                (config.WIDTH, config.HEIGHT), pygame.SCALED, vsync=1
+            )
+        else:
+            self.screen = pygame.display.set_mode((config.WIDTH, config.HEIGHT))
+        self.pacer = FramePacer(target_hz())
+        self.frame_stats = FrameStats()
+
+        # Redraw-on-demand bookkeeping for static screens
+        self.dirty = True
+        self.drawn_state: Optional[str] = None
+        self.focused = True
+        self.last_input = time.perf_counter()
+        # Shown under the profiler overlay, e.g. the last export path
+        self.profiler_status = ""
+        self.profiler_panel: Optional[pygame.Surface] = None
+        self.profiler_panel_at = 0.0
+
+        self.gameplay_manager = GameplayManager(self.music.get_pos)
+        self.input = InputCapture(self._lane_for_key)
         self.fonts = screens.Fonts.default()
-        self.data = DataManager()
-        self.current_profile = self.data.load_profile("Guest")
+        # Filled in by the loader; default Guest keys until then
+        self.data: Optional[DataManager] = None
+        self.current_profile = Profile("Guest")
 
         # Application State
         self.state = "splash"
@@ -44,12 +99,21 @@ class App:
         self.message: Optional[Message] = None
 
         # Song & Chart State
-        self.songs = list_songs(config.ASSETS_DIR)
+        self.library: Optional[SongLibrary] = None
+        self.songs: List[Path] = []
         self.song_index = 0
         self.song_path: Optional[Path] = None
         self.charts: List[Path] = []
         self.chart_index = 0
+        # Charts rebuilt from takes a crash or quit interrupted, and the
+        # takes that could not be (see _load)
+        self.recovered: List[Path] = []
+        self.recovery_errors: List[str] = []
+        # Shown one at a time as messages, once nobody is playing
+        self.notices: List[str] = []
         self.current_chart_path: Optional[Path] = None
+        self.prefetch: Optional[Prefetcher] = None
+        self.prefetch_target: Optional[Tuple] = None
 
         # Deletion & Settings
         self.pending_delete: Optional[Path] = None
@@ -61,27 +125,248 @@ class App:
         self.score = 0
         self.final_hits = 0
         self.final_total = 0
+        # Record mode: the take, journaled to disk as it goes
+        self.journal: Optional[RecordingJournal] = None
+        # Finished takes still being written into charts, with their song
+        self.saving: List[Tuple[Path, RecordingJournal]] = []
+        # Play mode: the replay's input stream
         self.recorded: List[Tuple[int, float]] = []
-        self.active_notes: List[Note] = []
-        self.spawn_index = 0
+        self.track = NoteTrack.empty()
+        self.judge = Judge(self.track)
+        self.last_judgement: Optional[Judgement] = None
+        self.ghost: Optional[Ghost] = None
+        # chart_hash() of the chart being played, for its replay
+        self.track_hash = bytes(16)
+        # Hit offsets and the hit/miss timeline of the current play
+        self.telemetry = RunTelemetry()
 
         # Pause State
         self.pause_index = 0
         self.pause_countdown_until: Optional[float] = None
         self.pause_countdown_value = 0
 
+        # First frame: the splash, before any save data or audio is touched
+        screens.draw_splash(self.screen, self.fonts, ready=False)
+        pygame.display.flip()
+        self.dirty, self.drawn_state = False, self.state
+        self._loaded: Optional[tuple] = None
+        self._load_error: Optional[BaseException] = None
+        self.loader: Optional[threading.Thread] = threading.Thread(
+            target=self._load, args=(music is None,), name="startup", daemon=True
+        )
+        self.loader.start()
+
+    # --- Startup ---
+
+    def _load(self, init_mixer: bool) -> None:
+        """Loader thread: everything the splash does not wait for."""
+        try:
+            from .library import SongLibrary
+            from .prefetch import Prefetcher
+
+            if init_mixer:
+                pygame.mixer.init()
+            data = DataManager(backend=config.SCORE_BACKEND)
+            library = SongLibrary(
+                data.cache_path / "library.json", self.assets_dir, data.save_cache
+            )
+            profile = data.load_profile("Guest")
+            # Before the scan, so the recovered charts are listed
+            recovered, recovery_errors = recover_journals(self.assets_dir)
+            songs = library.scan()
+            self._loaded = (
+                data,
+                profile,
+                library,
+                songs,
+                recovered,
+                recovery_errors,
+                Prefetcher(),
+            )
+        except BaseException as e:
+            self._load_error = e
+
+    @property
+    def loading(self) -> bool:
+        return self.loader is not None
+
+    def wait_until_loaded(self) -> None:
+        """Joins the loader and takes over what it built (main thread only)."""
+        if self.loader is None:
+            return
+        self.loader.join()
+        self.loader = None
+        if self._load_error is not None:
+            raise self._load_error
+        (
+            self.data,
+            self.current_profile,
+            self.library,
+            self.songs,
+            self.recovered,
+            self.recovery_errors,
+            self.prefetch,
+        ) = self._loaded
+        self._loaded = None
+
     def run(self) -> None:
+        last = time.perf_counter()
+        prof = PROFILER
         while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.quit()
-                self.handle_event(event)
+            if self.loader is not None and not self.loader.is_alive():
+                self.wait_until_loaded()
+            self.input.poll()
+            if prof.enabled:
+                prof.lap("pump")
+            self._dispatch_input()
+            if prof.enabled:
+                prof.lap("events")
+
+            now = time.perf_counter()
+            frame_time, last = now - last, now
+            if self.state == "game":
+                self.frame_stats.record(frame_time)
+
+            # One update per frame: game logic reads the song clock itself
             self.update()
-            self.draw()
-            pygame.display.flip()
-            self.clock.tick(config.FPS)
+            if prof.enabled:
+                prof.lap("update")
+
+            # Rendering reads the continuous song clock, so notes land exactly
+            # where they belong at the moment of the draw
+            if self._needs_redraw():
+                self.draw()
+                if prof.enabled:
+                    prof.lap(f"draw.{self.state}")
+                    self._draw_profiler(now)
+                    prof.lap("overlay")
+                pygame.display.flip()
+                self.dirty, self.drawn_state = False, self.state
+            elif self.state == "splash":
+                rect = screens.draw_splash_prompt(
+                    self.screen, self.fonts, not self.loading
+                )
+                pygame.display.update(rect)
+            if prof.enabled:
+                prof.lap("flip")
+
+            # Keep sampling input at a high rate until the next frame is due
+            live = self.state in LIVE_STATES
+            self.pacer.set_target(self._frame_rate(now))
+            self.pacer.wait(self.input.poll, wake_on_input=not live)
+            if prof.enabled:
+                prof.end_frame("wait")
+
+    def _needs_redraw(self) -> bool:
+        return (
+            self.dirty
+            or self.state in LIVE_STATES
+            or self.state != self.drawn_state
+            # The overlay graph is live on every screen
+            or PROFILER.enabled
+        )
+
+    def _frame_rate(self, now: float) -> float:
+        """Full rate while playing; menus slow down when idle or unfocused."""
+        if self.state in LIVE_STATES:
+            return target_hz()
+        if not self.focused:
+            return config.UNFOCUSED_HZ
+        if now - self.last_input > config.IDLE_AFTER:
+            return config.IDLE_HZ
+        return config.MENU_HZ
+
+    def _dispatch_input(self) -> None:
+        # Timestamped presses first: they happened before this frame began
+        for press in self.input.drain_presses():
+            self._handle_lane_input(press.lane, press.timestamp)
+        for event in self.input.drain_events():
+            if event.type == pygame.QUIT:
+                self.quit()
+            elif event.type == pygame.WINDOWFOCUSLOST:
+                self.focused = False
+            elif event.type in (pygame.WINDOWFOCUSGAINED, pygame.WINDOWEXPOSED):
+                self.focused, self.dirty = True, True
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                PROFILER.toggle()
+                self.dirty, self.profiler_status = True, ""
+                self.profiler_panel = None
+                continue
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                self.export_profile()
+                continue
+            self.handle_event(event)
+        self.input.capture_lanes = self.state == "game"
+        self._update_prefetch()
+
+    def _update_prefetch(self) -> None:
+        """Preloads whatever song/chart the menus have highlighted."""
+        if self.state == "song_select" and self.songs:
+            song = self.songs[self.song_index % len(self.songs)]
+            charts = self.library.charts_for(song)[:1]
+        elif self.state == "chart_choice" and self.song_path:
+            song = self.song_path
+            charts = self.charts[self.chart_index : self.chart_index + 1]
+        else:
+            return
+        # The ghost's run, for whoever is playing
+        replays = [pb_path(c, self.current_profile.name) for c in charts]
+        target = (song, tuple(charts), tuple(replays))
+        if target != self.prefetch_target:
+            self.prefetch_target = target
+            self.prefetch.want(song, charts, replays)
+
+    def _draw_profiler(self, now: float) -> None:
+        if (
+            self.profiler_panel is None
+            or now - self.profiler_panel_at >= config.PROFILER_REFRESH
+        ):
+            self.profiler_panel = screens.build_profiler_panel(
+                self.fonts,
+                PROFILER,
+                self._frame_budget_ms(now),
+                self.profiler_status,
+                self.frame_stats.summary(),
+            )
+            self.profiler_panel_at = now
+        self.screen.blit(
+            self.profiler_panel,
+            (20, config.HEIGHT - 20 - self.profiler_panel.get_height()),
+        )
+
+    def _frame_budget_ms(self, now: float) -> float:
+        """The frame time the overlay measures against."""
+        hz = self._frame_rate(now)
+        if hz > 0:
+            return 1000.0 / hz
+        # Uncapped or vsync: no target, so compare with recent frames
+        frames = self.frame_stats.window()
+        if frames.size:
+            return float(frames.mean()) * 1000.0
+        return 1000.0 / config.FPS
+
+    def export_profile(self) -> None:
+        """Writes the profiler ring buffer to save_data/perf/ (F4)."""
+        if not PROFILER.count:
+            self.profiler_status = "Nothing recorded: press F3 first"
+            return
+        self.wait_until_loaded()
+        try:
+            path = PROFILER.export(self.data.base_path / "perf")
+            self.profiler_status = f"Exported {path.name} (+ .json)"
+        except OSError as e:
+            self.profiler_status = f"Export failed: {e}"
+        self.profiler_panel = None
 
     def quit(self):
+        self.wait_until_loaded()
+        if self.journal is not None:
+            # Kept on disk: the take is recovered on the next launch
+            self.journal.close()
+        for _, journal in self.saving:
+            journal.done.wait()
+        self.prefetch.close()
+        self.data.close()
         pygame.quit()
         sys.exit()
 
@@ -94,25 +379,55 @@ class App:
         if not self.song_path:
             return
         self.mode, self.state, self.score, self.recorded = "record", "game", 0, []
-        self._prepare_engine(self.song_path)
+        self._set_track(NoteTrack.empty())
+        self.discard_take()
         self.current_chart_path = next_new_chart_path(self.song_path)
+        self.journal = RecordingJournal(self.current_chart_path)
+        self._prepare_engine(self.song_path)
 
-    def start_play(self, chart_data: List[Tuple[int, float]]) -> None:
+    def start_play(self, track: NoteTrack) -> None:
         if not self.song_path:
             return
-        self.mode, self.state, self.score, self.recorded = (
-            "play",
-            "game",
-            0,
-            list(chart_data),
+        self.mode, self.state, self.score, self.recorded = "play", "game", 0, []
+        self._set_track(track)
+        # From the compiled header the track streams from: the text is not read
+        self.track_hash = (
+            track.reader.source_hash if track.reader is not None else bytes(16)
         )
+        self.telemetry = RunTelemetry()
+        self._close_ghost()
+        if self.current_chart_path:
+            profile = self.current_profile.name
+            self.ghost = load_ghost(
+                self.current_chart_path,
+                profile,
+                self.prefetch.replay(pb_path(self.current_chart_path, profile)),
+            )
         self._prepare_engine(self.song_path)
 
+    def _close_ghost(self) -> None:
+        if self.ghost is not None:
+            self.ghost.close()
+            self.ghost = None
+
+    def _set_track(self, track: NoteTrack) -> None:
+        self.track.close()
+        self.track = track
+        self.judge = Judge(track)
+        self.judge.listeners.append(self._on_judgement)
+        self.last_judgement = None
+
+    def _load_track(self, chart_path: Path) -> NoteTrack:
+        # Streamed: only the next few seconds of notes are ever in memory
+        return NoteTrack.stream(ChartReader(chart_path))
+
     def _prepare_engine(self, path: Path):
-        self.active_notes.clear()
-        self.spawn_index = 0
-        pygame.mixer.music.load(str(path))
-        pygame.mixer.music.play()
+        audio = self.prefetch.audio(path)
+        if audio is not None:
+            self.music.load(audio, path.suffix.lstrip("."))
+        else:
+            self.music.load(str(path))
+        self.music.play()
         self.gameplay_manager.start_game()
 
     def finalize_game_results(self) -> None:
@@ -121,22 +436,88 @@ class App:
             return
 
         if self.mode == "record":
-            save_chart_to_path(self.current_chart_path, self.recorded)
+            self.save_take()
             self.show_message(
                 f"Saved: {self.current_chart_path.name}", 2.0, "chart_choice"
             )
             return
 
         self.final_hits = self.score
-        self.final_total = len(self.recorded)
-        self.data.update_records(
+        self.final_total = len(self.track)
+        # Let go of the chart file, so it can be deleted from the menu
+        self.track.close()
+        self._close_ghost()
+        # One timestamp ties the score row to its replay for later rescoring
+        played_at = time.time()
+        is_pb = self.data.update_records(
             self.current_chart_path.name,
             self.current_profile,
             self.final_hits,
             self.final_total,
+            played_at,
+            self.telemetry.stats,
+        )
+        replay = Replay(
+            self.track_hash,
+            self.current_profile.name,
+            self.final_hits,
+            self.final_total,
+            self.recorded,
+            played_at,
         )
         self.state = "results"
-        pygame.mixer.music.stop()
+        self.music.stop()
+        try:
+            save_replay(self.current_chart_path, replay, is_pb)
+        except OSError as e:
+            self.show_message(f"Replay not saved: {e}", 2.0, "results")
+
+    def save_take(self) -> None:
+        """Hands the take to its writer thread to become the chart file."""
+        if self.journal is None:
+            return
+        self.journal.finish(save=True)
+        self.saving.append((self.song_path, self.journal))
+        self.journal = None
+
+    def discard_take(self) -> None:
+        if self.journal is not None:
+            self.journal.finish(save=False)
+            # Quick (no flush), and frees the chart slot for the next take
+            self.journal.done.wait()
+            self.journal = None
+
+    def _collect_saves(self) -> None:
+        """Lists the charts whose takes have finished writing."""
+        pending = []
+        for song, journal in self.saving:
+            if not journal.done.is_set():
+                pending.append((song, journal))
+                continue
+            if journal.error:
+                # The journal stays behind: the take is recovered next launch
+                self.notices.append(
+                    f"{journal.chart_path.name} not saved: {journal.error}"
+                )
+            self._refresh_charts(song)
+            self.dirty = True
+        self.saving = pending
+
+    def _show_notice(self) -> None:
+        # Replaces a message on screen, and goes where it was going
+        next_action = self.state
+        if self.state == "message" and self.message:
+            next_action = self.message.next_action
+        self.show_message(self.notices.pop(0), 3.0, next_action)
+        self.message.notice, self.dirty = True, True
+
+    def _refresh_charts(self, song: Optional[Path] = None) -> None:
+        """Re-lists a song's charts (default: the current one's) after a change."""
+        song = song or self.song_path
+        charts = list_charts(song)
+        self.library.refresh_charts(song, charts)
+        if song == self.song_path:
+            self.charts = charts
 
     def show_message(
         self, text: str, seconds: float, next_action: Optional[str] = None
@@ -147,12 +528,12 @@ class App:
         self.state = "message"
 
     def pause_game(self) -> None:
-        pygame.mixer.music.pause()
+        self.music.pause()
         self.gameplay_manager.pause()
         self.pause_index, self.state = 0, "pause"
 
     def resume_game(self) -> None:
-        pygame.mixer.music.unpause()
+        self.music.unpause()
         self.gameplay_manager.resume()
         self.state = "game"
 
@@ -161,26 +542,45 @@ class App:
         self.pause_countdown_value = 3
         self.state = "pause_countdown"
 
-    def _handle_lane_input(self, lane: int) -> None:
-        now = self.song_time()
+    def _lane_for_key(self, key: int) -> int:
+        keys = self.current_profile.keys
+        return keys.index(key) if key in keys else -1
+
+    def _handle_lane_input(self, lane: int, timestamp: Optional[float] = None) -> None:
+        # Presses from InputCapture carry their own capture time
+        if timestamp is None:
+            now = self.song_time()
+        else:
+            now = self.gameplay_manager.song_time_at(timestamp)
         if self.mode == "record":
-            self.recorded.append((lane, now))
+            self.journal.append(lane, now)
         elif self.mode == "play":
-            for n in list(self.active_notes):
-                _, y = n.position(now)
-                if n.lane == lane and (config.HIT_BOTTOM <= y <= config.HIT_TOP):
-                    self.score += 1
-                    self.active_notes.remove(n)
-                    break
+            # Judge at replay resolution so playback reproduces this exactly
+            now = quantize(now)
+            self.recorded.append((lane, now))
+            self.judge.press(lane, now)
+
+    def _on_judgement(self, judgement: Judgement) -> None:
+        if judgement.is_hit:
+            self.score += 1
+        self.last_judgement = judgement
+        self.telemetry.add(judgement)
 
     def handle_event(self, event: pygame.event.Event) -> None:
         if event.type != pygame.KEYDOWN:
             return
+        self.dirty, self.last_input = True, time.perf_counter()
         s = self.state
 
         if s == "splash":
-            if event.key == pygame.K_RETURN:
+            if event.key == pygame.K_RETURN and not self.loading:
                 self.state, self.menu_index = "main_menu", 0
+                if self.recovered:
+                    self.notices.append(
+                        f"Recovered {len(self.recovered)} unsaved take(s)"
+                    )
+                self.notices += self.recovery_errors
+                self.recovered, self.recovery_errors = [], []
             elif event.key == pygame.K_ESCAPE:
                 self.state = "quit_confirm"
 
@@ -209,7 +609,7 @@ class App:
                 self.song_index = (self.song_index + 1) % len(self.songs)
             elif event.key == pygame.K_RETURN and self.songs:
                 self.song_path = self.songs[self.song_index]
-                self.charts = list_charts(self.song_path)
+                self.charts = self.library.charts_for(self.song_path)
                 self.state, self.chart_index = "chart_choice", 0
 
         elif s == "chart_choice":
@@ -225,7 +625,7 @@ class App:
             elif event.key == pygame.K_RETURN:
                 if self.charts and self.chart_index < len(self.charts):
                     self.current_chart_path = self.charts[self.chart_index]
-                    self.start_play(load_chart_from_path(self.current_chart_path))
+                    self.start_play(self._load_track(self.current_chart_path))
                 else:
                     self.start_record()
             elif event.key == pygame.K_d and self.charts:
@@ -247,7 +647,8 @@ class App:
 
         elif s == "results":
             if event.key in (pygame.K_RETURN, pygame.K_ESCAPE):
-                self.score, self.active_notes, self.state = 0, [], "chart_choice"
+                self.score, self.state = 0, "chart_choice"
+                self._set_track(NoteTrack.empty())
 
         elif s == "pause":
             opts_count = 3 if self.mode == "play" else 4
@@ -267,14 +668,17 @@ class App:
                 if choice == "Resume":
                     self.start_pause_countdown()
                 elif choice == "Save Chart":
-                    save_chart_to_path(self.current_chart_path, self.recorded)
+                    self.save_take()
                     self.show_message("Chart Saved!", 1.0, "chart_choice")
                 elif choice == "Exit":
-                    pygame.mixer.music.stop()
+                    self.music.stop()
+                    self.track.close()
+                    self._close_ghost()
+                    self.discard_take()
                     self.state = "song_select"
                 elif choice in ("Restart", "Start Over"):
                     if self.mode == "play":
-                        self.start_play(load_chart_from_path(self.current_chart_path))
+                        self.start_play(self._load_track(self.current_chart_path))
                     else:
                         self.start_record()
 
@@ -368,7 +772,7 @@ class App:
                             self.pending_delete.name
                         ]
                         self.data.save_profile(self.current_profile)
-                self.charts = list_charts(self.song_path)
+                self._refresh_charts()
                 self.state, self.chart_index = "chart_choice", 0
             elif event.key == pygame.K_ESCAPE:
                 self.state = "chart_choice"
@@ -404,6 +808,14 @@ class App:
 
     def update(self) -> None:
         now = time.time()
+        if self.saving:
+            self._collect_saves()
+        if (
+            self.notices
+            and self.state not in LIVE_STATES + ("pause", "splash")
+            and not (self.message and self.message.notice)
+        ):
+            self._show_notice()
         if self.state == "message" and self.message:
             if now >= self.message.until_ts:
                 self.state, self.message = self.message.next_action or "main_menu", None
@@ -415,22 +827,23 @@ class App:
             else:
                 self.pause_countdown_value = int(rem) + 1
         elif self.state == "game":
-            if not pygame.mixer.music.get_busy():
+            if not self.music.get_busy():
                 self.finalize_game_results()
                 return
             t = self.song_time()
             if self.mode == "play":
-                self.spawn_index = spawn_notes(
-                    self.recorded, self.active_notes, t, self.spawn_index
-                )
-                cleanup_notes(self.active_notes, t)
+                self.track.spawn(t)
+                self.judge.expire(t)
+                self.track.cleanup(t)
+                if self.ghost is not None:
+                    self.ghost.advance(t)
 
     def draw(self) -> None:
         self.screen.fill((0, 0, 0))
         s = self.state
 
         if s == "splash":
-            screens.draw_splash(self.screen, self.fonts)
+            screens.draw_splash(self.screen, self.fonts, not self.loading)
         elif s == "main_menu":
             screens.draw_main_menu(self.screen, self.fonts, self.menu_index)
         elif s == "song_select":
@@ -460,7 +873,12 @@ class App:
             )
         elif s == "results":
             screens.draw_results(
-                self.screen, self.fonts, self.final_hits, self.final_total
+                self.screen,
+                self.fonts,
+                self.final_hits,
+                self.final_total,
+                self.telemetry,
+                self.current_profile,
             )
         elif s == "profile_select":
             screens.draw_profile_select(
@@ -508,13 +926,15 @@ class App:
                 self.fonts,
                 self.mode,
                 self.score,
-                len(self.recorded),
+                len(self.journal) if self.journal is not None else 0,
                 self.song_path,
-                self.active_notes,
+                self.track,
                 self.song_time(),
                 None,
                 self.current_profile,
-                len(self.recorded),
+                len(self.track),
+                self.last_judgement,
+                self.ghost,
             )
             if s == "pause":
                 screens.draw_pause_menu(
@@ -0,0 +1,209 @@
+# src/python_hero/bench.py
+"""
+Micro-benchmarks for the gameplay hot paths, and the cold-start benchmark.
+Run from project root: python -m src.python_hero.bench [--startup]
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from . import config
+from .charts import ChartReader, save_chart_to_path
+from .gameplay import NoteTrack
+from .judge import Judge
+from .render import to_screen_many
+
+
+def dense_chart(
+    note_count: int, notes_per_second: float = 60.0, seed: int = 1234
+) -> NoteTrack:
+    """Synthetic chart with a constant note density and random lanes."""
+    rng = np.random.default_rng(seed)
+    times = np.arange(note_count, dtype=np.float64) / notes_per_second + 1.0
+    lanes = rng.integers(0, len(config.LANE_COLORS), note_count)
+    return NoteTrack(lanes, times)
+
+
+def bench_note_track(
+    sizes: Tuple[int, ...] = (1_000, 10_000, 100_000, 1_000_000),
+    frames: int = 240,
+) -> List[Tuple[int, int, float]]:
+    """
+    Per-frame cost of spawn + miss expiry + cleanup + projection at 60 FPS for charts of
+    growing length but equal density. Returns (notes, visible, usec/frame).
+    """
+    results = []
+    for size in sizes:
+        track = dense_chart(size)
+        judge = Judge(track)
+        # Start in the middle of the chart so the window is full
+        start = float(track.times[size // 2])
+        # Skip the one-off catch-up of everything before the start point
+        track.spawn(start)
+        judge.expire(start)
+        visible = 0
+
+        t0 = time.perf_counter()
+        for f in range(frames):
+            now = start + f / config.FPS
+            track.spawn(now)
+            judge.expire(now)
+            track.cleanup(now)
+            idx, x, y = track.positions(now)
+            to_screen_many(x, y)
+            visible = idx.size
+        elapsed = time.perf_counter() - t0
+
+        results.append((size, visible, elapsed / frames * 1e6))
+    return results
+
+
+def bench_chart_stream(
+    sizes: Tuple[int, ...] = (10_000, 100_000, 1_000_000),
+    notes_per_second: float = 500.0,
+    step: float = 0.05,
+) -> List[Tuple[int, int, float]]:
+    """
+    Plays charts of growing length through a streamed track and the judge,
+    start to finish, `step` seconds per update. Returns (notes, largest note
+    buffer, peak traced KiB): both should stay flat however long the chart.
+    """
+    results = []
+    with tempfile.TemporaryDirectory(prefix="python_hero_stream_") as tmp:
+        for size in sizes:
+            source = dense_chart(size, notes_per_second)
+            chart_path = Path(tmp) / f"bench_{size}_chart_01.txt"
+            save_chart_to_path(
+                chart_path, list(zip(source.lanes.tolist(), source.times.tolist()))
+            )
+            end = float(source.times[-1]) + 1.0
+            del source
+
+            tracemalloc.start()
+            track = NoteTrack.stream(ChartReader(chart_path))
+            judge = Judge(track)
+            largest = 0
+            for f in range(int(end / step)):
+                now = f * step
+                track.spawn(now)
+                judge.expire(now)
+                track.cleanup(now)
+                largest = max(largest, track.times.size)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            track.close()
+            results.append((size, largest, peak / 1024))
+    return results
+
+
+# Runs in a fresh interpreter; argv[1] is the wall time the parent launched it
+_STARTUP_PROBE = """
+import json, sys, time
+launched = float(sys.argv[1])
+from src.python_hero.app import App
+imported = time.time()
+app = App()
+first_frame = time.time()
+app.wait_until_loaded()
+ready = time.time()
+app.prefetch.close()
+app.data.close()
+print(json.dumps({
+    "import": imported - launched,
+    "first_frame": first_frame - launched,
+    "ready": ready - launched,
+}))
+"""
+
+
+def bench_startup(runs: int = 5) -> List[Dict[str, float]]:
+    """
+    Launches the game `runs` times in fresh processes, each time from process
+    start to the splash on screen (first_frame) and to accepting input
+    (ready). Returns seconds per phase per run.
+    The first run starts with empty save data (first boot: no font or library
+    cache); the rest reuse what it wrote, like a cabinet reboot.
+    """
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (str(config.PROJECT_ROOT), env.get("PYTHONPATH")) if p
+    )
+    # Save data goes to a scratch folder, not save_data/
+    scratch = tempfile.mkdtemp(prefix="python_hero_startup_")
+    results = []
+    try:
+        for _ in range(runs):
+            out = subprocess.run(
+                [sys.executable, "-c", _STARTUP_PROBE, repr(time.time())],
+                cwd=scratch,
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            results.append(json.loads(out.strip().splitlines()[-1]))
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--startup", action="store_true", help="run the cold-start benchmark"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="measure memory while streaming charts of growing length",
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=config.STARTUP_BUDGET_MS,
+        help="exit with status 1 if the median reboot first frame is slower",
+    )
+    args = parser.parse_args(argv)
+
+    if args.stream:
+        print(f"{'NOTES':>10} {'MAX BUFFER':>11} {'PEAK KIB':>9}")
+        for size, largest, peak_kb in bench_chart_stream():
+            print(f"{size:>10} {largest:>11} {peak_kb:>9.0f}")
+        return 0
+
+    if not args.startup:
+        print(f"{'NOTES':>10} {'VISIBLE':>8} {'USEC/FRAME':>11}")
+        for size, visible, usec in bench_note_track():
+            print(f"{size:>10} {visible:>8} {usec:>11.1f}")
+        return 0
+
+    runs = bench_startup(max(2, args.runs))
+    print(f"{'RUN':<10} {'IMPORT MS':>10} {'FIRST FRAME MS':>15} {'READY MS':>9}")
+    for i, r in enumerate(runs):
+        label = "first" if i == 0 else f"reboot {i}"
+        print(
+            f"{label:<10} {r['import'] * 1000:>10.1f} "
+            f"{r['first_frame'] * 1000:>15.1f} {r['ready'] * 1000:>9.1f}"
+        )
+    median = float(np.median([r["first_frame"] for r in runs[1:]])) * 1000
+    print(f"median reboot first frame {median:.1f} ms (budget {args.budget_ms} ms)")
+    if median > args.budget_ms:
+        print("FAIL: first frame over budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
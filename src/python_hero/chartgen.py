@@ -0,0 +1,301 @@
+# src/python_hero/chartgen.py
+"""
+Generates charts from audio: a streaming STFT, spectral flux onset detection,
+and one lane per onset picked from the frequency band that moved the most.
+Run from project root: python -m src.python_hero.chartgen --help
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from . import config
+from .charts import list_charts, next_new_chart_path, save_chart_to_path
+from .songs import list_songs
+
+# Samples handed to the analyser at a time; bounds memory for any song length
+CHUNK_SAMPLES = 1 << 16
+# Lowest frequency considered (Hz); rumble below this is ignored
+_MIN_FREQ = 60.0
+
+
+# --- Decoding ---
+
+
+def decode_chunks(
+    path: Path, sample_rate: int = config.CHARTGEN_SAMPLE_RATE
+) -> Iterator[np.ndarray]:
+    """
+    Mono float32 samples in chunks. Streams through ffmpeg when installed;
+    without it pygame decodes the whole song into memory first (about 10 MB
+    per minute of audio at the default rate).
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg:
+        return _ffmpeg_chunks(ffmpeg, path, sample_rate)
+    return _pygame_chunks(path, sample_rate)
+
+
+def _ffmpeg_chunks(ffmpeg: str, path: Path, sample_rate: int) -> Iterator[np.ndarray]:
+    cmd = [
+        ffmpeg,
+        "-v",
+        "error",
+        "-i",
+        str(path),
+        "-f",
+        "f32le",
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "-",
+    ]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stdin=subprocess.DEVNULL)
+    try:
+        while True:
+            raw = proc.stdout.read(CHUNK_SAMPLES * 4)
+            if not raw:
+                break
+            # A read can end mid-sample; keep whole floats only
+            raw = raw[: len(raw) // 4 * 4]
+            yield np.frombuffer(raw, dtype="<f4")
+    finally:
+        proc.stdout.close()
+        proc.kill()
+        proc.wait()
+
+
+def _pygame_chunks(path: Path, sample_rate: int) -> Iterator[np.ndarray]:
+    """
+    Fallback without ffmpeg: pygame decodes the whole file at once, so only
+    the analysis (not the decode) is chunked.
+    """
+    import pygame
+
+    if not pygame.mixer.get_init():
+        # Decoding needs the mixer but not a sound card
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        pygame.mixer.init(frequency=sample_rate, size=-16, channels=1)
+    freq, size, _ = pygame.mixer.get_init()
+
+    samples = pygame.sndarray.array(pygame.mixer.Sound(str(path)))
+    if samples.ndim == 2:
+        samples = samples.mean(axis=1)
+    samples = samples.astype(np.float32) / float(1 << (abs(size) - 1))
+    if freq != sample_rate:
+        # The game's mixer may run at another rate: resample linearly
+        n = int(samples.size * sample_rate / freq)
+        samples = np.interp(
+            np.arange(n) * (freq / sample_rate), np.arange(samples.size), samples
+        ).astype(np.float32)
+
+    for i in range(0, samples.size, CHUNK_SAMPLES):
+        yield samples[i : i + CHUNK_SAMPLES]
+
+
+# --- Analysis ---
+
+
+class SpectralFlux:
+    """
+    Streaming STFT. Each fed chunk is cut into Hann-windowed frames (with
+    the overlap carried over from the previous chunk) and reduced to the
+    positive change in log magnitude per frequency band.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = config.CHARTGEN_SAMPLE_RATE,
+        size: int = config.CHARTGEN_STFT_SIZE,
+        hop: int = config.CHARTGEN_HOP,
+        bands: int = len(config.LANE_COLORS),
+    ):
+        self.sample_rate, self.size, self.hop = sample_rate, size, hop
+        self.window = np.hanning(size).astype(np.float32)
+        self.carry = np.zeros(0, dtype=np.float32)
+        self.prev: Optional[np.ndarray] = None
+        self.parts: List[np.ndarray] = []
+
+        # Log-spaced band edges as FFT bin indices, low to high
+        edges = np.geomspace(_MIN_FREQ, sample_rate / 2, bands + 1)
+        bins = np.round(edges * size / sample_rate).astype(np.intp)
+        self.band_starts = np.maximum.accumulate(
+            np.maximum(bins[:-1], np.arange(1, bands + 1))
+        )
+
+    def feed(self, samples: np.ndarray) -> None:
+        buf = np.concatenate((self.carry, samples))
+        if buf.size < self.size:
+            self.carry = buf
+            return
+
+        frames = sliding_window_view(buf, self.size)[:: self.hop]
+        self.carry = buf[frames.shape[0] * self.hop :]
+
+        mag = np.abs(np.fft.rfft(frames * self.window, axis=1))
+        logmag = np.log1p(100.0 * mag, dtype=np.float32)
+        prev = self.prev if self.prev is not None else logmag[:1]
+        flux = np.diff(np.concatenate((prev, logmag)), axis=0)
+        np.maximum(flux, 0.0, out=flux)
+        self.prev = logmag[-1:]
+        self.parts.append(np.add.reduceat(flux, self.band_starts, axis=1))
+
+    def bands(self) -> np.ndarray:
+        """(frames, bands) flux collected so far."""
+        if not self.parts:
+            return np.zeros((0, self.band_starts.size), dtype=np.float32)
+        return np.concatenate(self.parts)
+
+    def frame_times(self, count: int) -> np.ndarray:
+        """Centre time of each frame, in seconds."""
+        return (np.arange(count) * self.hop + self.size / 2) / self.sample_rate
+
+
+def pick_onsets(
+    band_flux: np.ndarray,
+    times: np.ndarray,
+    sensitivity: float = config.CHARTGEN_SENSITIVITY,
+    min_gap: float = config.CHARTGEN_MIN_GAP,
+) -> List[Tuple[int, float]]:
+    """Peaks of the flux above an adaptive threshold, as (lane, time) notes."""
+    if band_flux.shape[0] < 3:
+        return []
+    frame_dt = float(times[1] - times[0])
+    flux = band_flux.sum(axis=1)
+
+    # 1. Adaptive threshold: local mean + k local std over about a second
+    w = max(1, int(0.5 / frame_dt))
+    kernel = np.full(2 * w + 1, 1.0 / (2 * w + 1))
+    mean = np.convolve(flux, kernel, mode="same")
+    var = np.convolve(flux * flux, kernel, mode="same") - mean * mean
+    threshold = mean + sensitivity * np.sqrt(np.maximum(var, 0.0))
+
+    # 2. Local maxima within +-50 ms
+    m = max(1, int(0.05 / frame_dt))
+    local_max = sliding_window_view(np.pad(flux, m, mode="edge"), 2 * m + 1).max(1)
+    peaks = np.flatnonzero((flux >= local_max) & (flux > threshold) & (flux > 0))
+
+    # 3. Lane = the band that rose the most, relative to its usual level
+    norm = band_flux / (band_flux.mean(axis=0) + 1e-9)
+    lanes = norm[peaks].argmax(axis=1)
+
+    notes: List[Tuple[int, float]] = []
+    last = -np.inf
+    for lane, t in zip(lanes.tolist(), times[peaks].tolist()):
+        if t - last >= min_gap:
+            notes.append((lane, round(t, 4)))
+            last = t
+    return notes
+
+
+def detect_notes(
+    song_path: Path,
+    sensitivity: float = config.CHARTGEN_SENSITIVITY,
+    min_gap: float = config.CHARTGEN_MIN_GAP,
+) -> List[Tuple[int, float]]:
+    analyser = SpectralFlux()
+    for chunk in decode_chunks(song_path, analyser.sample_rate):
+        analyser.feed(chunk)
+    band_flux = analyser.bands()
+    times = analyser.frame_times(band_flux.shape[0])
+    return pick_onsets(band_flux, times, sensitivity, min_gap)
+
+
+def generate_chart(
+    song_path: Path,
+    sensitivity: float = config.CHARTGEN_SENSITIVITY,
+    min_gap: float = config.CHARTGEN_MIN_GAP,
+) -> Tuple[Optional[Path], int]:
+    """Writes the next <song>_chart_XX.txt for a song; returns (path, notes)."""
+    notes = detect_notes(song_path, sensitivity, min_gap)
+    if not notes:
+        return None, 0
+    chart_path = next_new_chart_path(song_path)
+    save_chart_to_path(chart_path, notes)
+    return chart_path, len(notes)
+
+
+def _generate_job(
+    args: Tuple[str, float, float],
+) -> Tuple[str, Optional[str], int, str]:
+    """Worker: (song, chart or None, note count, error message)."""
+    song, sensitivity, min_gap = args
+    try:
+        chart, count = generate_chart(Path(song), sensitivity, min_gap)
+        return song, str(chart) if chart else None, count, ""
+    except Exception as e:  # one bad file must not stop the batch
+        return song, None, 0, str(e)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "songs", nargs="*", type=Path, help="audio files (default: all of assets/)"
+    )
+    parser.add_argument(
+        "--skip-charted",
+        action="store_true",
+        help="leave songs that already have a chart alone",
+    )
+    parser.add_argument(
+        "--sensitivity", type=float, default=config.CHARTGEN_SENSITIVITY
+    )
+    parser.add_argument("--min-gap", type=float, default=config.CHARTGEN_MIN_GAP)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="processes (default: all cores)"
+    )
+    args = parser.parse_args(argv)
+
+    songs = _unique_songs(args.songs or list_songs())
+    if args.skip_charted:
+        songs = [s for s in songs if not list_charts(s)]
+    jobs = [(str(s), args.sensitivity, args.min_gap) for s in songs]
+    if jobs and not shutil.which("ffmpeg"):
+        print("ffmpeg not found: each song is decoded whole in memory (pygame)")
+
+    start = time.perf_counter()
+    if len(jobs) <= 1 or args.workers == 1:
+        results = map(_generate_job, jobs)
+        for song, chart, count, error in results:
+            _report(song, chart, count, error)
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            for song, chart, count, error in pool.map(_generate_job, jobs):
+                _report(song, chart, count, error)
+    print(f"{len(jobs)} songs in {time.perf_counter() - start:.1f}s")
+
+
+def _unique_songs(songs: List[Path]) -> List[Path]:
+    """
+    One job per song name, in order. Charts are named after the song's stem,
+    so two jobs for the same stem would race for the same chart slot.
+    """
+    seen: Dict[str, Path] = {}
+    for song in songs:
+        first = seen.setdefault(song.stem, song)
+        if first is not song and first.resolve() != song.resolve():
+            print(f"{song}: skipped, its charts would clash with {first}")
+    return list(seen.values())
+
+
+def _report(song: str, chart: Optional[str], count: int, error: str) -> None:
+    name = Path(song).name
+    if error:
+        print(f"{name}: failed ({error})")
+    elif chart:
+        print(f"{name}: {count} notes -> {Path(chart).name}")
+    else:
+        print(f"{name}: no onsets found")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,32 @@
 from __future__ import annotations
+import hashlib
+import io
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import time
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from . import config
 from .config import ASSETS_DIR
 
+# Compiled chart layout (little endian), notes sorted by time:
+#   header | times: float64[note_count] | lanes: int8[note_count]
+#   | seek index: float64[ceil(note_count / INDEX_STRIDE)]
+COMPILED_SUFFIX = ".phc"
+# A take being recorded into a chart (see journal.py)
+JOURNAL_SUFFIX = ".rec"
+COMPILED_VERSION = 2
+_MAGIC = b"PHCH"
+# magic, version, lane count, note count, source size, source mtime_ns, source hash
+_HEADER = struct.Struct("<4sHHIQq16s4x")
+# The seek index holds the time of every INDEX_STRIDE-th note
+INDEX_STRIDE = 1024
+
 
 def _base(song_path: Path) -> str:
     """Returns the clean stem of the song file."""
@@ -34,11 +58,15 @@ def next_new_chart_path(song_path: Path) -> Path:
     base = _base(song_path)
     existing_names = {p.name.lower() for p in list_charts(song_path)}
 
-    # Find the first available numeric slot
+    # Find the first available numeric slot, skipping takes still on their way
     for i in range(1, 100):
         filename = f"{base}_chart_{i:02d}.txt"
-        if filename.lower() not in existing_names:
-            return ASSETS_DIR / filename
+        path = ASSETS_DIR / filename
+        if (
+            filename.lower() not in existing_names
+            and not path.with_suffix(JOURNAL_SUFFIX).exists()
+        ):
+            return path
 
     # Fallback to a timestamp or 'new' if 99 charts exist (unlikely)
     return ASSETS_DIR / f"{base}_chart_new_{int(time.time())}.txt"
@@ -47,10 +75,19 @@ def next_new_chart_path(song_path: Path) -> Path:
 def save_chart_to_path(chart_path: Path, notes: List[Tuple[int, float]]) -> None:
     """Saves the recorded (lane, timestamp) pairs to a space-separated text file."""
     chart_path.parent.mkdir(parents=True, exist_ok=True)
-    with chart_path.open("w", encoding="utf-8") as f:
-        for lane, t in notes:
-            # Format to 4 decimal places for timing precision
-            f.write(f"{lane} {t:.4f}\n")
+    # Format to 4 decimal places for timing precision
+    text = "".join(f"{lane} {t:.4f}\n" for lane, t in notes)
+    data = text.encode("utf-8")
+    chart_path.write_bytes(data)
+
+    # Compile straight from memory so the next load never parses the text
+    lanes = np.array([lane for lane, _ in notes], dtype=np.int8)
+    times = np.array([round(t, 4) for _, t in notes], dtype=np.float64)
+    try:
+        _write_compiled(chart_path, lanes, times, _source_hash(data))
+    except OSError:
+        # The text file is the source of truth; compiling again later is fine
+        pass
 
 
 def load_chart_from_path(chart_path: Path) -> List[Tuple[int, float]]:
@@ -58,27 +95,334 @@ def load_chart_from_path(chart_path: Path) -> List[Tuple[int, float]]:
     if not chart_path or not chart_path.exists():
         return []
 
-    notes: List[Tuple[int, float]] = []
     try:
         with chart_path.open("r", encoding="utf-8") as f:
-            for line in f:
-                parts = line.strip().split()
-                if len(parts) == 2:
-                    lane_s, t_s = parts
-                    notes.append((int(lane_s), float(t_s)))
-    except (ValueError, IOError):
+            return _parse_notes(f)
+    except IOError:
+        return []
+
+
+def _parse_notes(lines: Iterable[str]) -> List[Tuple[int, float]]:
+    notes: List[Tuple[int, float]] = []
+    try:
+        for line in lines:
+            parts = line.split()
+            if len(parts) == 2:
+                lane_s, t_s = parts
+                notes.append((int(lane_s), float(t_s)))
+    except ValueError:
         # Return what we have or empty list if file is corrupted
         pass
 
     return notes
 
 
+# --- Compiled Charts ---
+
+
+def compiled_path(chart_path: Path) -> Path:
+    """The binary twin of a text chart: assets/<name>_chart_XX.phc"""
+    return chart_path.with_suffix(COMPILED_SUFFIX)
+
+
+def load_chart_arrays(chart_path: Path) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns (lanes, times) for a chart, read from its compiled file.
+    The compiled file is rebuilt from the .txt source whenever it is stale.
+    """
+    if not chart_path or not chart_path.exists():
+        return _empty_arrays()
+
+    try:
+        return _read_compiled(ensure_compiled(chart_path))
+    except (OSError, ValueError, struct.error):
+        # Compiled twin unusable (read-only folder, file locked...): parse text
+        return _parse_arrays(chart_path)
+
+
+def ensure_compiled(chart_path: Path) -> Path:
+    """The chart's compiled twin, rebuilt first if it is stale."""
+    bin_path = compiled_path(chart_path)
+    if not _is_fresh(chart_path, bin_path):
+        compile_chart(chart_path)
+    return bin_path
+
+
+def _empty_arrays() -> Tuple[np.ndarray, np.ndarray]:
+    return np.empty(0, dtype=np.int8), np.empty(0, dtype=np.float64)
+
+
+def _parse_arrays(chart_path: Path) -> Tuple[np.ndarray, np.ndarray]:
+    """(lanes, times) from the text chart, in time order."""
+    notes = load_chart_from_path(chart_path)
+    if not notes:
+        return _empty_arrays()
+    lanes, times = zip(*notes)
+    times = np.array(times, dtype=np.float64)
+    order = np.argsort(times, kind="stable")
+    return np.array(lanes, dtype=np.int8)[order], times[order]
+
+
+def compile_chart(chart_path: Path) -> Path:
+    """Reads the text chart once, parses it and writes its compiled twin."""
+    # Stat first: if the text changes while it is read, the header stays stale
+    stat = chart_path.stat()
+    data = chart_path.read_bytes()
+    notes = _parse_notes(io.TextIOWrapper(io.BytesIO(data), encoding="utf-8"))
+    lanes = np.array([lane for lane, _ in notes], dtype=np.int8)
+    times = np.array([t for _, t in notes], dtype=np.float64)
+    return _write_compiled(chart_path, lanes, times, _source_hash(data), stat)
+
+
+def _source_hash(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def chart_hash(chart_path: Path) -> bytes:
+    """Fingerprint of a chart's text; replays are only valid for the same hash."""
+    try:
+        return _source_hash(chart_path.read_bytes())
+    except OSError:
+        return bytes(16)
+
+
+def replays_dir(chart_path: Path) -> Path:
+    """Where a chart's replays live: assets/replays/<chart stem>/"""
+    return chart_path.parent / "replays" / chart_path.stem
+
+
+def _write_compiled(
+    chart_path: Path,
+    lanes: np.ndarray,
+    times: np.ndarray,
+    source_hash: bytes,
+    stat: Optional[os.stat_result] = None,
+) -> Path:
+    # Time order (chords keep chart order), so the file can be streamed
+    order = np.argsort(times, kind="stable")
+    times, lanes = times[order], lanes[order]
+
+    stat = stat or chart_path.stat()
+    header = _HEADER.pack(
+        _MAGIC,
+        COMPILED_VERSION,
+        len(config.LANE_COLORS),
+        times.size,
+        stat.st_size,
+        stat.st_mtime_ns,
+        source_hash,
+    )
+
+    # Write beside the target and rename so readers never see a partial file.
+    # The temp name is unique: the prefetch thread may compile concurrently.
+    bin_path = compiled_path(chart_path)
+    fd, tmp = tempfile.mkstemp(dir=bin_path.parent, prefix=f".{bin_path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(times.astype("<f8", copy=False).tobytes())
+            f.write(lanes.astype(np.int8, copy=False).tobytes())
+            f.write(times[::INDEX_STRIDE].astype("<f8").tobytes())
+        os.replace(tmp, bin_path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return bin_path
+
+
+def _read_header(bin_path: Path) -> Optional[tuple]:
+    try:
+        with bin_path.open("rb") as f:
+            raw = f.read(_HEADER.size)
+    except OSError:
+        return None
+    if len(raw) < _HEADER.size:
+        return None
+
+    header = _HEADER.unpack(raw)
+    if header[0] != _MAGIC or header[1] != COMPILED_VERSION:
+        return None
+    # Compiled for another lane layout: rebuild
+    if header[2] != len(config.LANE_COLORS):
+        return None
+    return header
+
+
+def _is_fresh(chart_path: Path, bin_path: Path) -> bool:
+    header = _read_header(bin_path)
+    if header is None:
+        return False
+
+    _, _, _, _, src_size, src_mtime_ns, src_hash = header
+    stat = chart_path.stat()
+    if stat.st_size == src_size and stat.st_mtime_ns == src_mtime_ns:
+        return True
+
+    # Touched but maybe not edited (copied, synced...): compare contents
+    if stat.st_size != src_size or _source_hash(chart_path.read_bytes()) != src_hash:
+        return False
+    # Same text: record the new mtime, so the next check is a stat again
+    try:
+        with bin_path.open("r+b") as f:
+            f.write(_HEADER.pack(*header[:5], stat.st_mtime_ns, src_hash))
+    except OSError:
+        pass  # Read-only folder: it is just hashed again next time
+    return True
+
+
+def _check_header(header: tuple, size: int, bin_path: Path) -> int:
+    """The note count of a compiled file of `size` bytes, if it is usable."""
+    if header[2] != len(config.LANE_COLORS):
+        raise ValueError(f"Compiled for {header[2]} lanes: {bin_path.name}")
+    count = header[3]
+    if size < _compiled_size(count):
+        raise ValueError(f"Truncated compiled chart: {bin_path.name}")
+    return count
+
+
+def _read_compiled(bin_path: Path) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Copies the arrays out of the compiled file; no per-note parsing.
+    The mapping is closed before returning, so the file can be replaced or
+    deleted (Windows refuses both while it is mapped).
+    """
+    with bin_path.open("rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mm:
+        count = _check_header(_HEADER.unpack_from(mm, 0), len(mm), bin_path)
+        times = np.frombuffer(mm, dtype="<f8", count=count, offset=_HEADER.size)
+        lanes = np.frombuffer(
+            mm, dtype=np.int8, count=count, offset=_HEADER.size + count * 8
+        )
+        result = lanes.copy(), times.copy()
+        # The views must go before the mapping can close
+        del lanes, times
+    return result
+
+
+def _compiled_size(count: int) -> int:
+    return _HEADER.size + count * 9 + -(-count // INDEX_STRIDE) * 8
+
+
+# --- Streaming ---
+
+
+class ChartReader:
+    """
+    Reads a chart's notes in time order, a chunk at a time, from its compiled
+    twin. Only the chunk being read and the sparse seek index (one time per
+    INDEX_STRIDE notes) are in memory, however long the chart is.
+    """
+
+    def __init__(self, chart_path: Path):
+        self.pos = 0
+        self._file = None
+        # Used instead of the file when the chart cannot be compiled
+        self._arrays: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        try:
+            bin_path = ensure_compiled(chart_path)
+            self._file = bin_path.open("rb")
+            header = _HEADER.unpack(self._file.read(_HEADER.size))
+            size = os.fstat(self._file.fileno()).st_size
+            self.count = _check_header(header, size, bin_path)
+            # chart_hash() of the text it was compiled from, without reading it
+            self.source_hash: bytes = header[6]
+            self._file.seek(_HEADER.size + self.count * 9)
+            blocks = -(-self.count // INDEX_STRIDE)
+            self.index = np.frombuffer(self._file.read(blocks * 8), dtype="<f8")
+        except (OSError, ValueError, struct.error):
+            self.close()
+            lanes, times = (
+                _parse_arrays(chart_path)
+                if chart_path and chart_path.exists()
+                else _empty_arrays()
+            )
+            self._arrays = (lanes, times)
+            self.count = times.size
+            self.source_hash = chart_hash(chart_path)
+            self.index = times[::INDEX_STRIDE]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> ChartReader:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _read(self, start: int, stop: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(lanes, times) of notes [start, stop)."""
+        if self._arrays is not None:
+            lanes, times = self._arrays
+            return lanes[start:stop], times[start:stop]
+        n = stop - start
+        f = self._file
+        f.seek(_HEADER.size + start * 8)
+        times = np.frombuffer(f.read(n * 8), dtype="<f8")
+        f.seek(_HEADER.size + self.count * 8 + start)
+        lanes = np.frombuffer(f.read(n), dtype=np.int8)
+        return lanes, times
+
+    def seek(self, t: float) -> int:
+        """Moves to the first note at or after song time `t`; returns its index."""
+        # The index narrows it down to one block; one read finds the note
+        block = max(int(np.searchsorted(self.index, t, side="left")) - 1, 0)
+        start = block * INDEX_STRIDE
+        _, times = self._read(start, min(start + INDEX_STRIDE, self.count))
+        self.pos = start + int(np.searchsorted(times, t, side="left"))
+        return self.pos
+
+    def read_until(self, t: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Every note from the current position up to song time `t`."""
+        parts_lanes, parts_times = [], []
+        while self.pos < self.count:
+            lanes, times = self._read(
+                self.pos, min(self.pos + INDEX_STRIDE, self.count)
+            )
+            cut = int(np.searchsorted(times, t, side="right"))
+            parts_lanes.append(lanes[:cut])
+            parts_times.append(times[:cut])
+            self.pos += cut
+            if cut < times.size:
+                break
+        if not parts_times:
+            return _empty_arrays()
+        return np.concatenate(parts_lanes), np.concatenate(parts_times)
+
+    def chunks(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """The remaining notes, INDEX_STRIDE at a time."""
+        while self.pos < self.count:
+            stop = min(self.pos + INDEX_STRIDE, self.count)
+            chunk = self._read(self.pos, stop)
+            self.pos = stop
+            yield chunk
+
+
 def delete_chart(chart_path: Path) -> bool:
-    """Attempts to permanently delete the chart file from disk."""
+    """
+    Attempts to permanently delete the chart file from disk.
+    True once the .txt is gone; its compiled twin and replays follow on a
+    best-effort basis (an orphaned .phc is never read again).
+    """
+    if not chart_path or not chart_path.exists():
+        return False
+    try:
+        chart_path.unlink()
+    except OSError:
+        return False
     try:
-        if chart_path and chart_path.exists():
-            chart_path.unlink()
-            return True
+        compiled_path(chart_path).unlink(missing_ok=True)
     except OSError:
         pass
-    return False
+    # Replays are meaningless without their chart
+    shutil.rmtree(replays_dir(chart_path), ignore_errors=True)
+    return True
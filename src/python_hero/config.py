@@ -1,5 +1,4 @@
 from pathlib import Path
-import pygame
 
 # ============================================================
 # PROJECT PATHS
@@ -9,9 +8,7 @@ import pygame
 # .parents[2] goes: src/python_hero -> src -> python-hero/
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 ASSETS_DIR = PROJECT_ROOT / "assets"
-
-# Ensure directories exist so the game doesn't crash on first run
-ASSETS_DIR.mkdir(parents=True, exist_ok=True)
+# Created on first use (SongLibrary.scan, save_chart_to_path), not at import
 
 # ============================================================
 # WINDOW CONFIG
@@ -20,6 +17,28 @@ ASSETS_DIR.mkdir(parents=True, exist_ok=True)
 WIDTH = 1400
 HEIGHT = 900
 FPS = 60
+# Input is pumped and timestamped at this rate, between frames
+INPUT_POLL_HZ = 1000
+
+# Render pacing. "vsync" lets the display flip set the rate.
+FRAME_MODES = {
+    "60": 60,
+    "120": 120,
+    "144": 144,
+    "240": 240,
+    "uncapped": 0,
+    "vsync": 0,
+}
+FRAME_MODE = "60"
+# The pacer sleeps until this close to the deadline, then spins
+PACER_SPIN_MS = 1.5
+
+# Menus only redraw on change and tick slower when nobody is around
+MENU_HZ = 60
+IDLE_HZ = 15
+UNFOCUSED_HZ = 5
+# Seconds without input before a menu counts as idle
+IDLE_AFTER = 10.0
 
 # ============================================================
 # GAMEPLAY GEOMETRY
@@ -36,7 +55,40 @@ HIT_BOTTOM = END_Y - HIT_HALF_HEIGHT
 
 # Seconds a note takes to travel from START_Y to END_Y
 LEAD_TIME = 4.0
+# Streamed charts keep LEAD_TIME plus this many seconds of notes loaded
+STREAM_LOOKAHEAD = 2.0
 NOTE_RADIUS = 14
+# Notes shrink toward the horizon; sprites are pre-rendered at this many sizes
+NOTE_SCALE_STEPS = 16
+
+# ============================================================
+# TIMING WINDOWS (milliseconds either side of the note)
+# ============================================================
+
+# GOOD matches the old hit zone: 18 units of 446 over LEAD_TIME ~= 160 ms
+PERFECT_WINDOW_MS = 45
+GREAT_WINDOW_MS = 90
+GOOD_WINDOW_MS = 160
+# Presses this close still consume the note, but count as a miss
+MISS_WINDOW_MS = 220
+
+# Hit-offset telemetry: histogram bin width over the miss window either side,
+# and the buckets of the hit/miss timeline on the results screen
+OFFSET_BIN_MS = 10
+TIMELINE_BUCKETS = 120
+
+# ============================================================
+# SONG CLOCK
+# ============================================================
+
+# "audio" follows the mixer playback position, "wall" uses perf_counter only
+SONG_CLOCK = "audio"
+# Subtracted from the mixer position to account for the output buffer
+AUDIO_LATENCY_MS = 0
+# Drift above this (seconds) snaps to the audio clock instead of slewing
+AUDIO_SNAP_THRESHOLD = 0.1
+# Fraction of the drift corrected on each mixer update
+AUDIO_SMOOTHING = 0.1
 
 # ============================================================
 # LANE X POSITIONS (Perspective Transform)
@@ -82,6 +134,44 @@ HITLINE_SCREEN_Y = HEIGHT - 180
 # Compute CENTER_Y so END_Y maps exactly to HITLINE_SCREEN_Y
 CENTER_Y = HITLINE_SCREEN_Y + int(END_Y * SCALE)
 
+# ============================================================
+# CHART GENERATOR
+# ============================================================
+
+# Analysis runs on mono audio at this rate, STFT_SIZE-sample frames every HOP
+CHARTGEN_SAMPLE_RATE = 22050
+CHARTGEN_STFT_SIZE = 2048
+CHARTGEN_HOP = 512
+# Onsets must beat the local average flux by this much (in local std devs)
+CHARTGEN_SENSITIVITY = 1.5
+# Minimum seconds between generated notes (caps the density)
+CHARTGEN_MIN_GAP = 0.12
+
+# Cold start to the first splash frame must stay under this (bench --startup)
+STARTUP_BUDGET_MS = 1000
+
+# Seconds between journal flushes while recording (at most this much of a
+# take is lost in a crash)
+JOURNAL_FLUSH_INTERVAL = 0.25
+
+# Frames kept by the F3 profiler overlay (10 s at 60 FPS)
+PROFILER_FRAMES = 600
+# Seconds between redraws of the overlay panel
+PROFILER_REFRESH = 0.25
+
+# ============================================================
+# SAVE DATA
+# ============================================================
+
+# "json" keeps one best per chart; "sqlite" stores every play in scores.db
+SCORE_BACKEND = "json"
+
+# Song library rescans use a process pool once this many files changed
+LIBRARY_POOL_THRESHOLD = 16
+
+# Songs and charts highlighted in the menus are preloaded into this much memory
+PREFETCH_CACHE_MB = 96
+
 # ============================================================
 # ASCII SPLASH ART
 # ============================================================
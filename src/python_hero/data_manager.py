@@ -1,9 +1,16 @@
 from __future__ import annotations
+import atexit
 import json
-import pygame
+import os
+import tempfile
+import threading
+import time
 from pathlib import Path
 from dataclasses import dataclass, field, asdict
-from typing import Dict, List
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .score_store import PlayRow, ScoreStore
+from .telemetry import OffsetStats
 
 
 @dataclass
@@ -21,53 +28,389 @@ class PlayerStats:
 @dataclass
 class Profile:
     name: str
-    keys: List[int] = field(
-        default_factory=lambda: [
-            pygame.K_y,
-            pygame.K_u,
-            pygame.K_i,
-            pygame.K_o,
-            pygame.K_p,
-        ]
-    )
+    # pygame key codes for Y U I O P (pygame.K_y ...), kept as plain ints so
+    # save data and the tools never have to import pygame
+    keys: List[int] = field(default_factory=lambda: [121, 117, 105, 111, 112])
     stats: PlayerStats = field(default_factory=PlayerStats)
+    # Hit offsets over every finished play, e.g. to spot a laggy cabinet
+    offsets: OffsetStats = field(default_factory=OffsetStats)
+
+
+def atomic_write_json(path: Path, data: Any) -> None:
+    """Writes to a temp file in the same folder, then renames over the target."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class _WriteBehind:
+    """
+    Background writer for JSON saves.
+    Saves scheduled within `delay` seconds of each other are coalesced, so a
+    burst of updates to one file costs a single write.
+    """
+
+    def __init__(self, delay: float, on_written: Callable[[Path], None]):
+        self.delay = delay
+        self.on_written = on_written
+        self._pending: Dict[Path, Any] = {}
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="save-writer", daemon=True
+        )
+        self._thread.start()
+
+    def schedule(self, path: Path, data: Any) -> None:
+        with self._cond:
+            self._pending[path] = data  # Latest snapshot wins
+            self._cond.notify()
+
+    def cancel(self, path: Path) -> None:
+        # Taking the I/O lock waits out a write of this file already in flight
+        with self._io_lock, self._cond:
+            self._pending.pop(path, None)
+
+    def is_pending(self, path: Path) -> bool:
+        with self._cond:
+            return path in self._pending
+
+    def flush(self) -> None:
+        """Writes everything still pending, on the calling thread."""
+        with self._cond:
+            batch, self._pending = self._pending, {}
+        self._write(batch)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        # A batch the thread already took is written before it exits
+        self._thread.join()
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+            # Let the burst settle before touching the disk
+            time.sleep(self.delay)
+            with self._cond:
+                batch, self._pending = self._pending, {}
+            self._write(batch)
+
+    def _write(self, batch: Dict[Path, Any]) -> None:
+        with self._io_lock:
+            for path, data in batch.items():
+                try:
+                    atomic_write_json(path, data)
+                    self.on_written(path)
+                except OSError:
+                    # Keep the in-memory copy; the next save will retry
+                    pass
+
+
+# JSON files in save_data that are not profiles
+SYSTEM_FILES = ("global_bests", "profiles_meta")
+# Caches live in save_data/cache/, where no profile name can collide with them.
+# Older versions wrote these to save_data/ itself.
+CACHE_FILES = ("library", "fonts")
+PROFILE_INDEX_VERSION = 1
+
+# (player, chart, hits before, hits after, total, played_at) for one re-judged run
+RescoredRun = Tuple[str, str, int, int, int, float]
+
+
+def _percent(hits: int, total: int) -> float:
+    return round((hits / total) * 100, 2) if total > 0 else 0
 
 
 class DataManager:
-    def __init__(self, save_path: str = "save_data"):
+    """
+    Keeps global bests and profiles in memory as the source of truth.
+    Changes reach disk through a background writer; files edited by another
+    process are picked up again through their mtime.
+
+    With backend="sqlite" every play is stored in save_data/scores.db and
+    the leaderboard comes from there; profile JSON files keep keys and PBs.
+    """
+
+    def __init__(
+        self,
+        save_path: str = "save_data",
+        flush_delay: float = 0.5,
+        check_interval: float = 1.0,
+        backend: str = "json",
+    ):
         self.base_path = Path(save_path)
         self.base_path.mkdir(exist_ok=True)
+        self.cache_path = self.base_path / "cache"
+        self.cache_path.mkdir(exist_ok=True)
         self.global_bests_path = self.base_path / "global_bests.json"
+        self.meta_path = self.base_path / "profiles_meta.json"
         self._ensure_files()
+        self._migrate_caches()
+
+        # In-memory state and the file mtimes it corresponds to
+        self._bests: Optional[Dict[str, Dict]] = None
+        self._profiles: Dict[str, Profile] = {}
+        self._known_mtime: Dict[Path, int] = {}
+        self._last_check: Dict[Path, float] = {}
+        self.check_interval = check_interval
+
+        self._writer = _WriteBehind(flush_delay, self._on_written)
+
+        # Profile index: lowercased name -> name/file/last_played/summary stats
+        self._index: Dict[str, Dict] = {}
+        self._load_index()
+
+        # Optional SQLite play history
+        self.scores: Optional[ScoreStore] = None
+        self._scores_version = -1
+        if backend == "sqlite":
+            store = ScoreStore(self.base_path / "scores.db")
+            if not store.is_migrated():
+                # Read the JSON saves before the store takes over
+                store.migrate(self._legacy_rows())
+                self._bests = None
+            self.scores = store
+
+        atexit.register(self.close)
 
     def _ensure_files(self):
         if not self.global_bests_path.exists():
             with open(self.global_bests_path, "w") as f:
                 json.dump({}, f)
 
+    def _migrate_caches(self) -> None:
+        """Moves caches left in save_data/ by older versions into cache/."""
+        for stem in CACHE_FILES:
+            old = self.base_path / f"{stem}.json"
+            try:
+                with open(old, "r") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            # A profile that happens to have the same name stays put
+            if isinstance(data, dict) and "keys" in data:
+                continue
+            try:
+                os.replace(old, self.cache_path / old.name)
+            except OSError:
+                pass
+
+    # --- Cache Plumbing ---
+
+    def _profile_path(self, profile_name: str) -> Path:
+        # We lowercase the filename to avoid "Guest.json" vs "guest.json" conflicts
+        return self.base_path / f"{profile_name.lower()}.json"
+
+    def _remember_mtime(self, path: Path) -> None:
+        try:
+            self._known_mtime[path] = path.stat().st_mtime_ns
+        except OSError:
+            self._known_mtime.pop(path, None)
+
+    def _on_written(self, path: Path) -> None:
+        self._remember_mtime(path)
+        # Our own renames touch the folder too; that is not drift
+        self._remember_mtime(self.base_path)
+        entry = self._index.get(path.stem)
+        # A cache file may share its stem with a profile ("library.json")
+        if (
+            entry is not None
+            and path.parent == self.base_path
+            and path.stem not in SYSTEM_FILES
+        ):
+            entry["mtime_ns"] = self._known_mtime.get(path, 0)
+
+    def _changed_on_disk(self, path: Path) -> bool:
+        """True if another process rewrote `path` since we last read/wrote it."""
+        now = time.monotonic()
+        if now - self._last_check.get(path, 0.0) < self.check_interval:
+            return False
+        self._last_check[path] = now
+
+        # Our own unsaved changes are newer than whatever is on disk
+        if self._writer.is_pending(path):
+            return False
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            return False
+        return mtime != self._known_mtime.get(path)
+
+    def _save_bests(self) -> None:
+        snapshot = {k: dict(v) for k, v in (self._bests or {}).items()}
+        self._writer.schedule(self.global_bests_path, snapshot)
+
+    def save_cache(self, path: Path, data: Any) -> None:
+        """Writes a file in cache/ on the background writer, like the saves."""
+        self._writer.schedule(path, data)
+
+    def flush(self) -> None:
+        """Blocks until every pending change is on disk."""
+        self._writer.flush()
+
+    def close(self) -> None:
+        self._writer.close()
+        if self.scores is not None:
+            self.scores.close()
+            self.scores = None
+
+    def _legacy_rows(self) -> Iterator[PlayRow]:
+        """Existing JSON bests as play rows, for the one-time SQLite import."""
+        seen = set()
+        try:
+            played_at = self.global_bests_path.stat().st_mtime
+        except OSError:
+            played_at = 0.0
+
+        def row(player: str, chart: str, hits: int, percent: float) -> PlayRow:
+            seen.add((player.lower(), chart, hits))
+            # Old saves only kept the percentage; recover the note count
+            total = round(hits * 100 / percent) if percent else hits
+            return (player.lower(), player, chart, hits, total, percent, played_at)
+
+        for chart, rec in self.get_global_bests().items():
+            player = rec.get("player", "???")
+            yield row(player, chart, rec.get("hits", 0), rec.get("accuracy", 0.0))
+
+        for name in self.list_profile_names():
+            profile = self.load_profile(name)
+            for chart, stat in profile.stats.song_data.items():
+                if (profile.name.lower(), chart, stat.best_hits) not in seen:
+                    yield row(profile.name, chart, stat.best_hits, stat.best_percent)
+
+    # --- Profiles ---
+
     def list_profile_names(self) -> List[str]:
-        """Returns clean list of profile names found in save folder."""
-        # ignore system files and metadata
-        return [
-            f.stem
-            for f in self.base_path.glob("*.json")
-            if f.stem not in ("global_bests", "profiles_meta")
-        ]
+        """Profile file stems from the index, most recently played first."""
+        if self._changed_on_disk(self.base_path):
+            self._reconcile_index()
+        entries = sorted(
+            self._index.items(),
+            key=lambda item: (-item[1].get("last_played", 0.0), item[0]),
+        )
+        return [key for key, _ in entries]
 
     def save_profile(self, profile: Profile):
-        # We lowercase the filename to avoid "Guest.json" vs "guest.json" conflicts
-        path = self.base_path / f"{profile.name.lower()}.json"
-        with open(path, "w") as f:
-            json.dump(asdict(profile), f, indent=4)
+        path = self._profile_path(profile.name)
+        self._profiles[profile.name.lower()] = profile
+        # asdict() deep-copies, so the writer never sees later mutations
+        self._writer.schedule(path, asdict(profile))
+        self._index_profile(profile)
+
+    # --- Profile Index ---
+
+    def _scan_profile_files(self) -> Dict[str, int]:
+        """Profile file stems and their mtimes, from one directory listing."""
+        files = {}
+        with os.scandir(self.base_path) as it:
+            for entry in it:
+                stem, ext = os.path.splitext(entry.name)
+                # ignore system files and metadata
+                if ext == ".json" and stem not in SYSTEM_FILES and entry.is_file():
+                    files[stem] = entry.stat().st_mtime_ns
+        return files
+
+    def _load_index(self) -> Dict[str, Dict]:
+        """Reads profiles_meta.json and reconciles it with the folder."""
+        try:
+            with open(self.meta_path, "r") as f:
+                meta = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            meta = None
+
+        # Older saves kept a bare list here; those are rebuilt from scratch
+        if not isinstance(meta, dict) or meta.get("version") != PROFILE_INDEX_VERSION:
+            self._index = {}
+        else:
+            self._index = meta.get("profiles", {})
+        return self._reconcile_index()
+
+    def _reconcile_index(self) -> Dict[str, Dict]:
+        """Re-reads only profiles that appeared or changed; drops deleted ones."""
+        self._remember_mtime(self.base_path)
+        files = self._scan_profile_files()
+        index = {}
+        changed = set(self._index) != set(files)
+        for stem, mtime in files.items():
+            entry = self._index.get(stem)
+            if entry is None or entry.get("mtime_ns") != mtime:
+                profile = self._read_profile(self.base_path / f"{stem}.json", stem)
+                entry = self._index_entry(profile, entry)
+                entry["mtime_ns"] = mtime
+                changed = True
+            index[stem] = entry
+
+        self._index = index
+        if changed:
+            self._save_index()
+        return index
+
+    def _index_entry(self, profile: Profile, old: Optional[Dict] = None) -> Dict:
+        old = old or {}
+        percents = [s.best_percent for s in profile.stats.song_data.values()]
+        return {
+            "name": profile.name,
+            "file": self._profile_path(profile.name).name,
+            "mtime_ns": old.get("mtime_ns", 0),
+            "last_played": old.get("last_played", 0.0),
+            "plays": old.get("plays", 0),
+            "charts_played": len(percents),
+            "avg_percent": round(sum(percents) / len(percents), 2) if percents else 0,
+        }
+
+    def _index_profile(self, profile: Profile, played: bool = False) -> None:
+        key = profile.name.lower()
+        entry = self._index_entry(profile, self._index.get(key))
+        if played:
+            entry["last_played"] = time.time()
+            entry["plays"] += 1
+        self._index[key] = entry
+        self._save_index()
+
+    def _save_index(self) -> None:
+        meta = {
+            "version": PROFILE_INDEX_VERSION,
+            "profiles": {k: dict(v) for k, v in self._index.items()},
+        }
+        self._writer.schedule(self.meta_path, meta)
 
     def load_profile(self, profile_name: str) -> Profile:
-        path = self.base_path / f"{profile_name.lower()}.json"
+        key = profile_name.lower()
+        path = self._profile_path(profile_name)
+        cached = self._profiles.get(key)
+        if cached is not None and not self._changed_on_disk(path):
+            return cached
+
+        profile = self._read_profile(path, profile_name)
+        self._profiles[key] = profile
+        return profile
+
+    def _read_profile(self, path: Path, profile_name: str) -> Profile:
         if not path.exists():
             return Profile(name=profile_name)
 
         try:
             with open(path, "r") as f:
                 data = json.load(f)
+            self._remember_mtime(path)
 
             # Reconstruct SongStat objects from raw dictionary data
             raw_song_data = data.get("stats", {}).get("song_data", {})
@@ -80,33 +423,67 @@ class DataManager:
                 name=data.get("name", profile_name),
                 keys=data.get("keys", Profile(name="").keys),
                 stats=PlayerStats(song_data=reconstructed_stats),
+                offsets=OffsetStats.from_dict(data.get("offsets")),
             )
         except (json.JSONDecodeError, KeyError, TypeError):
             return Profile(name=profile_name)
 
+    # --- Scores ---
+
     def get_global_bests(self) -> Dict[str, Dict]:
-        try:
-            with open(self.global_bests_path, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return {}
+        """Cheap enough to call every frame: served from memory."""
+        if self.scores is not None:
+            # data_version moves when another process commits new plays
+            version = self.scores.data_version()
+            if self._bests is None or version != self._scores_version:
+                self._bests = self.scores.best_per_chart()
+                self._scores_version = version
+            return self._bests
+
+        if self._bests is None or self._changed_on_disk(self.global_bests_path):
+            try:
+                with open(self.global_bests_path, "r") as f:
+                    self._bests = json.load(f)
+                self._remember_mtime(self.global_bests_path)
+            except (json.JSONDecodeError, IOError):
+                self._bests = {}
+        return self._bests
 
     def update_records(
-        self, chart: str, profile: Profile, hits: int, total: int
+        self,
+        chart: str,
+        profile: Profile,
+        hits: int,
+        total: int,
+        played_at: Optional[float] = None,
+        offsets: Optional[OffsetStats] = None,
     ) -> bool:
-        """Saves new records if hits are higher than previous bests."""
-        percent = round((hits / total) * 100, 2) if total > 0 else 0
+        """
+        Saves new records if hits are higher than previous bests.
+        The run's hit offsets, if given, are added to the profile's.
+        """
+        percent = _percent(hits, total)
         is_new_pb = False
 
         # 1. Update Global Leaders
-        bests = self.get_global_bests()
-        # Use .get() safely to compare hits
-        global_hits = bests.get(chart, {}).get("hits", -1)
+        if self.scores is not None:
+            # Every play is kept; the leaderboard is derived on next read
+            self.scores.record_play(
+                profile.name, chart, hits, total, percent, played_at
+            )
+            self._bests = None
+        else:
+            bests = self.get_global_bests()
+            # Use .get() safely to compare hits
+            global_hits = bests.get(chart, {}).get("hits", -1)
 
-        if hits > global_hits:
-            bests[chart] = {"player": profile.name, "hits": hits, "accuracy": percent}
-            with open(self.global_bests_path, "w") as f:
-                json.dump(bests, f, indent=4)
+            if hits > global_hits:
+                bests[chart] = {
+                    "player": profile.name,
+                    "hits": hits,
+                    "accuracy": percent,
+                }
+                self._save_bests()
 
         # 2. Update Local Profile
         current_pb = profile.stats.song_data.get(chart, SongStat())
@@ -114,18 +491,86 @@ class DataManager:
             profile.stats.song_data[chart] = SongStat(
                 best_hits=hits, best_percent=percent
             )
-            self.save_profile(profile)
             is_new_pb = True
+        if offsets is not None:
+            profile.offsets.merge(offsets)
+        if is_new_pb or offsets is not None:
+            self.save_profile(profile)
 
+        self._index_profile(profile, played=True)
         return is_new_pb
 
+    def apply_rescore(self, runs: Iterable[RescoredRun]) -> None:
+        """
+        Replaces records with re-judged runs (see rescore.py).
+        Each chart's global best and each profile's PB become the best
+        re-judged run; charts and profiles without runs keep their records.
+        A record higher than any run had before re-judging was set by a run
+        without a replay: it stands unless a re-judged run beats it.
+        SQLite play rows are matched by profile, chart and played_at.
+        """
+        runs = list(runs)
+        chart_best: Dict[str, RescoredRun] = {}
+        chart_old: Dict[str, int] = {}
+        profile_best: Dict[str, Dict[str, RescoredRun]] = {}
+        profile_old: Dict[str, Dict[str, int]] = {}
+        for run in runs:
+            player, chart, old_hits, hits = run[:4]
+            if hits > chart_best.get(chart, ("", "", 0, -1))[3]:
+                chart_best[chart] = run
+            chart_old[chart] = max(chart_old.get(chart, 0), old_hits)
+            mine = profile_best.setdefault(player.lower(), {})
+            if hits > mine.get(chart, ("", "", 0, -1))[3]:
+                mine[chart] = run
+            mine_old = profile_old.setdefault(player.lower(), {})
+            mine_old[chart] = max(mine_old.get(chart, 0), old_hits)
+
+        # 1. Global leaders
+        if self.scores is not None:
+            # Rows without a replay are left alone, so they still count
+            self.scores.rescore(
+                (hits, _percent(hits, total), player.lower(), chart, played_at)
+                for player, chart, _, hits, total, played_at in runs
+            )
+            self._bests = None
+        else:
+            bests = self.get_global_bests()
+            for chart, (player, _, _, hits, total, _) in chart_best.items():
+                record = bests.get(chart, {}).get("hits", -1)
+                if record > chart_old[chart] and record >= hits:
+                    continue
+                bests[chart] = {
+                    "player": player,
+                    "hits": hits,
+                    "accuracy": _percent(hits, total),
+                }
+            self._save_bests()
+
+        # 2. Personal bests, for profiles that still exist
+        known = set(self.list_profile_names())
+        for key, charts in profile_best.items():
+            if key not in known:
+                continue
+            profile = self.load_profile(key)
+            for chart, (_, _, _, hits, total, _) in charts.items():
+                record = profile.stats.song_data.get(chart, SongStat()).best_hits
+                if record > profile_old[key][chart] and record >= hits:
+                    continue
+                profile.stats.song_data[chart] = SongStat(
+                    best_hits=hits, best_percent=_percent(hits, total)
+                )
+            self.save_profile(profile)
+
     def reset_chart_score(self, chart_name: str, profile: Profile):
         """Wipes records for a specific chart from global and current profile."""
-        bests = self.get_global_bests()
-        if chart_name in bests:
-            del bests[chart_name]
-            with open(self.global_bests_path, "w") as f:
-                json.dump(bests, f, indent=4)
+        if self.scores is not None:
+            self.scores.delete_chart(chart_name)
+            self._bests = None
+        else:
+            bests = self.get_global_bests()
+            if chart_name in bests:
+                del bests[chart_name]
+                self._save_bests()
 
         if chart_name in profile.stats.song_data:
             del profile.stats.song_data[chart_name]
@@ -133,16 +578,43 @@ class DataManager:
 
     def reset_all_scores(self, profile: Profile):
         """Wipes global leaderboard and current profile's stats."""
-        with open(self.global_bests_path, "w") as f:
-            json.dump({}, f, indent=4)
+        if self.scores is not None:
+            self.scores.delete_all()
+            self._bests = None
+        else:
+            self._bests = {}
+            self._save_bests()
         profile.stats.song_data.clear()
         self.save_profile(profile)
 
+    def top_scores(self, chart: str, limit: int = 10) -> List[Dict]:
+        """Best plays of a chart; the JSON backend only knows the record."""
+        if self.scores is not None:
+            return self.scores.top_scores(chart, limit)
+        best = self.get_global_bests().get(chart)
+        return [best] if best else []
+
+    def play_history(self, profile_name: str, limit: int = 50) -> List[Dict]:
+        if self.scores is None:
+            return []
+        return self.scores.profile_history(profile_name, limit)
+
+    def score_summary(self, profile_name: Optional[str] = None) -> Dict:
+        if self.scores is None:
+            return {}
+        return self.scores.aggregates(profile_name)
+
     def delete_profile(self, profile_name: str) -> bool:
-        path = self.base_path / f"{profile_name}.json"
+        path = self._profile_path(profile_name)
+        # Drop unsaved changes first so the writer cannot resurrect the file
+        self._writer.cancel(path)
+        self._profiles.pop(profile_name.lower(), None)
+        if self._index.pop(profile_name.lower(), None) is not None:
+            self._save_index()
         if path.exists():
             try:
                 path.unlink()
+                self._remember_mtime(self.base_path)
                 return True
             except OSError:
                 return False
@@ -1,87 +1,209 @@
 from __future__ import annotations
 import time
-from dataclasses import dataclass
-from typing import List, Tuple, Final
-from . import config
-
+from typing import TYPE_CHECKING, Callable, Optional, Sequence, Tuple
 
-@dataclass
-class Note:
-    lane: int
-    target_time: float
+import numpy as np
+from . import config
 
-    def position(self, song_time: float) -> tuple[float, float]:
-        """Calculates (x, y) in GAME SPACE based on time ratio."""
-        # How much time is left until this note hits the line?
-        time_to_hit = self.target_time - song_time
+if TYPE_CHECKING:
+    from .charts import ChartReader
+
+
+class NoteTrack:
+    """
+    Struct-of-arrays chart used during play.
+    Lanes and target times live in contiguous NumPy arrays sorted by time;
+    the notes on screen are the index window [head, tail).
+
+    A streamed track (NoteTrack.stream) holds only a sliding part of the
+    chart: `base` is the chart index of times[0], spawn() reads ahead from
+    the ChartReader and drops what cleanup() has passed. Indices into the
+    arrays are local; add `base` for the note's index in the chart.
+    """
+
+    def __init__(self, lanes: np.ndarray, times: np.ndarray):
+        times = np.asarray(times, dtype=np.float64)
+        lanes = np.asarray(lanes, dtype=np.int8)
+
+        # Keep chart order for equal timestamps (chords)
+        if times.size > 1 and np.any(times[1:] < times[:-1]):
+            order = np.argsort(times, kind="stable")
+            times, lanes = times[order], lanes[order]
+
+        self.times = np.ascontiguousarray(times)
+        self.lanes = np.ascontiguousarray(lanes)
+        self.hit = np.zeros(self.times.size, dtype=bool)
+        self.head = 0
+        self.tail = 0
+        self.base = 0
+        self.total = int(self.times.size)
+        self.reader: Optional[ChartReader] = None
+        # Every note up to this song time is in the arrays
+        self.loaded_until = float("inf")
+
+    @classmethod
+    def stream(cls, reader: ChartReader, start: float = 0.0) -> NoteTrack:
+        """A track that reads `reader` as the song plays, from song time `start`."""
+        track = cls.empty()
+        track.reader = reader
+        track.total = len(reader)
+        track.base = reader.seek(start) if start > 0 else 0
+        track.loaded_until = float("-inf")
+        return track
+
+    @classmethod
+    def from_notes(cls, notes: Sequence[Tuple[int, float]]) -> NoteTrack:
+        if not notes:
+            return cls.empty()
+        lanes, times = zip(*notes)
+        return cls(np.array(lanes), np.array(times))
+
+    @classmethod
+    def empty(cls) -> NoteTrack:
+        return cls(np.empty(0, dtype=np.int8), np.empty(0, dtype=np.float64))
+
+    def __len__(self) -> int:
+        """Notes in the whole chart, including the ones not read yet."""
+        return self.total
+
+    def load_until(self, t: float) -> None:
+        """Streams in every note up to song time `t` (plus the lookahead)."""
+        if self.reader is None or t <= self.loaded_until:
+            return
+        until = t + config.STREAM_LOOKAHEAD
+        lanes, times = self.reader.read_until(until)
+        if self.reader.pos >= len(self.reader):
+            until = float("inf")
+            self.reader.close()
+
+        # Drop what cleanup() has passed, then append the new notes
+        drop = self.head
+        self.times = np.concatenate((self.times[drop:], times))
+        self.lanes = np.concatenate((self.lanes[drop:], lanes))
+        self.hit = np.concatenate((self.hit[drop:], np.zeros(times.size, dtype=bool)))
+        self.base += drop
+        self.head, self.tail = 0, self.tail - drop
+        self.loaded_until = until
+
+    def close(self) -> None:
+        """Releases the chart file of a streamed track; nothing more is read."""
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+
+    def spawn(self, now: float) -> None:
+        """Extends the window to every note that entered the LEAD_TIME window."""
+        self.load_until(now + config.LEAD_TIME)
+        end = int(np.searchsorted(self.times, now + config.LEAD_TIME, side="right"))
+        self.tail = max(self.tail, end)
+
+    def cleanup(self, now: float) -> None:
+        """Drops notes that have fallen significantly off-screen."""
+        # If the note is more than 1 second past its target time, it is gone
+        start = int(np.searchsorted(self.times, now - 1.0, side="right"))
+        self.head = min(max(self.head, start), self.tail)
+
+    def visible(self) -> np.ndarray:
+        """Indices of on-screen notes that have not been hit yet."""
+        idx = np.arange(self.head, self.tail)
+        return idx[~self.hit[self.head : self.tail]]
+
+    def positions(self, now: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(indices, x, y) in GAME SPACE for every visible note, in one pass."""
+        idx = self.visible()
 
         # 1.0 = Just spawned at START_Y, 0.0 = At the hit zone (END_Y)
-        ratio = time_to_hit / config.LEAD_TIME
+        ratio = (self.times[idx] - now) / config.LEAD_TIME
 
-        sx, ex = config.LANE_START_X[self.lane], config.LANE_END_X[self.lane]
+        lanes = self.lanes[idx]
+        sx = np.asarray(config.LANE_START_X, dtype=np.float64)[lanes]
+        ex = np.asarray(config.LANE_END_X, dtype=np.float64)[lanes]
 
         # Linear interpolation (Lerp)
         x = ex + (sx - ex) * ratio
         y = config.END_Y + (config.START_Y - config.END_Y) * ratio
-        return x, y
-
-
-def spawn_notes(
-    recorded: List[Tuple[int, float]],
-    active_notes: List[Note],
-    now: float,
-    spawn_index: int,
-) -> int:
-    """Spawns notes when they enter the LEAD_TIME window."""
-    while spawn_index < len(recorded):
-        lane, t_note = recorded[spawn_index]
-
-        # Only spawn if the note should be visible on screen
-        if now >= t_note - config.LEAD_TIME:
-            active_notes.append(Note(lane=lane, target_time=t_note))
-            spawn_index += 1
-        else:
-            break
-    return spawn_index
-
-
-def cleanup_notes(active_notes: List[Note], now: float) -> None:
-    """Removes notes that have fallen significantly off-screen."""
-    for n in list(active_notes):
-        # If the note is more than 1 second past its target time, kill it
-        if now > n.target_time + 1.0:
-            active_notes.remove(n)
+        return idx, x, y
 
 
 class GameplayManager:
-    def __init__(self):
-        self.start_time: float = 0.0
-        self.pause_start: float = 0.0
-        self.total_paused_time: float = 0.0
+    """
+    Owns the song clock.
+    In "audio" mode the clock follows the mixer's playback position and uses
+    perf_counter only to interpolate between the mixer's coarse updates.
+    In "wall" mode it is a plain perf_counter stopwatch with pauses removed.
+    """
+
+    def __init__(
+        self,
+        audio_pos: Optional[Callable[[], int]] = None,
+        clock_mode: str = config.SONG_CLOCK,
+    ):
+        # Milliseconds of playback, e.g. pygame.mixer.music.get_pos (-1 = stopped)
+        self.audio_pos = audio_pos
+        self.clock_mode = clock_mode if audio_pos else "wall"
         self.is_paused: bool = False
 
+        # song_time = anchor_song + (perf_counter() - anchor_perf)
+        self._anchor_song = 0.0
+        self._anchor_perf = 0.0
+        self._paused_at = 0.0
+        self._last_time = 0.0
+        self._last_audio_ms = -1
+
     def start_game(self) -> None:
-        self.start_time = time.time()
-        self.total_paused_time = 0.0
+        self._reanchor(0.0)
+        self._last_time = 0.0
         self.is_paused = False
 
     def pause(self) -> None:
         if not self.is_paused:
-            self.pause_start = time.time()
+            self._paused_at = self.current_song_time
             self.is_paused = True
 
     def resume(self) -> None:
         if self.is_paused:
-            # Add the duration of the current pause to the total offset
-            self.total_paused_time += time.time() - self.pause_start
+            # Continue exactly where we froze; the mixer resumes from there too
+            self._reanchor(self._paused_at)
             self.is_paused = False
 
     @property
     def current_song_time(self) -> float:
-        """The 'true' song time, ignoring pauses."""
+        """The 'true' song time, ignoring pauses. Never runs backwards."""
         if self.is_paused:
-            reference = self.pause_start
-        else:
-            reference = time.time()
+            return self._paused_at
+
+        now = time.perf_counter()
+        if self.clock_mode == "audio":
+            self._sync_audio(now)
 
-        return reference - self.start_time - self.total_paused_time
+        t = self._anchor_song + (now - self._anchor_perf)
+        self._last_time = max(self._last_time, t)
+        return self._last_time
+
+    def song_time_at(self, timestamp: float) -> float:
+        """Song time at a past time.perf_counter() timestamp (e.g. a key press)."""
+        if self.is_paused:
+            return self._paused_at
+        return self.current_song_time - (time.perf_counter() - timestamp)
+
+    def _reanchor(self, song_time: float) -> None:
+        self._anchor_song = song_time
+        self._anchor_perf = time.perf_counter()
+        # Ignore the position we already know about; wait for the next update
+        self._last_audio_ms = self.audio_pos() if self.audio_pos else -1
+
+    def _sync_audio(self, now: float) -> None:
+        """Pulls the interpolated clock towards the mixer position."""
+        pos_ms = self.audio_pos()
+        if pos_ms < 0 or pos_ms == self._last_audio_ms:
+            return
+        self._last_audio_ms = pos_ms
+
+        audio_t = (pos_ms - config.AUDIO_LATENCY_MS) / 1000.0
+        error = audio_t - (self._anchor_song + (now - self._anchor_perf))
+        if abs(error) > config.AUDIO_SNAP_THRESHOLD:
+            # Seek, hiccup or device stall: jump straight to the audio clock
+            self._anchor_song += error
+        else:
+            # Small drift: slew gradually so notes never visibly jump
+            self._anchor_song += error * config.AUDIO_SMOOTHING
@@ -0,0 +1,310 @@
+# src/python_hero/headless.py
+"""
+Headless soak/load runner for the full game loop.
+Drives App with the SDL dummy drivers and a fake mixer, feeds lane presses
+through handle_event, and renders every frame as fast as it can.
+Run from project root: python -m src.python_hero.headless --help
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from . import config
+from .bench import dense_chart
+from .gameplay import NoteTrack
+from .judge import Judgement
+
+
+class FakeMusic:
+    """
+    Stands in for pygame.mixer.music: a perf_counter stopwatch that 'plays'
+    for `duration` seconds and reports its position like the real mixer.
+    """
+
+    def __init__(self, duration: float):
+        self.duration = duration
+        self.started: Optional[float] = None
+        self.paused_at: Optional[float] = None
+
+    def load(self, filename, namehint: str = "") -> None:
+        self.started = self.paused_at = None
+
+    def play(self) -> None:
+        self.started, self.paused_at = time.perf_counter(), None
+
+    def stop(self) -> None:
+        self.started = self.paused_at = None
+
+    def pause(self) -> None:
+        if self.started is not None and self.paused_at is None:
+            self.paused_at = time.perf_counter()
+
+    def unpause(self) -> None:
+        if self.paused_at is not None:
+            self.started += time.perf_counter() - self.paused_at
+            self.paused_at = None
+
+    def _elapsed(self) -> float:
+        if self.started is None:
+            return -1.0
+        return (self.paused_at or time.perf_counter()) - self.started
+
+    def get_busy(self) -> bool:
+        return 0.0 <= self._elapsed() < self.duration
+
+    def get_pos(self) -> int:
+        elapsed = self._elapsed()
+        return int(elapsed * 1000) if elapsed >= 0 else -1
+
+
+def scripted_presses(
+    track: NoteTrack, jitter_ms: float, miss_rate: float, seed: int
+) -> List[Tuple[float, int]]:
+    """An autoplayer: one press per note, off by N(0, jitter), some skipped."""
+    rng = np.random.default_rng(seed)
+    offsets = rng.normal(0.0, jitter_ms / 1000.0, len(track))
+    keep = rng.random(len(track)) >= miss_rate
+    times = track.times[keep] + offsets[keep]
+    lanes = track.lanes[keep]
+    order = np.argsort(times, kind="stable")
+    return list(zip(times[order].tolist(), lanes[order].tolist()))
+
+
+def random_presses(
+    seconds: float, presses_per_second: float, seed: int
+) -> List[Tuple[float, int]]:
+    """Mashing: lane presses at Poisson-distributed times."""
+    rng = np.random.default_rng(seed)
+    count = rng.poisson(seconds * presses_per_second)
+    times = np.sort(rng.uniform(0.0, seconds, count))
+    lanes = rng.integers(0, len(config.LANE_COLORS), count)
+    return list(zip(times.tolist(), lanes.tolist()))
+
+
+@dataclass
+class SoakReport:
+    frames: int = 0
+    seconds: float = 0.0
+    notes: int = 0
+    presses: int = 0
+    grades: Dict[str, int] = field(default_factory=dict)
+    accuracy: float = 0.0
+    # Hit offsets in ms (mean / std / p50 / p95), plus the early fraction
+    offsets: Dict[str, float] = field(default_factory=dict)
+    # Milliseconds, keyed by "p50" / "p95" / "p99" / "max" / "mean"
+    frame_ms: Dict[str, float] = field(default_factory=dict)
+    update_ms: Dict[str, float] = field(default_factory=dict)
+    draw_ms: Dict[str, float] = field(default_factory=dict)
+    # Net interpreter blocks allocated per frame (sys.getallocatedblocks)
+    blocks_per_frame: float = 0.0
+    # Filled in with --tracemalloc only
+    peak_traced_kb: float = 0.0
+    top_allocations: List[str] = field(default_factory=list)
+
+    def format(self) -> str:
+        def row(name: str, ms: Dict[str, float]) -> str:
+            return f"{name:<8}" + "".join(f" {k} {v:7.3f}" for k, v in ms.items())
+
+        lines = [
+            f"{self.frames} frames in {self.seconds:.1f}s "
+            f"({self.frames / max(self.seconds, 1e-9):.0f} FPS)",
+            row("frame", self.frame_ms),
+            row("update", self.update_ms),
+            row("draw", self.draw_ms),
+            f"alloc    {self.blocks_per_frame:+.1f} blocks/frame",
+            f"notes {self.notes} | presses {self.presses} | "
+            + " ".join(f"{g} {n}" for g, n in self.grades.items())
+            + f" | accuracy {self.accuracy:.1%}",
+        ]
+        if self.offsets:
+            o = self.offsets
+            lines.append(
+                f"offset   mean {o['mean']:+.1f} sd {o['std']:.1f} "
+                f"p50 {o['p50']:+.1f} p95 {o['p95']:.1f} ms | {o['early']:.0%} early"
+            )
+        if self.top_allocations:
+            lines.append(f"traced peak {self.peak_traced_kb:.0f} KiB; top sites:")
+            lines += [f"  {line}" for line in self.top_allocations]
+        return "\n".join(lines)
+
+
+def _percentiles(samples: array) -> Dict[str, float]:
+    if not samples:
+        return {}
+    ms = np.asarray(samples) * 1000.0
+    p50, p95, p99 = np.percentile(ms, (50, 95, 99))
+    return {
+        "mean": float(ms.mean()),
+        "p50": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+        "max": float(ms.max()),
+    }
+
+
+def run_soak(
+    track: NoteTrack,
+    presses: List[Tuple[float, int]],
+    assets_dir: Path,
+    trace_alloc: bool = False,
+) -> SoakReport:
+    """
+    Plays `track` once through App, pressing keys at song times `presses`.
+    The game starts up on `assets_dir` (journal recovery, library scan)
+    instead of the real assets folder.
+    """
+    import pygame
+    from .app import App
+
+    duration = float(track.times[-1]) + 1.0 if len(track) else 1.0
+    app = App(music=FakeMusic(duration), assets_dir=assets_dir)
+    app.wait_until_loaded()
+    grades: Dict[str, int] = {}
+
+    def count(j: Judgement) -> None:
+        grades[j.grade] = grades.get(j.grade, 0) + 1
+
+    # Raw doubles, so recording samples does not show up as allocations
+    frame_times, update_times, draw_times = array("d"), array("d"), array("d")
+    keys = app.current_profile.keys
+
+    try:
+        app.song_path = Path("headless.mp3")
+        app.current_chart_path = None  # Keeps results out of the save data
+        app.start_play(track)
+        app.judge.listeners.append(count)
+
+        if trace_alloc:
+            tracemalloc.start()
+            baseline = tracemalloc.take_snapshot()
+        blocks_start = sys.getallocatedblocks()
+        next_press = 0
+        start = last = time.perf_counter()
+
+        while app.state == "game":
+            t = app.song_time()
+            while next_press < len(presses) and presses[next_press][0] <= t:
+                lane = presses[next_press][1]
+                app.handle_event(
+                    pygame.event.Event(pygame.KEYDOWN, key=keys[lane], unicode="")
+                )
+                next_press += 1
+
+            t0 = time.perf_counter()
+            app.update()
+            t1 = time.perf_counter()
+            app.draw()
+            pygame.display.flip()
+            t2 = time.perf_counter()
+
+            update_times.append(t1 - t0)
+            draw_times.append(t2 - t1)
+            frame_times.append(t2 - last)
+            last = t2
+
+        blocks = sys.getallocatedblocks() - blocks_start
+        peak_kb, top = 0.0, []
+        if trace_alloc:
+            peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+            # Growth during the run, not what startup left behind
+            stats = tracemalloc.take_snapshot().compare_to(baseline, "lineno")
+            top = [str(s) for s in stats[:10]]
+            tracemalloc.stop()
+
+        return SoakReport(
+            frames=len(frame_times),
+            seconds=last - start,
+            notes=len(track),
+            presses=next_press,
+            grades=grades,
+            # finalize_game_results skips scoring without a chart path
+            accuracy=app.score / max(len(track), 1),
+            offsets=(
+                app.telemetry.summary() if app.telemetry.stats.offsets.count else {}
+            ),
+            frame_ms=_percentiles(frame_times),
+            update_ms=_percentiles(update_times),
+            draw_ms=_percentiles(draw_times),
+            blocks_per_frame=blocks / max(len(frame_times), 1),
+            peak_traced_kb=peak_kb,
+            top_allocations=top,
+        )
+    finally:
+        app.prefetch.close()
+        app.data.close()
+        pygame.quit()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=30.0, help="chart length")
+    parser.add_argument("--nps", type=float, default=20.0, help="notes per second")
+    parser.add_argument(
+        "--input",
+        choices=("scripted", "random", "none"),
+        default="scripted",
+        help="autoplay every note, mash random lanes, or never press",
+    )
+    parser.add_argument("--jitter-ms", type=float, default=30.0)
+    parser.add_argument("--miss-rate", type=float, default=0.05)
+    parser.add_argument("--mash-rate", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument(
+        "--tracemalloc", action="store_true", help="trace allocation sites (slow)"
+    )
+    parser.add_argument("--json", type=Path, help="also write the report here")
+    parser.add_argument(
+        "--max-p99-ms",
+        type=float,
+        help="exit with status 1 if the p99 frame time is above this",
+    )
+    args = parser.parse_args(argv)
+
+    # Must be set before pygame initialises its subsystems
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+    track = dense_chart(max(1, int(args.seconds * args.nps)), args.nps, args.seed)
+    if args.input == "scripted":
+        presses = scripted_presses(track, args.jitter_ms, args.miss_rate, args.seed)
+    elif args.input == "random":
+        presses = random_presses(args.seconds + 1.0, args.mash_rate, args.seed)
+    else:
+        presses = []
+
+    # Profiles, the library catalog and the assets are scratch folders, not
+    # save_data/ and assets/
+    cwd, scratch = os.getcwd(), tempfile.mkdtemp(prefix="python_hero_soak_")
+    os.chdir(scratch)
+    try:
+        report = run_soak(track, presses, Path(scratch) / "assets", args.tracemalloc)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    print(report.format())
+    if args.json:
+        args.json.write_text(json.dumps(asdict(report), indent=4))
+    if (
+        args.max_p99_ms is not None
+        and report.frame_ms.get("p99", 0.0) > args.max_p99_ms
+    ):
+        print(f"FAIL: p99 frame time above {args.max_p99_ms} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
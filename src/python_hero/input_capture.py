@@ -0,0 +1,61 @@
+# src/python_hero/input_capture.py
+from __future__ import annotations
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Iterator, List
+
+import pygame
+
+
+@dataclass
+class LanePress:
+    lane: int
+    # time.perf_counter() at the moment the event was pumped
+    timestamp: float
+
+
+class InputCapture:
+    """
+    Pumps SDL events at a high rate, independent of the render FPS.
+    Lane presses are stamped with perf_counter when captured and queued for
+    the judge and the recorder; every other event is queued for handle_event.
+
+    SDL only delivers events on the thread that owns the window, so the
+    high-rate loop runs there (the frame pacer polls between frames) instead
+    of on a worker thread.
+    Both queues are deques: append/popleft are atomic, no locks needed.
+    """
+
+    def __init__(self, lane_for_key: Callable[[int], int]):
+        # Maps a key code to its lane, or -1 for keys that are not lanes
+        self.lane_for_key = lane_for_key
+        self.capture_lanes = False
+        self.presses: Deque[LanePress] = deque()
+        self.events: Deque[pygame.event.Event] = deque()
+
+    def poll(self) -> bool:
+        """Pumps pending events; returns True if anything arrived."""
+        events = pygame.event.get()
+        if not events:
+            return False
+
+        stamp = time.perf_counter()
+        for event in events:
+            if self.capture_lanes and event.type == pygame.KEYDOWN:
+                lane = self.lane_for_key(event.key)
+                if lane >= 0:
+                    self.presses.append(LanePress(lane, stamp))
+                    continue
+            self.events.append(event)
+        return True
+
+    def drain_presses(self) -> Iterator[LanePress]:
+        while self.presses:
+            yield self.presses.popleft()
+
+    def drain_events(self) -> List[pygame.event.Event]:
+        drained = []
+        while self.events:
+            drained.append(self.events.popleft())
+        return drained
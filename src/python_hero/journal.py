@@ -0,0 +1,183 @@
+# src/python_hero/journal.py
+from __future__ import annotations
+import os
+import struct
+import threading
+from array import array
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+from . import config
+from .charts import JOURNAL_SUFFIX, next_new_chart_path, save_chart_to_path
+
+# Journal layout (little endian):
+#   header | records, appended as the take goes on
+# A crash can only tear the last record; recovery drops the partial tail.
+JOURNAL_VERSION = 1
+_MAGIC = b"PHJR"
+# magic, version, lane count
+_HEADER = struct.Struct("<4sBB")
+_RECORD = np.dtype([("time", "<f8"), ("lane", "i1")])
+
+
+def journal_path(chart_path: Path) -> Path:
+    """The journal of a take beside its target chart: <name>_chart_XX.rec"""
+    return chart_path.with_suffix(JOURNAL_SUFFIX)
+
+
+class RecordingJournal:
+    """
+    A record-mode take on its way to disk.
+
+    Presses go into compact arrays on the main thread (an append, no I/O).
+    A writer thread appends the new ones to the journal beside the target
+    chart every JOURNAL_FLUSH_INTERVAL seconds and fsyncs, so a crash loses
+    at most that much of the take. finish() turns the journal into the
+    chart file on the same thread, off the UI.
+    """
+
+    def __init__(self, chart_path: Path):
+        self.chart_path = chart_path
+        self.path = journal_path(chart_path)
+        self.lanes = array("b")
+        self.times = array("d")
+        # Set once finish() has run to the end; error holds what went wrong
+        self.done = threading.Event()
+        self.error: Optional[str] = None
+        self._written = 0
+        # None while recording, then "save" | "discard" | "keep"
+        self._ending: Optional[str] = None
+        self._cond = threading.Condition()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "wb")
+        self._file.write(_HEADER.pack(_MAGIC, JOURNAL_VERSION, len(config.LANE_COLORS)))
+        self._thread = threading.Thread(target=self._run, name="journal", daemon=True)
+        self._thread.start()
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def append(self, lane: int, t: float) -> None:
+        self.lanes.append(lane)
+        self.times.append(t)
+
+    def notes(self) -> List[Tuple[int, float]]:
+        return list(zip(self.lanes, self.times))
+
+    def finish(self, save: bool) -> None:
+        """
+        Ends the take without blocking: with `save`, the writer finalizes the
+        journal into the chart file and removes it; otherwise it is discarded.
+        """
+        self._end("save" if save else "discard")
+
+    def close(self) -> None:
+        """Flushes and stops, keeping the journal for recovery (app quit)."""
+        self._end("keep")
+        self._thread.join()
+
+    def _end(self, how: str) -> None:
+        with self._cond:
+            if self._ending is None:
+                self._ending = how
+            self._cond.notify()
+
+    # --- Writer thread ---
+
+    def _run(self) -> None:
+        try:
+            while True:
+                with self._cond:
+                    if self._ending is None:
+                        self._cond.wait(config.JOURNAL_FLUSH_INTERVAL)
+                    ending = self._ending
+                if ending is not None:
+                    break
+                if self.error is not None:
+                    continue
+                try:
+                    # Outside the lock: finish() never waits on an fsync
+                    self._flush()
+                except OSError as e:
+                    # Disk full or failing: the take carries on in memory
+                    self.error = str(e)
+            self._end_take(ending)
+        finally:
+            # Whatever happened, nobody waiting on the take hangs
+            self.done.set()
+
+    def _end_take(self, ending: str) -> None:
+        try:
+            if ending != "discard" and self.error is None:
+                self._flush()
+            self._file.close()
+            if ending == "save":
+                save_chart_to_path(self.chart_path, self.notes())
+                # Saved from memory: a failed flush along the way is moot
+                self.error = None
+            if ending != "keep":
+                self.path.unlink(missing_ok=True)
+        except OSError as e:
+            # The journal stays behind and is recovered on the next launch
+            self.error = str(e)
+
+    def _flush(self) -> None:
+        n = len(self.times)
+        if n <= self._written:
+            return
+        records = np.empty(n - self._written, dtype=_RECORD)
+        records["time"] = self.times[self._written : n]
+        records["lane"] = self.lanes[self._written : n]
+        self._file.write(records.tobytes())
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._written = n
+
+
+def read_journal(path: Path) -> Optional[List[Tuple[int, float]]]:
+    """The presses in a journal, or None if it is not one."""
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, _ = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != JOURNAL_VERSION:
+        return None
+    count = (len(data) - _HEADER.size) // _RECORD.itemsize
+    records = np.frombuffer(data, dtype=_RECORD, count=count, offset=_HEADER.size)
+    return list(zip(records["lane"].tolist(), records["time"].tolist()))
+
+
+def recover_journals(
+    assets_dir: Path = config.ASSETS_DIR,
+) -> Tuple[List[Path], List[str]]:
+    """
+    Turns takes interrupted by a crash or a quit into charts.
+    Returns the charts written and what went wrong with the rest (their
+    journals stay for the next try); empty journals are just removed.
+    """
+    recovered: List[Path] = []
+    errors: List[str] = []
+    if not assets_dir.exists():
+        return recovered, errors
+    for path in sorted(assets_dir.glob(f"*{JOURNAL_SUFFIX}")):
+        notes = read_journal(path)
+        if notes is None:
+            continue
+        try:
+            if notes:
+                chart = path.with_suffix(".txt")
+                if chart.exists():
+                    # The slot was taken since: <song>_chart_XX.rec -> <song>
+                    song = Path(path.stem.rsplit("_chart", 1)[0])
+                    chart = next_new_chart_path(song)
+                save_chart_to_path(chart, notes)
+                recovered.append(chart)
+            path.unlink()
+        except OSError as e:
+            errors.append(f"Could not recover {path.name}: {e}")
+    return recovered, errors
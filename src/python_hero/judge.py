@@ -0,0 +1,173 @@
+# src/python_hero/judge.py
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Set, Tuple
+
+import numpy as np
+from . import config
+from .gameplay import NoteTrack
+
+# Ordered from tightest to loosest: (grade, seconds either side of the note)
+Windows = List[Tuple[str, float]]
+
+# Expired notes are trimmed off a lane queue once this many have piled up
+_TRIM_AFTER = 256
+
+
+def windows_from_config() -> Windows:
+    return [
+        ("perfect", config.PERFECT_WINDOW_MS / 1000.0),
+        ("great", config.GREAT_WINDOW_MS / 1000.0),
+        ("good", config.GOOD_WINDOW_MS / 1000.0),
+        ("miss", config.MISS_WINDOW_MS / 1000.0),
+    ]
+
+
+@dataclass
+class Judgement:
+    grade: str  # "perfect" | "great" | "good" | "miss"
+    lane: int
+    note_index: int
+    target_time: float
+    # Song time at which the judgement was made
+    judged_at: float
+    # Press time minus target time in seconds (negative = early).
+    # None when the note expired without being played.
+    offset: Optional[float] = None
+
+    @property
+    def is_hit(self) -> bool:
+        return self.grade != "miss"
+
+
+class Judge:
+    """
+    Judges lane presses purely in the time domain.
+    Each lane keeps a sorted queue of its note times, so a press costs one
+    binary search plus a look at the few notes inside the widest window.
+    Queues are filled as the track loads notes and trimmed as they expire,
+    so a streamed chart is never held in full.
+    """
+
+    def __init__(self, track: NoteTrack, windows: Optional[Windows] = None):
+        self.track = track
+        self.windows = windows or windows_from_config()
+        self.listeners: List[Callable[[Judgement], None]] = []
+        # Every note before this chart index is past its miss window
+        self.expire_index = track.base
+        # Pressed notes the expiry sweep has not passed yet
+        self.judged: Set[int] = set()
+
+        # Per-lane queues: chart note indices and their times, in time order.
+        # Plain lists: bisect on them is far cheaper than numpy calls per press.
+        lane_count = len(config.LANE_COLORS)
+        self._lane_index: List[List[int]] = [[] for _ in range(lane_count)]
+        self._lane_times: List[List[float]] = [[] for _ in range(lane_count)]
+        # Chart index of the next note to queue
+        self._queued = track.base
+
+    def _sync(self, until: float) -> None:
+        """Queues every note the track has loaded, reading up to `until` first."""
+        track = self.track
+        track.load_until(until)
+        end = track.base + track.times.size
+        if self._queued >= end:
+            return
+        start = max(self._queued, track.base)
+        lanes = track.lanes[start - track.base :]
+        times = track.times[start - track.base :]
+        for lane in range(len(self._lane_times)):
+            sel = np.flatnonzero(lanes == lane)
+            self._lane_index[lane] += (sel + start).tolist()
+            self._lane_times[lane] += times[sel].tolist()
+        self._queued = end
+
+    def grade_for(self, offset: float) -> str:
+        for grade, window in self.windows:
+            if abs(offset) <= window:
+                return grade
+        return "miss"
+
+    def press(self, lane: int, t: float) -> Optional[Judgement]:
+        """Judges a press at song time `t`; the closest pending note wins."""
+        if not 0 <= lane < len(self._lane_times):
+            return None
+
+        reach = self.windows[-1][1]
+        self._sync(t + reach)
+        times = self._lane_times[lane]
+        index = self._lane_index[lane]
+        lo = bisect_left(times, t - reach)
+        hi = bisect_right(times, t + reach)
+
+        best_k, best_off = -1, 0.0
+        for k in range(lo, hi):
+            i = index[k]
+            if i < self.expire_index or i in self.judged:
+                continue
+            off = t - times[k]
+            if best_k < 0 or abs(off) < abs(best_off):
+                best_k, best_off = k, off
+
+        # Nothing close enough: a stray press is not judged
+        if best_k < 0:
+            return None
+
+        i = index[best_k]
+        j = Judgement(
+            grade=self.grade_for(best_off),
+            lane=lane,
+            note_index=i,
+            target_time=times[best_k],
+            judged_at=t,
+            offset=best_off,
+        )
+        self.judged.add(i)
+        if j.is_hit and i >= self.track.base:
+            # Hit notes leave the highway right away
+            self.track.hit[i - self.track.base] = True
+        self._emit(j)
+        return j
+
+    def expire(self, now: float) -> int:
+        """
+        Emits a miss for every unplayed note whose window closed before `now`.
+        The index only moves forward, so each note is visited once overall.
+        Returns the number of new misses.
+        """
+        deadline = now - self.windows[-1][1]
+        self._sync(deadline)
+        track = self.track
+        times, lanes, base = track.times, track.lanes, track.base
+        missed = 0
+
+        # Notes the track already dropped cannot be judged any more
+        i = max(self.expire_index, base)
+        while i - base < times.size and times[i - base] < deadline:
+            if i in self.judged:
+                self.judged.discard(i)
+            else:
+                missed += 1
+                self._emit(
+                    Judgement(
+                        grade="miss",
+                        lane=int(lanes[i - base]),
+                        note_index=i,
+                        target_time=float(times[i - base]),
+                        judged_at=now,
+                    )
+                )
+            i += 1
+        self.expire_index = i
+
+        # Forget expired notes in bulk, keeping the lane queues short
+        for index, lane_times in zip(self._lane_index, self._lane_times):
+            k = bisect_left(index, i)
+            if k > _TRIM_AFTER:
+                del index[:k], lane_times[:k]
+        return missed
+
+    def _emit(self, j: Judgement) -> None:
+        for listener in self.listeners:
+            listener(j)
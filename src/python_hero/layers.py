@@ -0,0 +1,84 @@
+# src/python_hero/layers.py
+from __future__ import annotations
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import pygame
+from . import config
+
+
+def _geometry_key() -> Tuple:
+    """Everything a static layer depends on. Any change triggers a rebuild."""
+    display = pygame.display.get_surface()
+    size = display.get_size() if display else (config.WIDTH, config.HEIGHT)
+    return (
+        size,
+        config.WIDTH,
+        config.HEIGHT,
+        config.START_Y,
+        config.END_Y,
+        tuple(config.LANE_START_X),
+        tuple(config.LANE_END_X),
+        config.SCALE,
+        config.X_SQUEEZE,
+        config.CENTER_X,
+        config.CENTER_Y,
+        config.BACKGROUND_COLOR,
+        config.LANE_COLOR,
+        config.HITLINE_COLOR,
+        tuple(config.LANE_COLORS),
+        config.NOTE_RADIUS,
+        config.NOTE_SCALE_STEPS,
+    )
+
+
+def _to_display_format(surf: pygame.Surface, alpha: bool) -> pygame.Surface:
+    """Matches the display pixel format so blits skip per-pixel conversion."""
+    if pygame.display.get_surface() is None:
+        return surf
+    return surf.convert_alpha() if alpha else surf.convert()
+
+
+def _build_overlay(alpha: int) -> pygame.Surface:
+    overlay = pygame.Surface((config.WIDTH, config.HEIGHT), pygame.SRCALPHA)
+    overlay.fill((0, 0, 0, alpha))
+    return overlay
+
+
+class LayerCache:
+    """
+    Pre-rendered, display-format surfaces that never change between frames.
+    Layers are built lazily and dropped as a whole when the geometry changes.
+    """
+
+    def __init__(self) -> None:
+        self._key: Optional[Tuple] = None
+        self._layers: Dict[Hashable, pygame.Surface] = {}
+
+    def get(
+        self,
+        name: Hashable,
+        builder: Callable[[], pygame.Surface],
+        alpha: bool = False,
+    ) -> pygame.Surface:
+        key = _geometry_key()
+        if key != self._key:
+            self._layers.clear()
+            self._key = key
+
+        surf = self._layers.get(name)
+        if surf is None:
+            surf = _to_display_format(builder(), alpha)
+            self._layers[name] = surf
+        return surf
+
+    def overlay(self, alpha: int) -> pygame.Surface:
+        """Full-screen black dim layer with the given alpha."""
+        return self.get(("overlay", alpha), lambda: _build_overlay(alpha), True)
+
+    def clear(self) -> None:
+        self._layers.clear()
+        self._key = None
+
+
+# Shared by render.py and screens.py
+LAYERS = LayerCache()
@@ -0,0 +1,282 @@
+# src/python_hero/library.py
+from __future__ import annotations
+import json
+import multiprocessing
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import config
+from .data_manager import atomic_write_json
+
+LIBRARY_VERSION = 1
+
+# --- MP3 Metadata (pure Python, no decoding) ---
+
+# ID3v2 text frames worth keeping, by tag name
+_ID3_FRAMES = {
+    "TIT2": "title",
+    "TPE1": "artist",
+    "TALB": "album",
+    "TCON": "genre",
+    "TBPM": "bpm",
+}
+_TEXT_ENCODINGS = {0: "latin-1", 1: "utf-16", 2: "utf-16-be", 3: "utf-8"}
+_MAX_TAG_READ = 256 * 1024
+_AUDIO_PROBE = 16 * 1024
+
+# Layer III bitrates (kbps) by bitrate index
+_BITRATES_V1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_BITRATES_V2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+# Sample rates by MPEG version bits (0 = 2.5, 2 = 2, 3 = 1)
+_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    0: (11025, 12000, 8000),
+}
+
+
+def _syncsafe(raw: bytes) -> int:
+    return (raw[0] << 21) | (raw[1] << 14) | (raw[2] << 7) | raw[3]
+
+
+def _read_id3(data: bytes) -> Tuple[int, Dict[str, str]]:
+    """Returns (tag size in bytes, tags) for a leading, maybe truncated, ID3v2 tag."""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0, {}
+
+    major = data[3]
+    size = 10 + _syncsafe(data[6:10])
+    tags: Dict[str, str] = {}
+    pos = 10
+    while pos + 10 <= min(size, len(data)):
+        frame_id = data[pos : pos + 4].decode("latin-1")
+        raw_size = data[pos + 4 : pos + 8]
+        frame_size = (
+            _syncsafe(raw_size) if major >= 4 else int.from_bytes(raw_size, "big")
+        )
+        if not frame_id.strip("\x00") or frame_size <= 0:
+            break
+
+        body = data[pos + 10 : pos + 10 + frame_size]
+        if frame_id in _ID3_FRAMES and body:
+            encoding = _TEXT_ENCODINGS.get(body[0], "latin-1")
+            text = body[1:].decode(encoding, errors="ignore").strip("\x00 ")
+            if text:
+                tags[_ID3_FRAMES[frame_id]] = text
+        pos += 10 + frame_size
+    return size, tags
+
+
+def _mp3_duration(data: bytes, audio_size: int) -> float:
+    """Duration from the first MPEG frame: Xing/Info frame count or CBR size."""
+    pos = data.find(b"\xff")
+    while 0 <= pos < len(data) - 4:
+        header = struct.unpack(">I", data[pos : pos + 4])[0]
+        version = (header >> 19) & 0x3
+        layer = (header >> 17) & 0x3
+        bitrate_idx = (header >> 12) & 0xF
+        rate_idx = (header >> 10) & 0x3
+        # Frame sync, Layer III, valid bitrate and sample rate
+        if (
+            header >> 21 == 0x7FF
+            and version != 1
+            and layer == 1
+            and 0 < bitrate_idx < 15
+            and rate_idx < 3
+        ):
+            break
+        pos = data.find(b"\xff", pos + 1)
+    else:
+        return 0.0
+
+    mpeg1 = version == 3
+    mono = (header >> 6) & 0x3 == 3
+    sample_rate = _SAMPLE_RATES[version][rate_idx]
+    samples_per_frame = 1152 if mpeg1 else 576
+
+    # VBR files carry a Xing/Info header with the exact frame count
+    side_info = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+    xing = pos + 4 + side_info
+    if data[xing : xing + 4] in (b"Xing", b"Info"):
+        flags = struct.unpack(">I", data[xing + 4 : xing + 8])[0]
+        if flags & 0x1:
+            frames = struct.unpack(">I", data[xing + 8 : xing + 12])[0]
+            return frames * samples_per_frame / sample_rate
+
+    bitrate = (_BITRATES_V1 if mpeg1 else _BITRATES_V2)[bitrate_idx] * 1000
+    return (audio_size - pos) * 8 / bitrate
+
+
+def read_metadata(path: str) -> Tuple[float, Dict[str, str]]:
+    """(duration in seconds, ID3 tags). Runs in worker processes."""
+    try:
+        file_size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            head = f.read(10)
+            tag_size = 10 + _syncsafe(head[6:10]) if head[:3] == b"ID3" else 0
+
+            # Text frames sit near the start; skip most of any embedded art
+            f.seek(0)
+            tag_data = f.read(min(tag_size, _MAX_TAG_READ))
+            f.seek(tag_size)
+            audio = f.read(_AUDIO_PROBE)
+    except OSError:
+        return 0.0, {}
+
+    _, tags = _read_id3(tag_data)
+    return round(_mp3_duration(audio, file_size - tag_size), 2), tags
+
+
+# --- Catalog ---
+
+
+@dataclass
+class SongEntry:
+    path: str
+    size: int
+    mtime_ns: int
+    duration: float = 0.0
+    tags: Dict[str, str] = field(default_factory=dict)
+    charts: List[str] = field(default_factory=list)
+
+
+class SongLibrary:
+    """
+    Persistent catalog of the assets folder, saved as save_data/cache/library.json.
+    A rescan lists the folder once and only extracts metadata for songs whose
+    size or mtime changed, in a process pool when there are many of them.
+    Saves go through `save` (the save data's write-behind writer in the game);
+    without one they are written right away.
+    """
+
+    def __init__(
+        self,
+        catalog_path: Path,
+        assets_dir: Path = config.ASSETS_DIR,
+        save: Optional[Callable[[Path, Any], None]] = None,
+    ):
+        self.catalog_path = catalog_path
+        self.assets_dir = assets_dir
+        self.save = save or atomic_write_json
+        self.entries: Dict[str, SongEntry] = self._load()
+
+    def _load(self) -> Dict[str, SongEntry]:
+        try:
+            with open(self.catalog_path, "r") as f:
+                data = json.load(f)
+            if data.get("version") != LIBRARY_VERSION:
+                return {}
+            return {name: SongEntry(**e) for name, e in data["songs"].items()}
+        except (json.JSONDecodeError, IOError, KeyError, TypeError, AttributeError):
+            return {}
+
+    def _save(self) -> None:
+        data = {
+            "version": LIBRARY_VERSION,
+            "songs": {name: asdict(e) for name, e in self.entries.items()},
+        }
+        try:
+            self.save(self.catalog_path, data)
+        except OSError:
+            pass
+
+    def scan(self) -> List[Path]:
+        """Brings the catalog up to date and returns the sorted song paths."""
+        self.assets_dir.mkdir(parents=True, exist_ok=True)
+        songs: Dict[str, os.stat_result] = {}
+        chart_names: List[str] = []
+        with os.scandir(self.assets_dir) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+                name = entry.name
+                if name.lower().endswith(".mp3"):
+                    songs[name] = entry.stat()
+                elif name.endswith(".txt") and "_chart" in name:
+                    chart_names.append(name)
+
+        # 1. Forget songs that left the folder
+        dirty = False
+        for name in set(self.entries) - set(songs):
+            del self.entries[name]
+            dirty = True
+
+        # 2. Rescan only new or modified files
+        stale = [
+            name
+            for name, st in songs.items()
+            if name not in self.entries
+            or self.entries[name].size != st.st_size
+            or self.entries[name].mtime_ns != st.st_mtime_ns
+        ]
+        for name, (duration, tags) in zip(stale, self._extract(stale)):
+            st = songs[name]
+            self.entries[name] = SongEntry(
+                path=str(self.assets_dir / name),
+                size=st.st_size,
+                mtime_ns=st.st_mtime_ns,
+                duration=duration,
+                tags=tags,
+            )
+            dirty = True
+
+        # 3. Chart lists come from the same listing
+        grouped = self._group_charts(chart_names)
+        for name, entry in self.entries.items():
+            charts = grouped.get(Path(name).stem, [])
+            if charts != entry.charts:
+                entry.charts = charts
+                dirty = True
+
+        if dirty:
+            self._save()
+        return sorted(
+            (self.assets_dir / name for name in self.entries),
+            key=lambda p: p.name.lower(),
+        )
+
+    def _extract(self, names: List[str]) -> List[Tuple[float, Dict[str, str]]]:
+        paths = [str(self.assets_dir / name) for name in names]
+        if len(paths) < config.LIBRARY_POOL_THRESHOLD:
+            return [read_metadata(p) for p in paths]
+        # Spawned workers: forking a process that runs the audio and writer
+        # threads can copy a lock mid-use into the child
+        spawn = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(mp_context=spawn) as pool:
+            return list(pool.map(read_metadata, paths, chunksize=16))
+
+    def _group_charts(self, chart_names: List[str]) -> Dict[str, List[str]]:
+        """Maps song stem -> chart names, using the <stem>_chart*.txt convention."""
+        stems = {Path(name).stem for name in self.entries}
+        grouped: Dict[str, List[str]] = {}
+        for chart in chart_names:
+            idx = chart.find("_chart")
+            while idx > 0:
+                if chart[:idx] in stems:
+                    grouped.setdefault(chart[:idx], []).append(chart)
+                idx = chart.find("_chart", idx + 1)
+        # Sort naturally (01, 02, 03...)
+        for charts in grouped.values():
+            charts.sort(key=str.lower)
+        return grouped
+
+    def entry(self, song_path: Path) -> Optional[SongEntry]:
+        return self.entries.get(song_path.name)
+
+    def charts_for(self, song_path: Path) -> List[Path]:
+        entry = self.entry(song_path)
+        if entry is None:
+            return []
+        return [self.assets_dir / name for name in entry.charts]
+
+    def refresh_charts(self, song_path: Path, charts: List[Path]) -> None:
+        """Records a chart list the caller just globbed (after save/delete)."""
+        entry = self.entry(song_path)
+        names = [p.name for p in charts]
+        if entry is not None and entry.charts != names:
+            entry.charts = names
+            self._save()
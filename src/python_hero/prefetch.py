@@ -0,0 +1,153 @@
+# src/python_hero/prefetch.py
+from __future__ import annotations
+import io
+import os
+import threading
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Deque, List, Optional, Sequence, Tuple
+
+from . import config
+from .charts import ensure_compiled
+from .replay import Replay, load_replay
+
+# ("audio" | "chart" | "replay", path)
+AssetKey = Tuple[str, Path]
+
+_READ_CHUNK = 1 << 20
+# Rough size of one decoded press: a tuple of an int and a float
+_PRESS_BYTES = 80
+
+
+class Prefetcher:
+    """
+    Loads what the menus have highlighted on a worker thread, so ENTER finds
+    the song bytes already in memory, the chart already compiled (charts are
+    streamed during play, so only their compiled twin is prepared) and the
+    ghost's replay already decoded.
+
+    Ready assets live in an LRU bounded by size. Every `want()` replaces the
+    pending work: queued jobs that are no longer wanted are dropped and a read
+    in progress stops at its next chunk.
+    """
+
+    def __init__(self, capacity_bytes: int = config.PREFETCH_CACHE_MB << 20):
+        self.capacity = capacity_bytes
+        # key -> (source mtime_ns, payload, size in bytes)
+        self.ready: OrderedDict[AssetKey, Tuple[int, object, int]] = OrderedDict()
+        self.used = 0
+        self.jobs: Deque[AssetKey] = deque()
+        self.wanted: Tuple[AssetKey, ...] = ()
+        self.closed = False
+        self.cond = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name="prefetch", daemon=True)
+        self.thread.start()
+
+    # --- Main thread ---
+
+    def want(
+        self, song: Optional[Path], charts: List[Path], replays: Sequence[Path] = ()
+    ) -> None:
+        """Replaces the pending work with this song, charts and replays."""
+        keys: List[AssetKey] = []
+        if song:
+            keys.append(("audio", song))
+        keys += [("chart", c) for c in charts if c]
+        keys += [("replay", r) for r in replays if r]
+        with self.cond:
+            self.wanted = tuple(keys)
+            self.jobs = deque(k for k in keys if k not in self.ready)
+            self.cond.notify()
+
+    def audio(self, song: Path) -> Optional[io.BytesIO]:
+        """A fresh file object over the cached song bytes, or None."""
+        data = self._take(("audio", song))
+        return io.BytesIO(data) if data is not None else None
+
+    def replay(self, path: Path) -> Optional[Replay]:
+        """The decoded replay at `path`, or None. Shared: do not modify it."""
+        return self._take(("replay", path))
+
+    def close(self) -> None:
+        with self.cond:
+            self.closed = True
+            self.jobs.clear()
+            self.cond.notify()
+
+    def _take(self, key: AssetKey):
+        mtime = _mtime_ns(key[1])
+        with self.cond:
+            hit = self.ready.get(key)
+            if hit is None:
+                return None
+            if hit[0] != mtime:
+                # Changed on disk since it was loaded
+                self._evict(key)
+                return None
+            self.ready.move_to_end(key)
+            return hit[1]
+
+    # --- Worker thread ---
+
+    def _run(self) -> None:
+        while True:
+            with self.cond:
+                while not self.jobs and not self.closed:
+                    self.cond.wait()
+                if self.closed:
+                    return
+                key = self.jobs.popleft()
+
+            mtime = _mtime_ns(key[1])
+            payload = self._load(key)
+            if payload is None:
+                continue
+            data, size = payload
+            with self.cond:
+                if key in self.wanted and size <= self.capacity:
+                    self._store(key, (mtime, data, size))
+
+    def _load(self, key: AssetKey):
+        kind, path = key
+        try:
+            if kind == "chart":
+                ensure_compiled(path)
+                return None
+            if kind == "replay":
+                replay = load_replay(path)
+                if replay is None:
+                    return None
+                return replay, len(replay.presses) * _PRESS_BYTES
+
+            chunks = []
+            with open(path, "rb") as f:
+                while True:
+                    if key not in self.wanted:
+                        return None  # Highlight moved on: stale
+                    chunk = f.read(_READ_CHUNK)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+            data = b"".join(chunks)
+            return data, len(data)
+        except OSError:
+            return None
+
+    def _store(self, key: AssetKey, entry: Tuple[int, object, int]) -> None:
+        self._evict(key)
+        self.ready[key] = entry
+        self.used += entry[2]
+        while self.used > self.capacity:
+            self._evict(next(iter(self.ready)))
+
+    def _evict(self, key: AssetKey) -> None:
+        entry = self.ready.pop(key, None)
+        if entry is not None:
+            self.used -= entry[2]
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
@@ -0,0 +1,128 @@
+# src/python_hero/profiler.py
+from __future__ import annotations
+import csv
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+from . import config
+
+MAX_PHASES = 48
+
+
+class FrameProfiler:
+    """
+    Per-phase frame timer with a fixed-size ring buffer.
+
+    Phases partition the frame: `lap(name)` charges the time since the
+    previous lap to `name`, and `end_frame()` closes the row. Callers guard
+    every lap with `if PROFILER.enabled:` so a disabled profiler costs one
+    attribute check per call site.
+    """
+
+    def __init__(self, capacity: int = config.PROFILER_FRAMES):
+        self.enabled = False
+        self.samples = np.zeros((capacity, MAX_PHASES), dtype=np.float64)
+        self.count = 0
+        self.phases: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.current = [0.0] * MAX_PHASES
+        self.last = time.perf_counter()
+
+    def toggle(self) -> bool:
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.reset()
+        return self.enabled
+
+    def reset(self) -> None:
+        self.samples.fill(0.0)
+        self.count = 0
+        self.current = [0.0] * MAX_PHASES
+        self.last = time.perf_counter()
+
+    def lap(self, phase: str) -> None:
+        now = time.perf_counter()
+        i = self.index.get(phase)
+        if i is None:
+            i = self._register(phase)
+        self.current[i] += now - self.last
+        self.last = now
+
+    def end_frame(self, phase: str) -> None:
+        """Laps `phase` (usually the frame wait) and stores the finished frame."""
+        self.lap(phase)
+        self.samples[self.count % self.samples.shape[0]] = self.current
+        self.count += 1
+        self.current = [0.0] * MAX_PHASES
+
+    def _register(self, phase: str) -> int:
+        if len(self.phases) >= MAX_PHASES:
+            # Out of columns: fold newcomers into the last one
+            return MAX_PHASES - 1
+        self.index[phase] = len(self.phases)
+        self.phases.append(phase)
+        return self.index[phase]
+
+    # --- Reading ---
+
+    def window(self) -> np.ndarray:
+        """Recorded frames (oldest first) x phases, in seconds."""
+        cap = self.samples.shape[0]
+        rows = self.samples[:, : len(self.phases)]
+        if self.count <= cap:
+            return rows[: self.count]
+        start = self.count % cap
+        return np.concatenate((rows[start:], rows[:start]))
+
+    def totals(self, exclude: Tuple[str, ...] = ()) -> np.ndarray:
+        """Per-frame totals, optionally leaving phases (e.g. 'wait') out."""
+        w = self.window()
+        keep = [i for i, p in enumerate(self.phases) if p not in exclude]
+        return w[:, keep].sum(axis=1)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-phase mean/p50/p95/p99/max in milliseconds, plus the frame."""
+        w = self.window() * 1000.0
+        if not w.size:
+            return {}
+        columns = [("frame", w.sum(axis=1))]
+        columns += [(p, w[:, i]) for i, p in enumerate(self.phases)]
+        out = {}
+        for name, col in columns:
+            p50, p95, p99 = np.percentile(col, (50, 95, 99))
+            out[name] = {
+                "mean": float(col.mean()),
+                "p50": float(p50),
+                "p95": float(p95),
+                "p99": float(p99),
+                "max": float(col.max()),
+            }
+        return out
+
+    # --- Export ---
+
+    def export(self, folder: Path) -> Path:
+        """Writes frames_<stamp>.csv (every frame) and .json (stats); returns the CSV."""
+        folder.mkdir(parents=True, exist_ok=True)
+        stem = time.strftime("frames_%Y%m%d_%H%M%S")
+        csv_path = folder / f"{stem}.csv"
+        w = self.window() * 1000.0
+
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "total_ms"] + [f"{p}_ms" for p in self.phases])
+            first = self.count - len(w)
+            for n, row in enumerate(w):
+                writer.writerow(
+                    [first + n, f"{row.sum():.4f}"] + [f"{v:.4f}" for v in row]
+                )
+
+        with open(folder / f"{stem}.json", "w") as f:
+            json.dump({"frames": len(w), "phases": self.stats()}, f, indent=4)
+        return csv_path
+
+
+PROFILER = FrameProfiler()
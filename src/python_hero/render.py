@@ -1,14 +1,31 @@
 # src/python_hero/render.py
 from __future__ import annotations
+import numpy as np
 import pygame
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import List, Optional, Tuple
 from . import config
-from .gameplay import Note
+from .gameplay import NoteTrack
+from .judge import Judgement
+from .replay import Ghost
+from .layers import LAYERS
+from .profiler import PROFILER
 from .screens import Fonts
 from .data_manager import Profile
 from .songs import display_name
 
+# Seconds a judgement stays on the HUD
+JUDGEMENT_SHOW_TIME = 0.5
+# Seconds a ghost press stays lit on its target
+GHOST_FLASH_TIME = 0.1
+GHOST_COLOR = (170, 170, 255)
+GRADE_COLORS = {
+    "perfect": (255, 215, 0),
+    "great": (0, 255, 70),
+    "good": (100, 200, 255),
+    "miss": (220, 80, 80),
+}
+
 
 def to_screen(x: float, y: float) -> tuple[int, int]:
     """Converts Game-space (+Y up) to screen-space (Pygame +Y down)."""
@@ -17,21 +34,17 @@ def to_screen(x: float, y: float) -> tuple[int, int]:
     return px, py
 
 
-def draw_game(
-    screen: pygame.Surface,
-    fonts: Fonts,
-    mode: str,
-    score: int,
-    recorded_count: int,
-    song_path: Optional[Path],
-    active_notes: Sequence[Note],
-    now: float,
-    message_text: Optional[str] = None,
-    profile: Optional[Profile] = None,
-    total_notes: int = 0,
-) -> None:
-    # Use config background color
-    screen.fill(config.BACKGROUND_COLOR)
+def to_screen_many(x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized to_screen() for a whole batch of game-space points."""
+    px = config.CENTER_X + (x * (config.SCALE * config.X_SQUEEZE)).astype(np.int32)
+    py = config.CENTER_Y - (y * config.SCALE).astype(np.int32)
+    return px, py
+
+
+def _build_highway() -> pygame.Surface:
+    """Background, lane paths, target circles and the hit line."""
+    layer = pygame.Surface((config.WIDTH, config.HEIGHT))
+    layer.fill(config.BACKGROUND_COLOR)
 
     # 1. Draw Fretboard (Lanes & Targets)
     for i in range(5):
@@ -39,29 +52,149 @@ def draw_game(
         ex, ey = to_screen(config.LANE_END_X[i], config.END_Y)
 
         # Draw the lane path
-        pygame.draw.line(screen, config.LANE_COLOR, (sx, sy), (ex, ey), 4)
+        pygame.draw.line(layer, config.LANE_COLOR, (sx, sy), (ex, ey), 4)
 
         # Target circles (Hit Zone)
-        pygame.draw.circle(screen, config.LANE_COLORS[i], (ex, ey), 24, 3)
-        pygame.draw.circle(screen, (20, 20, 25), (ex, ey), 20)  # Dark inner hole
+        pygame.draw.circle(layer, config.LANE_COLORS[i], (ex, ey), 24, 3)
+        pygame.draw.circle(layer, (20, 20, 25), (ex, ey), 20)  # Dark inner hole
 
     # 2. Global Hit Line Visual
     _, hitline_y = to_screen(0, config.END_Y)
     pygame.draw.line(
-        screen, config.HITLINE_COLOR, (0, hitline_y), (config.WIDTH, hitline_y), 2
+        layer, config.HITLINE_COLOR, (0, hitline_y), (config.WIDTH, hitline_y), 2
     )
+    return layer
+
+
+# --- Note sprites ---
+
+# Outline width around the note core, at full size
+_NOTE_BORDER = 3
+# Atlas built for the current geometry: (surface, source rect per
+# lane * NOTE_SCALE_STEPS + step, sprite half-size per step)
+_atlas: Optional[Tuple[pygame.Surface, List[pygame.Rect], np.ndarray]] = None
+
+
+def _far_scale() -> float:
+    """Note size at START_Y relative to the hit line: follows the lane spread."""
+    near = max(config.LANE_END_X) - min(config.LANE_END_X)
+    far = max(config.LANE_START_X) - min(config.LANE_START_X)
+    return far / near if near else 1.0
 
-    # 3. Draw Falling Notes
-    for n in active_notes:
-        xg, yg = n.position(now)
-        px, py = to_screen(xg, yg)
 
-        # Note White Glow/Border
-        pygame.draw.circle(screen, (255, 255, 255), (px, py), config.NOTE_RADIUS + 3)
-        # Note Core Color
-        pygame.draw.circle(
-            screen, config.LANE_COLORS[n.lane], (px, py), config.NOTE_RADIUS
+def _step_scales() -> np.ndarray:
+    """Sprite scale per step: step 0 at the horizon, the last at the hit line."""
+    return np.linspace(_far_scale(), 1.0, config.NOTE_SCALE_STEPS)
+
+
+def note_steps(y: np.ndarray) -> np.ndarray:
+    """Sprite step for notes at game-space heights `y`."""
+    depth = (config.START_Y - y) / (config.START_Y - config.END_Y)
+    steps = np.rint(depth * (config.NOTE_SCALE_STEPS - 1)).astype(np.intp)
+    # Notes just past the hit line keep the full size
+    return np.clip(steps, 0, config.NOTE_SCALE_STEPS - 1)
+
+
+def _build_note_atlas() -> pygame.Surface:
+    """
+    One row per lane color, one column per size, on a transparent sheet.
+    Stored premultiplied: BLEND_PREMULTIPLIED blits are the cheapest alpha blits.
+    """
+    cell = 2 * (config.NOTE_RADIUS + _NOTE_BORDER) + 2
+    atlas = pygame.Surface(
+        (cell * config.NOTE_SCALE_STEPS, cell * len(config.LANE_COLORS)),
+        pygame.SRCALPHA,
+    )
+    for lane, color in enumerate(config.LANE_COLORS):
+        for step, scale in enumerate(_step_scales().tolist()):
+            center = (step * cell + cell // 2, lane * cell + cell // 2)
+            core = max(1, round(config.NOTE_RADIUS * scale))
+            # Note White Glow/Border
+            pygame.draw.circle(atlas, (255, 255, 255), center, core + _NOTE_BORDER)
+            # Note Core Color
+            pygame.draw.circle(atlas, color, center, core)
+    return atlas.premul_alpha()
+
+
+def _note_atlas() -> Tuple[pygame.Surface, List[pygame.Rect], np.ndarray]:
+    global _atlas
+    surf = LAYERS.get("note_atlas", _build_note_atlas, alpha=True)
+    if _atlas is None or _atlas[0] is not surf:
+        cell = 2 * (config.NOTE_RADIUS + _NOTE_BORDER) + 2
+        halves = np.array(
+            [
+                max(1, round(config.NOTE_RADIUS * s)) + _NOTE_BORDER
+                for s in _step_scales().tolist()
+            ],
+            dtype=np.int32,
         )
+        areas = [
+            pygame.Rect(
+                step * cell + cell // 2 - half,
+                lane * cell + cell // 2 - half,
+                2 * half + 1,
+                2 * half + 1,
+            )
+            for lane in range(len(config.LANE_COLORS))
+            for step, half in enumerate(halves.tolist())
+        ]
+        _atlas = (surf, areas, halves)
+    return _atlas
+
+
+def draw_notes(screen: pygame.Surface, track: NoteTrack, now: float) -> None:
+    """Every visible note, scaled by depth, in a single blits() call."""
+    idx, xg, yg = track.positions(now)
+    if not idx.size:
+        return
+    atlas, areas, halves = _note_atlas()
+    # Farthest first, so nearer notes overlap the ones behind them
+    idx, xg, yg = idx[::-1], xg[::-1], yg[::-1]
+    xs, ys = to_screen_many(xg, yg)
+    steps = note_steps(yg)
+    cells = track.lanes[idx].astype(np.intp) * config.NOTE_SCALE_STEPS + steps
+    half = halves[steps]
+    screen.blits(
+        [
+            (atlas, (x, y), areas[c], pygame.BLEND_PREMULTIPLIED)
+            for c, x, y in zip(
+                cells.tolist(), (xs - half).tolist(), (ys - half).tolist()
+            )
+        ],
+        doreturn=False,
+    )
+
+
+def draw_game(
+    screen: pygame.Surface,
+    fonts: Fonts,
+    mode: str,
+    score: int,
+    recorded_count: int,
+    song_path: Optional[Path],
+    track: NoteTrack,
+    now: float,
+    message_text: Optional[str] = None,
+    profile: Optional[Profile] = None,
+    total_notes: int = 0,
+    judgement: Optional[Judgement] = None,
+    ghost: Optional[Ghost] = None,
+) -> None:
+    # 1-2. Fretboard, targets and hit line come pre-rendered in one layer
+    screen.blit(LAYERS.get("highway", _build_highway), (0, 0))
+    if PROFILER.enabled:
+        PROFILER.lap("game.highway")
+
+    # Personal-best ghost: a faint ring on the targets it just pressed
+    if ghost and mode == "play":
+        for lane in ghost.lanes_pressed(now, GHOST_FLASH_TIME).tolist():
+            ex, ey = to_screen(config.LANE_END_X[lane], config.END_Y)
+            pygame.draw.circle(screen, GHOST_COLOR, (ex, ey), 30, 2)
+
+    # 3. Draw Falling Notes (pre-rendered sprites, one batched blit)
+    draw_notes(screen, track, now)
+    if PROFILER.enabled:
+        PROFILER.lap("game.notes")
 
     # 4. HUD (Heads-Up Display)
     hud_x = 40
@@ -70,46 +203,67 @@ def draw_game(
 
     # Mode Indicator
     mode_txt = f"MODE: {mode.upper()}"
-    screen.blit(fonts.ui_font.render(mode_txt, True, accent), (hud_x, curr_y))
+    screen.blit(fonts.render(fonts.ui_font, mode_txt, accent), (hud_x, curr_y))
     curr_y += 45
 
     # Score / Recording Count
     if mode == "play":
         score_txt = f"SCORE: {score:04d} / {total_notes:04d}"
         screen.blit(
-            fonts.ui_font.render(score_txt, True, (255, 255, 255)), (hud_x, curr_y)
+            fonts.render(fonts.ui_font, score_txt, (255, 255, 255)), (hud_x, curr_y)
         )
     else:
         rec_txt = f"RECORDED: {recorded_count:03d}"
-        screen.blit(fonts.ui_font.render(rec_txt, True, (255, 80, 80)), (hud_x, curr_y))
+        screen.blit(
+            fonts.render(fonts.ui_font, rec_txt, (255, 80, 80)), (hud_x, curr_y)
+        )
     curr_y += 45
 
+    # Running score of the personal-best ghost and how far ahead we are
+    if ghost and mode == "play":
+        ghost_score = ghost.score_at(now)
+        ghost_txt = f"PB GHOST: {ghost_score:04d} ({score - ghost_score:+d})"
+        screen.blit(
+            fonts.render(fonts.hint_font, ghost_txt, GHOST_COLOR), (hud_x, curr_y)
+        )
+        curr_y += 35
+
     # Dynamic Key Hints
     if profile:
         key_names = [pygame.key.name(k).upper() for k in profile.keys]
         keys_str = "  ".join(key_names)
         screen.blit(
-            fonts.hint_font.render(f"KEYS: {keys_str}", True, (160, 160, 170)),
+            fonts.render(fonts.hint_font, f"KEYS: {keys_str}", (160, 160, 170)),
             (hud_x, curr_y),
         )
 
+    # Latest judgement, shown briefly above the hit line
+    if judgement:
+        age = now - judgement.judged_at
+        if 0 <= age < JUDGEMENT_SHOW_TIME:
+            color = GRADE_COLORS.get(judgement.grade, (255, 255, 255))
+            grade_surf = fonts.render(fonts.title_font, judgement.grade.upper(), color)
+            _, hitline_y = to_screen(0, config.END_Y)
+            rect = grade_surf.get_rect(center=(config.WIDTH // 2, hitline_y - 90))
+            screen.blit(grade_surf, rect)
+
     # 5. Track Info (Top Right)
     if song_path:
         track_name = display_name(song_path).upper()
-        track_surf = fonts.hint_font.render(
-            f"TRACK: {track_name}", True, (200, 200, 200)
+        track_surf = fonts.render(
+            fonts.hint_font, f"TRACK: {track_name}", (200, 200, 200)
         )
         screen.blit(track_surf, (config.WIDTH - track_surf.get_width() - 40, 40))
+    if PROFILER.enabled:
+        PROFILER.lap("game.hud")
 
     # 6. Message Overlays (Pauses/Notices)
     if message_text:
-        # Create Dimmed Background
-        overlay = pygame.Surface((config.WIDTH, config.HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        screen.blit(overlay, (0, 0))
+        # Dimmed Background
+        screen.blit(LAYERS.overlay(180), (0, 0))
 
         # Render Message Box
-        msg_surf = fonts.title_font.render(message_text, True, (255, 255, 255))
+        msg_surf = fonts.render(fonts.title_font, message_text, (255, 255, 255))
         rect = msg_surf.get_rect(center=(config.WIDTH // 2, config.HEIGHT // 2))
 
         # Subtle glowing border for the message
@@ -0,0 +1,262 @@
+# src/python_hero/replay.py
+from __future__ import annotations
+import os
+import struct
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+from . import config
+from .charts import ChartReader, replays_dir
+from .gameplay import NoteTrack
+from .judge import Judge, Judgement, Windows
+
+# Replay layout (little endian):
+#   header | profile name (utf-8) | varint presses
+# Each press is one varint: zigzag(delta ticks) << 3 | lane
+REPLAY_SUFFIX = ".phr"
+REPLAY_VERSION = 1
+_MAGIC = b"PHRP"
+# magic, version, lane count, chart hash, played_at, hits, total, press count,
+# name length
+_HEADER = struct.Struct("<4sBB16sdIIIH")
+
+# Press times are stored in whole ticks of 100 microseconds
+TICKS_PER_SECOND = 10_000
+_LANE_BITS = 3
+
+
+def quantize(t: float) -> float:
+    """
+    Rounds a song time to the replay resolution.
+    Live play judges quantized times too, so playback sees the exact same
+    floats and reaches the exact same judgements.
+    """
+    return round(t * TICKS_PER_SECOND) / TICKS_PER_SECOND
+
+
+@dataclass
+class Replay:
+    chart_hash: bytes
+    profile: str
+    hits: int
+    total: int
+    # (lane, song time) in press order
+    presses: List[Tuple[int, float]] = field(default_factory=list)
+    played_at: float = field(default_factory=time.time)
+
+    def encode(self) -> bytes:
+        name = self.profile.encode("utf-8")[:255]
+        out = bytearray(
+            _HEADER.pack(
+                _MAGIC,
+                REPLAY_VERSION,
+                len(config.LANE_COLORS),
+                self.chart_hash,
+                self.played_at,
+                self.hits,
+                self.total,
+                len(self.presses),
+                len(name),
+            )
+        )
+        out += name
+
+        prev = 0
+        for lane, t in self.presses:
+            ticks = round(t * TICKS_PER_SECOND)
+            delta, prev = ticks - prev, ticks
+            # Zigzag keeps the rare backwards step (clock slew) to a small varint
+            value = ((delta << 1) ^ (delta >> 63)) << _LANE_BITS | lane
+            while value >= 0x80:
+                out.append((value & 0x7F) | 0x80)
+                value >>= 7
+            out.append(value)
+        return bytes(out)
+
+    @staticmethod
+    def decode(data: bytes) -> Replay:
+        magic, version, _, chash, played_at, hits, total, count, name_len = (
+            _HEADER.unpack_from(data)
+        )
+        if magic != _MAGIC or version != REPLAY_VERSION:
+            raise ValueError("not a replay file")
+        pos = _HEADER.size
+        profile = data[pos : pos + name_len].decode("utf-8", errors="replace")
+        pos += name_len
+
+        presses: List[Tuple[int, float]] = []
+        ticks = 0
+        for _ in range(count):
+            value = shift = 0
+            while True:
+                byte = data[pos]
+                pos += 1
+                value |= (byte & 0x7F) << shift
+                shift += 7
+                if byte < 0x80:
+                    break
+            lane = value & ((1 << _LANE_BITS) - 1)
+            zz = value >> _LANE_BITS
+            ticks += (zz >> 1) ^ -(zz & 1)
+            presses.append((lane, ticks / TICKS_PER_SECOND))
+        return Replay(chash, profile, hits, total, presses, played_at)
+
+
+# --- Playback ---
+
+
+def play_back(
+    replay: Replay, track: NoteTrack, windows: Optional[Windows] = None
+) -> List[Judgement]:
+    """
+    Feeds the recorded presses through a fresh Judge, in order, then lets
+    every remaining note expire. Same inputs, same judgements.
+    The caller's track is left alone: judging runs on a fresh hit mask.
+    """
+    judge = Judge(NoteTrack(track.lanes, track.times), windows)
+    judgements: List[Judgement] = []
+    judge.listeners.append(judgements.append)
+    for lane, t in replay.presses:
+        judge.press(lane, t)
+    judge.expire(float("inf"))
+    return judgements
+
+
+class Ghost:
+    """
+    A replayed run shown next to live play: its running score and presses.
+    Judged as the song plays, on its own streamed track, so only the next few
+    seconds of the chart are ever in memory.
+    """
+
+    def __init__(self, replay: Replay, track: NoteTrack):
+        self.replay = replay
+        self.track = track
+        self.judge = Judge(track)
+        self.judge.listeners.append(self._on_judgement)
+        self.hits = 0
+        # Presses before this one have been judged, up to song time `judged_to`
+        self.next_press = 0
+        self.judged_to = float("-inf")
+        self.press_lanes = np.array([p[0] for p in replay.presses], dtype=np.int8)
+        self.press_times = np.array([p[1] for p in replay.presses], dtype=np.float64)
+
+    def _on_judgement(self, j: Judgement) -> None:
+        if j.is_hit:
+            self.hits += 1
+
+    def advance(self, t: float) -> None:
+        """Judges the recorded presses up to song time `t`, like live play."""
+        if t <= self.judged_to:
+            return
+        stop = int(np.searchsorted(self.press_times, t, side="right"))
+        for lane, pressed_at in self.replay.presses[self.next_press : stop]:
+            self.judge.press(lane, pressed_at)
+        self.next_press = max(self.next_press, stop)
+        self.track.spawn(t)
+        self.judge.expire(t)
+        self.track.cleanup(t)
+        self.judged_to = t
+
+    def score_at(self, t: float) -> int:
+        self.advance(t)
+        return self.hits
+
+    def close(self) -> None:
+        self.track.close()
+
+    def lanes_pressed(self, t: float, window: float) -> np.ndarray:
+        """Lanes the ghost pressed during the last `window` seconds."""
+        lo = np.searchsorted(self.press_times, t - window, side="left")
+        hi = np.searchsorted(self.press_times, t, side="right")
+        return np.unique(self.press_lanes[lo:hi])
+
+
+# --- Files ---
+
+
+def _profile_key(profile: str) -> str:
+    return profile.lower().replace(" ", "_")
+
+
+def replay_paths(chart_path: Path, profile: Optional[str] = None) -> List[Path]:
+    """Stored runs of a chart (oldest first), optionally for one profile."""
+    folder = replays_dir(chart_path)
+    if not folder.exists():
+        return []
+    prefix = f"{_profile_key(profile)}_" if profile else ""
+    return sorted(
+        p
+        for p in folder.glob(f"{prefix}*{REPLAY_SUFFIX}")
+        if not p.stem.endswith("_pb")
+    )
+
+
+def pb_path(chart_path: Path, profile: str) -> Path:
+    return replays_dir(chart_path) / f"{_profile_key(profile)}_pb{REPLAY_SUFFIX}"
+
+
+def save_replay(chart_path: Path, replay: Replay, is_pb: bool = False) -> Path:
+    """Keeps every run; a personal best is also copied to <profile>_pb.phr."""
+    folder = replays_dir(chart_path)
+    folder.mkdir(parents=True, exist_ok=True)
+    stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(replay.played_at))
+    ms = int(replay.played_at * 1000) % 1000
+    name = f"{_profile_key(replay.profile)}_{stamp}_{ms:03d}"
+    path = folder / f"{name}{REPLAY_SUFFIX}"
+    # Two runs within the same millisecond (scripted play) get a counter
+    n = 1
+    while path.exists():
+        path = folder / f"{name}_{n}{REPLAY_SUFFIX}"
+        n += 1
+    data = replay.encode()
+    atomic_write_bytes(path, data)
+    if is_pb:
+        atomic_write_bytes(pb_path(chart_path, replay.profile), data)
+    return path
+
+
+def load_replay(path: Path) -> Optional[Replay]:
+    try:
+        return Replay.decode(path.read_bytes())
+    except (OSError, ValueError, IndexError, struct.error):
+        return None
+
+
+def load_ghost(
+    chart_path: Path, profile: str, replay: Optional[Replay] = None
+) -> Optional[Ghost]:
+    """
+    The profile's best run on this chart, if it was made on this version.
+    `replay` is the already loaded PB file, if the prefetcher has it.
+    It streams the chart on its own reader, apart from the live track.
+    """
+    if replay is None:
+        replay = load_replay(pb_path(chart_path, profile))
+    if replay is None:
+        return None
+    reader = ChartReader(chart_path)
+    # The compiled header carries the text's hash: nothing is re-read
+    if replay.chart_hash != reader.source_hash:
+        reader.close()
+        return None
+    return Ghost(replay, NoteTrack.stream(reader))
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Writes to a temp file in the same folder, then renames over the target."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,221 @@
+# src/python_hero/rescore.py
+"""
+Re-judges every stored replay against its chart with the current timing
+windows from config, on all CPU cores, and writes the corrected scores back
+through DataManager. No window is opened.
+Run from project root: python -m src.python_hero.rescore --help
+"""
+
+from __future__ import annotations
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from . import config
+from .charts import chart_hash, load_chart_arrays
+from .data_manager import DataManager
+from .gameplay import NoteTrack
+from .replay import (
+    REPLAY_SUFFIX,
+    atomic_write_bytes,
+    load_replay,
+    pb_path,
+    play_back,
+)
+
+# Replays per worker task: big enough to amortise loading the chart
+BATCH_SIZE = 256
+
+
+@dataclass
+class RunResult:
+    path: str
+    chart: str
+    profile: str
+    played_at: float
+    total: int
+    old_hits: int
+    new_hits: int
+    # "ok" | "stale" (chart edited since the run) | "corrupt" | "orphan"
+    status: str = "ok"
+
+    @property
+    def delta(self) -> int:
+        return self.new_hits - self.old_hits
+
+
+def find_replays(assets_dir: Path = config.ASSETS_DIR) -> List[Tuple[Path, List[Path]]]:
+    """(chart path, its replay files) for every chart folder under replays/."""
+    root = assets_dir / "replays"
+    if not root.exists():
+        return []
+    work = []
+    for folder in sorted(p for p in root.iterdir() if p.is_dir()):
+        runs = sorted(
+            p for p in folder.glob(f"*{REPLAY_SUFFIX}") if not p.stem.endswith("_pb")
+        )
+        if runs:
+            work.append((assets_dir / f"{folder.name}.txt", runs))
+    return work
+
+
+def rescore_batch(chart: str, paths: List[str], write: bool) -> List[RunResult]:
+    """Worker: loads the chart once and re-judges each replay in `paths`."""
+    chart_path = Path(chart)
+    results = []
+    if not chart_path.exists():
+        return [
+            RunResult(p, chart_path.name, "", 0.0, 0, 0, 0, "orphan") for p in paths
+        ]
+
+    expected_hash = chart_hash(chart_path)
+    track = NoteTrack(*load_chart_arrays(chart_path))
+    for path in paths:
+        replay = load_replay(Path(path))
+        if replay is None:
+            results.append(
+                RunResult(path, chart_path.name, "", 0.0, 0, 0, 0, "corrupt")
+            )
+            continue
+
+        result = RunResult(
+            path,
+            chart_path.name,
+            replay.profile,
+            replay.played_at,
+            len(track),
+            replay.hits,
+            replay.hits,
+        )
+        if replay.chart_hash != expected_hash:
+            result.status = "stale"
+        else:
+            judgements = play_back(replay, track)
+            result.new_hits = sum(1 for j in judgements if j.is_hit)
+            if write and result.delta:
+                replay.hits, replay.total = result.new_hits, len(track)
+                atomic_write_bytes(Path(path), replay.encode())
+        results.append(result)
+    return results
+
+
+def rescore_all(
+    assets_dir: Path = config.ASSETS_DIR,
+    workers: Optional[int] = None,
+    write: bool = True,
+) -> List[RunResult]:
+    tasks = []
+    for chart_path, runs in find_replays(assets_dir):
+        paths = [str(p) for p in runs]
+        for i in range(0, len(paths), BATCH_SIZE):
+            tasks.append((str(chart_path), paths[i : i + BATCH_SIZE], write))
+
+    results: List[RunResult] = []
+    if workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            results += rescore_batch(*task)
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(rescore_batch, *task) for task in tasks]
+        for future in futures:
+            results += future.result()
+    return results
+
+
+def refresh_pb_ghosts(results: List[RunResult]) -> None:
+    """Points every <profile>_pb.phr at that profile's best re-judged run."""
+    best: Dict[Tuple[str, str], RunResult] = {}
+    for r in results:
+        key = (r.chart, r.profile.lower())
+        if r.status == "ok" and (key not in best or r.new_hits > best[key].new_hits):
+            best[key] = r
+    for r in best.values():
+        # replays/<chart stem>/<run>.phr -> the chart beside replays/
+        source = Path(r.path)
+        target = pb_path(source.parents[2] / r.chart, r.profile)
+        atomic_write_bytes(target, source.read_bytes())
+
+
+def format_report(results: List[RunResult], seconds: float, top: int = 10) -> str:
+    ok = [r for r in results if r.status == "ok"]
+    changed = [r for r in ok if r.delta]
+    skipped: Dict[str, int] = {}
+    for r in results:
+        if r.status != "ok":
+            skipped[r.status] = skipped.get(r.status, 0) + 1
+
+    lines = [
+        f"{len(results)} replays in {seconds:.1f}s "
+        f"({len(results) / max(seconds, 1e-9):.0f}/s)",
+        f"re-judged {len(ok)} | changed {len(changed)} | "
+        f"up {sum(1 for r in changed if r.delta > 0)} | "
+        f"down {sum(1 for r in changed if r.delta < 0)}",
+    ]
+    if skipped:
+        lines.append(
+            "skipped: " + ", ".join(f"{n} {s}" for s, n in sorted(skipped.items()))
+        )
+
+    # Per chart before/after totals
+    per_chart: Dict[str, List[int]] = {}
+    for r in changed:
+        row = per_chart.setdefault(r.chart, [0, 0, 0])
+        row[0] += 1
+        row[1] += r.old_hits
+        row[2] += r.new_hits
+    if per_chart:
+        lines.append(f"{'CHART':<40} {'RUNS':>5} {'HITS BEFORE':>12} {'AFTER':>8}")
+        for chart, (n, before, after) in sorted(per_chart.items()):
+            lines.append(f"{chart:<40} {n:>5} {before:>12} {after:>8}")
+
+    if changed:
+        lines.append("largest changes:")
+        for r in sorted(changed, key=lambda r: -abs(r.delta))[:top]:
+            lines.append(
+                f"  {r.delta:+5d}  {r.old_hits:>5} -> {r.new_hits:<5} "
+                f"{r.profile} on {r.chart} ({Path(r.path).name})"
+            )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--assets", type=Path, default=config.ASSETS_DIR)
+    parser.add_argument("--save-path", default="save_data")
+    parser.add_argument(
+        "--backend", choices=("json", "sqlite"), default=config.SCORE_BACKEND
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="processes (default: all cores)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="report the differences without touching replays or records",
+    )
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = rescore_all(args.assets, args.workers, write=not args.dry_run)
+    print(format_report(results, time.perf_counter() - start))
+
+    if args.dry_run or not any(r.status == "ok" for r in results):
+        return
+
+    refresh_pb_ghosts(results)
+    data = DataManager(save_path=args.save_path, backend=args.backend)
+    data.apply_rescore(
+        (r.profile, r.chart, r.old_hits, r.new_hits, r.total, r.played_at)
+        for r in results
+        if r.status == "ok"
+    )
+    data.close()
+    print("records updated")
+
+
+if __name__ == "__main__":
+    main()
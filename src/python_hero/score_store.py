@@ -0,0 +1,173 @@
+# src/python_hero/score_store.py
+from __future__ import annotations
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS plays (
+    id INTEGER PRIMARY KEY,
+    profile TEXT NOT NULL,      -- lowercased profile name (file stem)
+    player TEXT NOT NULL,       -- display name at the time of the play
+    chart TEXT NOT NULL,
+    hits INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    accuracy REAL NOT NULL,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_plays_chart ON plays (chart, hits DESC, played_at);
+CREATE INDEX IF NOT EXISTS idx_plays_profile ON plays (profile, played_at DESC);
+CREATE INDEX IF NOT EXISTS idx_plays_profile_chart ON plays (profile, chart, hits DESC);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+# (profile, player, chart, hits, total, accuracy, played_at)
+PlayRow = Tuple[str, str, str, int, int, float, float]
+
+
+class ScoreStore:
+    """
+    Every play ever made, in SQLite.
+    Leaderboards, histories and aggregates are single indexed queries.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        # The game opens the store on its startup thread and hands it over
+        # to the main thread; it is never used from two threads at once
+        self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        # WAL keeps readers (other cabinets, tools) from blocking our inserts
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def data_version(self) -> int:
+        """Changes whenever another connection commits to the database."""
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    # --- Writes ---
+
+    def record_play(
+        self,
+        profile: str,
+        chart: str,
+        hits: int,
+        total: int,
+        accuracy: float,
+        played_at: Optional[float] = None,
+    ) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO plays (profile, player, chart, hits, total, accuracy,"
+                " played_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    profile.lower(),
+                    profile,
+                    chart,
+                    hits,
+                    total,
+                    accuracy,
+                    played_at if played_at is not None else time.time(),
+                ),
+            )
+
+    def rescore(self, rows: Iterable[Tuple[int, float, str, str, float]]) -> int:
+        """Re-judged rows of (hits, accuracy, lowercased profile, chart, played_at)."""
+        with self.conn:
+            cur = self.conn.executemany(
+                "UPDATE plays SET hits = ?, accuracy = ?"
+                " WHERE profile = ? AND chart = ? AND played_at = ?",
+                rows,
+            )
+        return cur.rowcount
+
+    def delete_chart(self, chart: str) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM plays WHERE chart = ?", (chart,))
+
+    def delete_all(self) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM plays")
+
+    # --- Queries ---
+
+    def best_per_chart(self) -> Dict[str, Dict]:
+        """Same shape as global_bests.json: chart -> player/hits/accuracy."""
+        rows = self.conn.execute("""
+            SELECT chart, player, hits, accuracy FROM (
+                SELECT chart, player, hits, accuracy, ROW_NUMBER() OVER (
+                    PARTITION BY chart ORDER BY hits DESC, played_at ASC
+                ) AS rank
+                FROM plays
+            ) WHERE rank = 1
+            """)
+        return {
+            r["chart"]: {
+                "player": r["player"],
+                "hits": r["hits"],
+                "accuracy": r["accuracy"],
+            }
+            for r in rows
+        }
+
+    def top_scores(self, chart: str, limit: int = 10) -> List[Dict]:
+        rows = self.conn.execute(
+            "SELECT player, hits, total, accuracy, played_at FROM plays"
+            " WHERE chart = ? ORDER BY hits DESC, played_at ASC LIMIT ?",
+            (chart, limit),
+        )
+        return [dict(r) for r in rows]
+
+    def profile_history(self, profile: str, limit: int = 50) -> List[Dict]:
+        rows = self.conn.execute(
+            "SELECT chart, hits, total, accuracy, played_at FROM plays"
+            " WHERE profile = ? ORDER BY played_at DESC LIMIT ?",
+            (profile.lower(), limit),
+        )
+        return [dict(r) for r in rows]
+
+    def aggregates(self, profile: Optional[str] = None) -> Dict:
+        """Play count, distinct charts and accuracy stats, overall or per profile."""
+        sql = (
+            "SELECT COUNT(*) AS plays, COUNT(DISTINCT chart) AS charts,"
+            " COALESCE(SUM(hits), 0) AS total_hits,"
+            " COALESCE(AVG(accuracy), 0) AS avg_accuracy,"
+            " COALESCE(MAX(accuracy), 0) AS best_accuracy,"
+            " MAX(played_at) AS last_played FROM plays"
+        )
+        params: Tuple = ()
+        if profile is not None:
+            sql += " WHERE profile = ?"
+            params = (profile.lower(),)
+        return dict(self.conn.execute(sql, params).fetchone())
+
+    # --- Migration ---
+
+    def is_migrated(self) -> bool:
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = 'migrated_json'"
+        ).fetchone()
+        return row is not None
+
+    def migrate(self, rows: Iterable[PlayRow]) -> int:
+        """Imports legacy JSON bests once; later calls are no-ops."""
+        if self.is_migrated():
+            return 0
+        rows = list(rows)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO plays (profile, player, chart, hits, total, accuracy,"
+                " played_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('migrated_json', ?)",
+                (str(time.time()),),
+            )
+        return len(rows)
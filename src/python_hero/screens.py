@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+import json
 import math
+import os
 import time
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Sequence, Dict, Final, Tuple
+from typing import List, Sequence, Dict, Final, Optional, Tuple
 
+import numpy as np
 import pygame
 from . import config
-from .data_manager import Profile
+from .layers import LAYERS
+from .profiler import FrameProfiler
+from .data_manager import Profile, atomic_write_json
 from .songs import display_name
+from .telemetry import OffsetStats, RunTelemetry
 
 # --- Visual Constants ---
 BG_DARK: Final = (10, 10, 14)
@@ -19,6 +26,103 @@ ACCENT_RED: Final = (220, 80, 80)
 ACCENT_GOLD: Final = (255, 215, 0)
 DIM_TEXT: Final = (150, 150, 160)
 
+# (name, size, bold) -> loaded font
+FontKey = Tuple[Optional[str], int, bool]
+
+# Font files resolved on an earlier run
+FONT_CACHE_PATH = Path("save_data") / "cache" / "fonts.json"
+
+
+class TextCache:
+    """
+    LRU cache of rendered text surfaces.
+    Keyed by (font, text, color, antialias) and bounded by pixel memory.
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self._surfaces: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+
+    def render(
+        self,
+        font: pygame.font.Font,
+        text: str,
+        color: tuple,
+        antialias: bool = True,
+    ) -> pygame.Surface:
+        key = (font, text, tuple(color), antialias)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            # Mark as most recently used
+            self._surfaces.move_to_end(key)
+            return surf
+
+        surf = font.render(text, antialias, color)
+        self._surfaces[key] = surf
+        self.used_bytes += _surface_bytes(surf)
+
+        # Evict least recently used entries until we fit the budget again
+        while self.used_bytes > self.max_bytes and len(self._surfaces) > 1:
+            _, old = self._surfaces.popitem(last=False)
+            self.used_bytes -= _surface_bytes(old)
+        return surf
+
+    def clear(self) -> None:
+        self._surfaces.clear()
+        self.used_bytes = 0
+
+
+def _surface_bytes(surf: pygame.Surface) -> int:
+    return surf.get_pitch() * surf.get_height()
+
+
+class FontPaths:
+    """
+    Disk cache of system font lookups (name, bold) -> font file.
+    pygame.font.SysFont scans the whole font database (fc-list on Linux) the
+    first time it runs; with the files known, fonts load straight from disk.
+    """
+
+    def __init__(self, cache_path: Optional[Path] = FONT_CACHE_PATH):
+        self.cache_path = cache_path
+        self.paths: Dict[str, Optional[str]] = self._load()
+        self.dirty = False
+
+    def _load(self) -> Dict[str, Optional[str]]:
+        if self.cache_path is None:
+            return {}
+        try:
+            with open(self.cache_path, "r") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def resolve(self, name: Optional[str], bold: bool) -> Optional[str]:
+        """The font file for `name`, or None for pygame's default font."""
+        if name is None:
+            return None
+        key = f"{name}|{int(bold)}"
+        if key in self.paths:
+            path = self.paths[key]
+            # A missing name stays missing; a vanished file is looked up again
+            if path is None or os.path.exists(path):
+                return path
+        self.paths[key] = pygame.font.match_font(name, bold=bold)
+        self.dirty = True
+        return self.paths[key]
+
+    def save(self) -> None:
+        if self.cache_path is None or not self.dirty:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_json(self.cache_path, self.paths)
+            self.dirty = False
+        except OSError:
+            pass
+
 
 @dataclass
 class Fonts:
@@ -27,33 +131,82 @@ class Fonts:
     title_font: pygame.font.Font
     option_font: pygame.font.Font
     ui_font: pygame.font.Font
+    text_cache: TextCache = field(default_factory=TextCache)
+    registry: Dict[FontKey, pygame.font.Font] = field(default_factory=dict)
+    paths: FontPaths = field(default_factory=lambda: FontPaths(None))
 
     @staticmethod
-    def default() -> Fonts:
+    def default(cache_path: Optional[Path] = FONT_CACHE_PATH) -> Fonts:
         """Standard font loader used by the App."""
-        return Fonts(
-            ascii_font=pygame.font.SysFont("consolas", 28),
-            hint_font=pygame.font.SysFont("consolas", 22),
-            title_font=pygame.font.SysFont("consolas", 34),
-            option_font=pygame.font.SysFont("consolas", 26),
-            ui_font=pygame.font.SysFont(None, 34),
+        registry: Dict[FontKey, pygame.font.Font] = {}
+        paths = FontPaths(cache_path)
+        fonts = Fonts(
+            ascii_font=_sys_font(registry, paths, "consolas", 28),
+            hint_font=_sys_font(registry, paths, "consolas", 22),
+            title_font=_sys_font(registry, paths, "consolas", 34),
+            option_font=_sys_font(registry, paths, "consolas", 26),
+            ui_font=_sys_font(registry, paths, None, 34),
+            registry=registry,
+            paths=paths,
         )
+        paths.save()
+        return fonts
+
+    def get(
+        self, name: Optional[str], size: int, bold: bool = False
+    ) -> pygame.font.Font:
+        """Returns a font from the registry, loading it only the first time."""
+        font = _sys_font(self.registry, self.paths, name, size, bold)
+        self.paths.save()
+        return font
+
+    def render(
+        self,
+        font: pygame.font.Font,
+        text: str,
+        color: tuple,
+        antialias: bool = True,
+    ) -> pygame.Surface:
+        """Cached replacement for font.render(); returns a shared surface."""
+        return self.text_cache.render(font, text, color, antialias)
+
+
+def _sys_font(
+    registry: Dict[FontKey, pygame.font.Font],
+    paths: FontPaths,
+    name: Optional[str],
+    size: int,
+    bold: bool = False,
+) -> pygame.font.Font:
+    key = (name, size, bold)
+    font = registry.get(key)
+    if font is None:
+        path = paths.resolve(name, bold)
+        font = pygame.font.Font(path, size)
+        if bold and path is None:
+            # Same fallback as SysFont: synthesise bold on the default font
+            font.set_bold(True)
+        registry[key] = font
+    return font
 
 
 # --- Internal Helpers ---
 
 
 def _draw_centered(
-    screen: pygame.Surface, text: str, font: pygame.font.Font, color: tuple, y: int
+    screen: pygame.Surface,
+    fonts: Fonts,
+    text: str,
+    font: pygame.font.Font,
+    color: tuple,
+    y: int,
 ):
-    surf = font.render(text, True, color)
+    surf = fonts.render(font, text, color)
     screen.blit(surf, ((config.WIDTH - surf.get_width()) // 2, y))
 
 
 def _draw_overlay(screen: pygame.Surface, alpha: int = 200):
-    overlay = pygame.Surface((config.WIDTH, config.HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, alpha))
-    screen.blit(overlay, (0, 0))
+    screen.blit(LAYERS.overlay(alpha), (0, 0))
 
 
 def _get_grade(percent: float) -> Tuple[str, tuple]:
@@ -72,30 +225,47 @@ def _get_grade(percent: float) -> Tuple[str, tuple]:
 # --- Primary Screens ---
 
 
-def draw_splash(screen: pygame.Surface, fonts: Fonts) -> None:
+def draw_splash(screen: pygame.Surface, fonts: Fonts, ready: bool = True) -> None:
     screen.fill(BG_DARK)
     y = 220
     for line in config.SPLASH_ART:
-        surf = fonts.ascii_font.render(line, True, TEXT_PRIMARY)
+        surf = fonts.render(fonts.ascii_font, line, TEXT_PRIMARY)
         screen.blit(surf, ((config.WIDTH - surf.get_width()) // 2, y))
         y += fonts.ascii_font.get_height() + 2
 
+    draw_splash_prompt(screen, fonts, ready)
+
+
+def draw_splash_prompt(
+    screen: pygame.Surface, fonts: Fonts, ready: bool = True
+) -> pygame.Rect:
+    """
+    Redraws only the pulsing prompt and returns the area it covers.
+    Until startup loading is done (`ready`), it reads Loading... instead.
+    """
+    art_height = len(config.SPLASH_ART) * (fonts.ascii_font.get_height() + 2)
+    y = 220 + art_height + 60
+    rect = pygame.Rect(0, y, config.WIDTH, fonts.title_font.get_height())
+    screen.fill(BG_DARK, rect)
+
     pulse = int(120 + 135 * (0.5 + 0.5 * math.sin(time.time() * 3)))
-    _draw_centered(
-        screen, "Press ENTER to Start", fonts.title_font, (pulse, pulse, pulse), y + 60
-    )
+    text = "Press ENTER to Start" if ready else "Loading..."
+    _draw_centered(screen, fonts, text, fonts.title_font, (pulse,) * 3, y)
+    return rect
 
 
 def draw_main_menu(screen: pygame.Surface, fonts: Fonts, selected_index: int) -> None:
     screen.fill(BG_DARK)
-    _draw_centered(screen, "PYTHON HERO", fonts.title_font, ACCENT_GREEN, 80)
+    _draw_centered(screen, fonts, "PYTHON HERO", fonts.title_font, ACCENT_GREEN, 80)
 
     options = ["Play Game", "Settings", "Profiles", "High Scores", "Quit"]
     for i, opt in enumerate(options):
         is_sel = i == selected_index
         color = ACCENT_GREEN if is_sel else DIM_TEXT
         prefix = ">> " if is_sel else "   "
-        _draw_centered(screen, prefix + opt, fonts.option_font, color, 250 + i * 60)
+        _draw_centered(
+            screen, fonts, prefix + opt, fonts.option_font, color, 250 + i * 60
+        )
 
 
 def draw_settings(
@@ -106,7 +276,9 @@ def draw_settings(
     menu_index: int,
 ) -> None:
     screen.fill(BG_DARK)
-    _draw_centered(screen, "SETTINGS: KEY BINDINGS", fonts.title_font, TEXT_PRIMARY, 60)
+    _draw_centered(
+        screen, fonts, "SETTINGS: KEY BINDINGS", fonts.title_font, TEXT_PRIMARY, 60
+    )
 
     y = 200
     lanes = ["Lane 1", "Lane 2", "Lane 3", "Lane 4", "Lane 5"]
@@ -130,12 +302,13 @@ def draw_settings(
             )
 
         # 2. Render
-        surf = fonts.option_font.render(text, True, color)
+        surf = fonts.render(fonts.option_font, text, color)
         screen.blit(surf, ((config.WIDTH - surf.get_width()) // 2, y))
         y += 60
 
     _draw_centered(
         screen,
+        fonts,
         "UP/DOWN: Select | ENTER: Rebind | R: Reset | ESC: Save",
         fonts.hint_font,
         DIM_TEXT,
@@ -147,18 +320,19 @@ def draw_profile_select(
     screen: pygame.Surface, fonts: Fonts, names: List[str], selected: int, active: str
 ) -> None:
     screen.fill(BG_DARK)
-    _draw_centered(screen, "SELECT PROFILE", fonts.title_font, TEXT_PRIMARY, 60)
+    _draw_centered(screen, fonts, "SELECT PROFILE", fonts.title_font, TEXT_PRIMARY, 60)
     _draw_centered(
-        screen, f"Logged in as: {active}", fonts.hint_font, ACCENT_GREEN, 120
+        screen, fonts, f"Logged in as: {active}", fonts.hint_font, ACCENT_GREEN, 120
     )
 
     opts = names + ["[ Create New Profile ]"]
     for i, name in enumerate(opts):
         color = TEXT_PRIMARY if i == selected else DIM_TEXT
-        _draw_centered(screen, name, fonts.option_font, color, 200 + i * 50)
+        _draw_centered(screen, fonts, name, fonts.option_font, color, 200 + i * 50)
 
     _draw_centered(
         screen,
+        fonts,
         "ESC: Back | ENTER: Select | D: Delete Profile",
         fonts.hint_font,
         DIM_TEXT,
@@ -170,17 +344,18 @@ def draw_song_select(
     screen: pygame.Surface, fonts: Fonts, songs: Sequence[Path], selected: int
 ) -> None:
     screen.fill(BG_DARK)
-    _draw_centered(screen, "SELECT A SONG", fonts.title_font, TEXT_PRIMARY, 60)
+    _draw_centered(screen, fonts, "SELECT A SONG", fonts.title_font, TEXT_PRIMARY, 60)
 
     for i, song in enumerate(songs):
         color = TEXT_PRIMARY if i == selected else DIM_TEXT
         prefix = ">> " if i == selected else "   "
         clean_name = display_name(song)
-        surf = fonts.option_font.render(f"{prefix}{clean_name}", True, color)
+        surf = fonts.render(fonts.option_font, f"{prefix}{clean_name}", color)
         screen.blit(surf, (100, 180 + i * 45))
 
     _draw_centered(
         screen,
+        fonts,
         "UP/DOWN: Navigate | ENTER: Select | ESC: Main Menu",
         fonts.hint_font,
         DIM_TEXT,
@@ -192,30 +367,35 @@ def draw_chart_choice(screen, fonts, song, charts, selected, profile) -> None:
     screen.fill(BG_DARK)
     if not song:
         return
-    _draw_centered(screen, f"CHART: {song.stem}", fonts.title_font, TEXT_PRIMARY, 60)
+    _draw_centered(
+        screen, fonts, f"CHART: {song.stem}", fonts.title_font, TEXT_PRIMARY, 60
+    )
 
     y = 180
     if not charts:
-        _draw_centered(screen, "[ NO CHARTS FOUND ]", fonts.option_font, ACCENT_RED, y)
+        _draw_centered(
+            screen, fonts, "[ NO CHARTS FOUND ]", fonts.option_font, ACCENT_RED, y
+        )
     else:
         for i, p in enumerate(charts):
             is_sel = i == selected
             color = ACCENT_GREEN if is_sel else DIM_TEXT
-            surf = fonts.option_font.render(
-                f"{'>> ' if is_sel else '   '}{p.name}", True, color
+            surf = fonts.render(
+                fonts.option_font, f"{'>> ' if is_sel else '   '}{p.name}", color
             )
             screen.blit(surf, (100, y))
 
             if is_sel and p.name in profile.stats.song_data:
                 pb = profile.stats.song_data[p.name]
-                pb_txt = fonts.hint_font.render(
-                    f"(PB: {pb.best_percent}%)", True, ACCENT_GREEN
+                pb_txt = fonts.render(
+                    fonts.hint_font, f"(PB: {pb.best_percent}%)", ACCENT_GREEN
                 )
                 screen.blit(pb_txt, (110 + surf.get_width(), y + 5))
             y += 45
 
     _draw_centered(
         screen,
+        fonts,
         "ENTER: Play | R: Record | D: Delete | X: Reset",
         fonts.hint_font,
         DIM_TEXT,
@@ -228,18 +408,18 @@ from .songs import display_name  # Ensure this import is at the top of screens.p
 
 def draw_high_scores(screen, fonts, records) -> None:
     screen.fill(BG_DARK)
-    _draw_centered(screen, "WORLD RECORDS", fonts.title_font, ACCENT_GOLD, 50)
+    _draw_centered(screen, fonts, "WORLD RECORDS", fonts.title_font, ACCENT_GOLD, 50)
 
     y = 150
     # Header for the table
     header_str = f"{'PLAYER':<15} {'SCORE (ACC%)':<25} {'SONG':<20}"
-    header = fonts.hint_font.render(header_str, True, DIM_TEXT)
+    header = fonts.render(fonts.hint_font, header_str, DIM_TEXT)
     screen.blit(header, (100, y))
 
     y += 45
     if not records:
         _draw_centered(
-            screen, "[ NO RECORDS YET ]", fonts.option_font, DIM_TEXT, y + 40
+            screen, fonts, "[ NO RECORDS YET ]", fonts.option_font, DIM_TEXT, y + 40
         )
     else:
         # 1. Sort records by hits (score) so the best players are at the top
@@ -263,7 +443,9 @@ def draw_high_scores(screen, fonts, records) -> None:
             row_text = f"{player:<15} {hits} ({acc}%)".ljust(41) + f"{song}"
 
             # 4. Render the row
-            screen.blit(fonts.ascii_font.render(row_text, True, TEXT_PRIMARY), (100, y))
+            screen.blit(
+                fonts.render(fonts.ascii_font, row_text, TEXT_PRIMARY), (100, y)
+            )
             y += 40
 
             # Prevent drawing off the bottom of the screen
@@ -272,6 +454,7 @@ def draw_high_scores(screen, fonts, records) -> None:
 
     _draw_centered(
         screen,
+        fonts,
         "ESC: Back | C: Wipe All Records",
         fonts.hint_font,
         DIM_TEXT,
@@ -282,14 +465,12 @@ def draw_high_scores(screen, fonts, records) -> None:
 # ---------- New Results Screen ----------
 def draw_pause_countdown(screen: pygame.Surface, fonts: Fonts, value: int) -> None:
     """Draws a semi-transparent overlay with a centered countdown number."""
-    # 1. Create a semi-transparent dark overlay
-    overlay = pygame.Surface((config.WIDTH, config.HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 160))
-    screen.blit(overlay, (0, 0))
+    # 1. Semi-transparent dark overlay
+    _draw_overlay(screen, 160)
 
     # 2. Render the "GET READY" text and the countdown number
-    title = fonts.title_font.render("GET READY", True, ACCENT_GREEN)
-    num = fonts.title_font.render(str(value), True, TEXT_PRIMARY)
+    title = fonts.render(fonts.title_font, "GET READY", ACCENT_GREEN)
+    num = fonts.render(fonts.title_font, str(value), TEXT_PRIMARY)
 
     # 3. Position them in the center of the screen
     center_x = config.WIDTH // 2
@@ -299,28 +480,45 @@ def draw_pause_countdown(screen: pygame.Surface, fonts: Fonts, value: int) -> No
     screen.blit(num, (center_x - num.get_width() // 2, center_y + 20))
 
 
-def draw_results(screen: pygame.Surface, fonts: Fonts, hits: int, total: int) -> None:
+def draw_results(
+    screen: pygame.Surface,
+    fonts: Fonts,
+    hits: int,
+    total: int,
+    telemetry: Optional[RunTelemetry] = None,
+    profile: Optional[Profile] = None,
+) -> None:
     screen.fill(BG_DARK)
     percent = (hits / total * 100) if total > 0 else 0
     grade_char, grade_color = _get_grade(percent)
 
-    _draw_centered(screen, "PERFORMANCE RESULTS", fonts.title_font, TEXT_PRIMARY, 80)
+    _draw_centered(
+        screen, fonts, "PERFORMANCE RESULTS", fonts.title_font, TEXT_PRIMARY, 80
+    )
 
     # Draw Grade
-    grade_font = pygame.font.SysFont("consolas", 120, bold=True)
-    grade_surf = grade_font.render(grade_char, True, grade_color)
+    grade_font = fonts.get("consolas", 120, bold=True)
+    grade_surf = fonts.render(grade_font, grade_char, grade_color)
     screen.blit(grade_surf, ((config.WIDTH - grade_surf.get_width()) // 2, 180))
 
     # Stats
     _draw_centered(
-        screen, f"Notes Hit: {hits} / {total}", fonts.option_font, TEXT_PRIMARY, 340
+        screen,
+        fonts,
+        f"Notes Hit: {hits} / {total}",
+        fonts.option_font,
+        TEXT_PRIMARY,
+        340,
     )
     _draw_centered(
-        screen, f"Accuracy: {percent:.2f}%", fonts.option_font, grade_color, 390
+        screen, fonts, f"Accuracy: {percent:.2f}%", fonts.option_font, grade_color, 390
     )
+    if telemetry is not None and telemetry.stats.offsets.count:
+        _draw_offsets(screen, fonts, telemetry, profile)
 
     _draw_centered(
         screen,
+        fonts,
         "Press ENTER to Continue",
         fonts.hint_font,
         DIM_TEXT,
@@ -328,6 +526,113 @@ def draw_results(screen: pygame.Surface, fonts: Fonts, hits: int, total: int) ->
     )
 
 
+def _offset_color(ms: float) -> tuple:
+    """Colour of the grade an offset earns."""
+    ms = abs(ms)
+    if ms <= config.PERFECT_WINDOW_MS:
+        return ACCENT_GREEN
+    if ms <= config.GREAT_WINDOW_MS:
+        return (100, 200, 255)
+    if ms <= config.GOOD_WINDOW_MS:
+        return (255, 165, 0)
+    return ACCENT_RED
+
+
+def _draw_offsets(
+    screen: pygame.Surface,
+    fonts: Fonts,
+    telemetry: RunTelemetry,
+    profile: Optional[Profile],
+) -> None:
+    """Offset summary, histogram, hit/miss timeline and per-lane means."""
+    s = telemetry.summary()
+    _draw_centered(
+        screen,
+        fonts,
+        f"Offset {s['mean']:+.1f} ms (sd {s['std']:.1f})  |  median {s['p50']:+.1f}"
+        f"  |  95% within {s['p95']:.0f} ms  |  {s['early']:.0%} early",
+        fonts.hint_font,
+        TEXT_PRIMARY,
+        440,
+    )
+
+    # 1. Histogram over the miss window, zero in the middle
+    hist = telemetry.stats.histogram
+    box = pygame.Rect(0, 480, 660, 110)
+    box.centerx = config.WIDTH // 2
+    bar_w = box.width / len(hist)
+    peak = max(hist) or 1
+    for i, count in enumerate(hist):
+        if not count:
+            continue
+        h = max(1, round(count / peak * box.height))
+        centre_ms = (i + 0.5) * config.OFFSET_BIN_MS - config.MISS_WINDOW_MS
+        x = box.x + round(i * bar_w)
+        pygame.draw.rect(
+            screen,
+            _offset_color(centre_ms),
+            (x, box.bottom - h, max(1, round((i + 1) * bar_w) - (x - box.x) - 1), h),
+        )
+    pygame.draw.line(
+        screen, DIM_TEXT, (box.centerx, box.y), (box.centerx, box.bottom), 1
+    )
+    mean_x = box.centerx + round(s["mean"] / config.MISS_WINDOW_MS * box.width / 2)
+    pygame.draw.line(screen, ACCENT_GOLD, (mean_x, box.y), (mean_x, box.bottom), 2)
+    for text, x in (("EARLY", box.x), ("LATE", box.right)):
+        surf = fonts.render(fonts.hint_font, text, DIM_TEXT)
+        screen.blit(surf, (x - (surf.get_width() if x == box.right else 0), box.y))
+
+    # 2. Timeline: hits (green) under misses (red), one column per bucket
+    tl = telemetry.timeline
+    strip = pygame.Rect(0, 610, 900, 50)
+    strip.centerx = config.WIDTH // 2
+    pygame.draw.rect(screen, (30, 30, 38), strip)
+    used = max(tl.used, 1)
+    col_w = strip.width / used
+    tallest = max(h + m for h, m in zip(tl.hits[:used], tl.misses[:used])) or 1
+    for i in range(used):
+        x = strip.x + round(i * col_w)
+        w = max(1, round((i + 1) * col_w) - (x - strip.x))
+        hit_h = round(tl.hits[i] / tallest * strip.height)
+        miss_h = round(tl.misses[i] / tallest * strip.height)
+        if hit_h:
+            pygame.draw.rect(screen, ACCENT_GREEN, (x, strip.bottom - hit_h, w, hit_h))
+        if miss_h:
+            pygame.draw.rect(
+                screen, ACCENT_RED, (x, strip.bottom - hit_h - miss_h, w, miss_h)
+            )
+
+    # 3. Per-lane mean offsets, in lane colours
+    parts = []
+    for lane, stat in enumerate(telemetry.stats.lanes):
+        label = str(lane + 1)
+        if profile is not None and lane < len(profile.keys):
+            label = pygame.key.name(profile.keys[lane]).upper()
+        text = f"{label} {stat.mean * 1000:+.0f}" if stat.count else f"{label} --"
+        parts.append(fonts.render(fonts.hint_font, text, config.LANE_COLORS[lane]))
+    gap = 40
+    x = (config.WIDTH - sum(p.get_width() for p in parts) - gap * (len(parts) - 1)) // 2
+    for surf in parts:
+        screen.blit(surf, (x, 680))
+        x += surf.get_width() + gap
+
+    if profile is not None and profile.offsets.offsets.count:
+        _draw_lifetime(screen, fonts, profile.offsets)
+
+
+def _draw_lifetime(screen: pygame.Surface, fonts: Fonts, stats: OffsetStats) -> None:
+    s = stats.summary()
+    _draw_centered(
+        screen,
+        fonts,
+        f"All plays: {s['mean']:+.1f} ms mean over {stats.offsets.count} presses"
+        f"  |  95% within {s['p95']:.0f} ms",
+        fonts.hint_font,
+        DIM_TEXT,
+        720,
+    )
+
+
 # ---------- Overlays & Modals ----------
 
 
@@ -335,7 +640,7 @@ def draw_pause_menu(
     screen: pygame.Surface, fonts: Fonts, mode: str, selected_index: int
 ) -> None:
     _draw_overlay(screen, 220)  # Using our helper from the previous optimization
-    _draw_centered(screen, "PAUSED", fonts.title_font, ACCENT_GREEN, 150)
+    _draw_centered(screen, fonts, "PAUSED", fonts.title_font, ACCENT_GREEN, 150)
 
     options = (
         ["Resume", "Restart", "Exit"]
@@ -347,7 +652,9 @@ def draw_pause_menu(
         is_sel = i == selected_index
         color = ACCENT_GREEN if is_sel else DIM_TEXT
         prefix = "> " if is_sel else "  "
-        _draw_centered(screen, prefix + opt, fonts.option_font, color, 280 + i * 50)
+        _draw_centered(
+            screen, fonts, prefix + opt, fonts.option_font, color, 280 + i * 50
+        )
 
 
 def draw_confirm_dialog(screen, fonts, title, subtext, is_danger=True):
@@ -358,10 +665,13 @@ def draw_confirm_dialog(screen, fonts, title, subtext, is_danger=True):
     pygame.draw.rect(screen, (25, 25, 35), rect)
     pygame.draw.rect(screen, border, rect, 3)
 
-    _draw_centered(screen, title, fonts.title_font, border, rect.top + 40)
-    _draw_centered(screen, subtext, fonts.hint_font, TEXT_PRIMARY, rect.top + 100)
+    _draw_centered(screen, fonts, title, fonts.title_font, border, rect.top + 40)
+    _draw_centered(
+        screen, fonts, subtext, fonts.hint_font, TEXT_PRIMARY, rect.top + 100
+    )
     _draw_centered(
         screen,
+        fonts,
         "ENTER: Confirm | ESC: Cancel",
         fonts.hint_font,
         DIM_TEXT,
@@ -375,8 +685,12 @@ def draw_create_profile(
     """Draws the text input screen for creating a new profile."""
     screen.fill(BG_DARK)
 
-    _draw_centered(screen, "CREATE NEW PROFILE", fonts.title_font, ACCENT_GREEN, 150)
-    _draw_centered(screen, "Enter your name:", fonts.option_font, TEXT_PRIMARY, 250)
+    _draw_centered(
+        screen, fonts, "CREATE NEW PROFILE", fonts.title_font, ACCENT_GREEN, 150
+    )
+    _draw_centered(
+        screen, fonts, "Enter your name:", fonts.option_font, TEXT_PRIMARY, 250
+    )
 
     # Draw the input box area
     input_rect = pygame.Rect(0, 0, 600, 60)
@@ -387,13 +701,80 @@ def draw_create_profile(
 
     # Render the name typed so far
     # We add a "|" character at the end to act as a typing cursor
-    name_surf = fonts.option_font.render(f"{current_name}|", True, (255, 255, 255))
+    name_surf = fonts.render(fonts.option_font, f"{current_name}|", (255, 255, 255))
     screen.blit(name_surf, (input_rect.x + 20, input_rect.y + 10))
 
     _draw_centered(
         screen,
+        fonts,
         "ENTER: Confirm | ESC: Cancel",
         fonts.hint_font,
         DIM_TEXT,
         config.HEIGHT - 100,
     )
+
+
+def build_profiler_panel(
+    fonts: Fonts,
+    profiler: FrameProfiler,
+    budget_ms: float,
+    status: str = "",
+    frames: str = "",
+) -> pygame.Surface:
+    """
+    Frame-time graph plus per-phase stats on a translucent panel.
+    `frames` is the FrameStats summary: rate and jitter over its window.
+    Built a few times per second and blitted in between, so the overlay
+    barely shows up in its own numbers.
+    """
+    panel = pygame.Surface((520, 298), pygame.SRCALPHA)
+    panel.fill((0, 0, 0, 200))
+    pygame.draw.rect(panel, DIM_TEXT, panel.get_rect(), 1)
+
+    # Values change on every rebuild: render directly instead of caching
+    font = fonts.get("consolas", 16)
+    stats = profiler.stats()
+    frame = stats.get("frame")
+    y = 8
+
+    def line(text: str, color: tuple = TEXT_PRIMARY) -> None:
+        nonlocal y
+        panel.blit(font.render(text, True, color), (10, y))
+        y += 18
+
+    if frame is None:
+        line("PROFILER: collecting...", ACCENT_GOLD)
+        return panel
+    line(
+        f"FRAME p50 {frame['p50']:.2f}  p95 {frame['p95']:.2f}  "
+        f"p99 {frame['p99']:.2f}  max {frame['max']:.2f} ms",
+        ACCENT_GOLD,
+    )
+    if frames:
+        line(frames, DIM_TEXT)
+
+    # 1. Graph: total frame time (dim) and work without the wait (green)
+    graph = pygame.Rect(10, y + 4, panel.get_width() - 20, 90)
+    totals = profiler.totals()[-graph.width :]
+    work = profiler.totals(exclude=("wait",))[-graph.width :]
+    scale_ms = max(2.0 * budget_ms, frame["p99"] * 1.2, 1.0)
+    budget_y = graph.bottom - int(budget_ms / scale_ms * graph.height)
+    pygame.draw.line(panel, ACCENT_RED, (graph.left, budget_y), (graph.right, budget_y))
+    for series, color in ((totals, DIM_TEXT), (work, ACCENT_GREEN)):
+        if series.size < 2:
+            continue
+        xs = graph.left + np.arange(series.size)
+        ys = graph.bottom - np.minimum(series * 1000.0 / scale_ms, 1.0) * graph.height
+        pygame.draw.lines(panel, color, False, np.column_stack((xs, ys)).tolist())
+    y = graph.bottom + 8
+
+    # 2. Costliest phases by mean
+    phases = sorted(
+        ((name, s) for name, s in stats.items() if name != "frame"),
+        key=lambda item: item[1]["mean"],
+        reverse=True,
+    )
+    for name, s in phases[:6]:
+        line(f"{name:<18} mean {s['mean']:6.2f}  p99 {s['p99']:6.2f} ms")
+    line(status or "F3: hide | F4: export CSV/JSON", DIM_TEXT)
+    return panel
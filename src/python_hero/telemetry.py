@@ -0,0 +1,261 @@
+# src/python_hero/telemetry.py
+from __future__ import annotations
+import math
+from bisect import bisect_right, insort
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from . import config
+
+if TYPE_CHECKING:
+    from .judge import Judgement
+
+
+def _histogram_bins() -> int:
+    return 2 * math.ceil(config.MISS_WINDOW_MS / config.OFFSET_BIN_MS)
+
+
+@dataclass
+class Welford:
+    """Running mean and variance in one pass (Welford's algorithm)."""
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        d = x - self.mean
+        self.mean += d / self.count
+        self.m2 += d * (x - self.mean)
+
+    def merge(self, other: Welford) -> None:
+        """As if every sample of `other` had been added here (Chan et al.)."""
+        if not other.count:
+            return
+        n = self.count + other.count
+        d = other.mean - self.mean
+        self.mean += d * other.count / n
+        self.m2 += other.m2 + d * d * self.count * other.count / n
+        self.count = n
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+class P2Quantile:
+    """
+    Streaming estimate of the p-quantile from five markers (Jain and
+    Chlamtac's P² algorithm): constant memory, no samples kept.
+    Exact until the fifth sample.
+    """
+
+    def __init__(self, p: float):
+        self.p = p
+        self.heights: List[float] = []
+        self.positions = [0, 1, 2, 3, 4]
+        self.desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self.steps = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x: float) -> None:
+        q, n = self.heights, self.positions
+        if len(q) < 5:
+            insort(q, x)
+            return
+
+        # 1. Find the cell x falls in, stretching the extremes if needed
+        if x < q[0]:
+            q[0], k = x, 0
+        elif x >= q[4]:
+            q[4], k = x, 3
+        else:
+            k = bisect_right(q, x) - 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.steps[i]
+
+        # 2. Nudge the middle markers towards their desired positions
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                s = 1 if d > 0 else -1
+                h = q[i] + s / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < h < q[i + 1]:
+                    # The parabola overshot: fall back to linear
+                    h = q[i] + s * (q[i + s] - q[i]) / (n[i + s] - n[i])
+                q[i] = h
+                n[i] += s
+
+    @property
+    def value(self) -> float:
+        q = self.heights
+        if len(q) < 5:
+            return q[round(self.p * (len(q) - 1))] if q else 0.0
+        return q[2]
+
+
+@dataclass
+class OffsetStats:
+    """
+    Signed press offsets (seconds, negative = early) in constant memory.
+    Kept with the profile, where every run is folded in with merge().
+    Percentiles come from the histogram, which merges exactly.
+    """
+
+    offsets: Welford = field(default_factory=Welford)
+    lanes: List[Welford] = field(
+        default_factory=lambda: [Welford() for _ in config.LANE_COLORS]
+    )
+    early: int = 0
+    late: int = 0
+    # Notes not hit: expired, or pressed outside the good window
+    misses: int = 0
+    # Press counts per OFFSET_BIN_MS over +-MISS_WINDOW_MS, earliest first
+    histogram: List[int] = field(default_factory=lambda: [0] * _histogram_bins())
+
+    def add(self, j: Judgement) -> None:
+        if not j.is_hit:
+            self.misses += 1
+        if j.offset is None:
+            return
+        self.offsets.add(j.offset)
+        if 0 <= j.lane < len(self.lanes):
+            self.lanes[j.lane].add(j.offset)
+        if j.offset < 0:
+            self.early += 1
+        else:
+            self.late += 1
+        bins = len(self.histogram)
+        b = int((j.offset * 1000 + config.MISS_WINDOW_MS) // config.OFFSET_BIN_MS)
+        self.histogram[min(max(b, 0), bins - 1)] += 1
+
+    def merge(self, other: OffsetStats) -> None:
+        self.offsets.merge(other.offsets)
+        for mine, theirs in zip(self.lanes, other.lanes):
+            mine.merge(theirs)
+        self.early += other.early
+        self.late += other.late
+        self.misses += other.misses
+        if len(other.histogram) == len(self.histogram):
+            self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+
+    @property
+    def early_ratio(self) -> float:
+        pressed = self.early + self.late
+        return self.early / pressed if pressed else 0.0
+
+    def quantile(self, q: float, absolute: bool = False) -> float:
+        """From the histogram, interpolated within the bin (seconds)."""
+        bin_s = config.OFFSET_BIN_MS / 1000.0
+        lo = -config.MISS_WINDOW_MS / 1000.0
+        if absolute:
+            # Fold the early half onto the late one
+            half = len(self.histogram) // 2
+            counts = [
+                a + b
+                for a, b in zip(self.histogram[half:], reversed(self.histogram[:half]))
+            ]
+            lo = 0.0
+        else:
+            counts = self.histogram
+        total = sum(counts)
+        if not total:
+            return 0.0
+        target, seen = q * total, 0
+        for i, c in enumerate(counts):
+            if c and seen + c >= target:
+                return lo + (i + (target - seen) / c) * bin_s
+            seen += c
+        return lo + len(counts) * bin_s
+
+    def summary(self) -> Dict[str, float]:
+        """Milliseconds, except `early` (a fraction of presses)."""
+        return {
+            "mean": self.offsets.mean * 1000,
+            "std": self.offsets.std * 1000,
+            "p50": self.quantile(0.5) * 1000,
+            "p95": self.quantile(0.95, absolute=True) * 1000,
+            "early": self.early_ratio,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> OffsetStats:
+        stats = cls()
+        if not data:
+            return stats
+        try:
+            stats.offsets = Welford(**data["offsets"])
+            lanes = [Welford(**w) for w in data["lanes"]]
+            if len(lanes) == len(stats.lanes):
+                stats.lanes = lanes
+            stats.early, stats.late = int(data["early"]), int(data["late"])
+            stats.misses = int(data["misses"])
+            histogram = [int(c) for c in data["histogram"]]
+        except (KeyError, TypeError, ValueError):
+            return cls()
+        # Bins from another OFFSET_BIN_MS or MISS_WINDOW_MS cannot be reused
+        if len(histogram) == len(stats.histogram):
+            stats.histogram = histogram
+        return stats
+
+
+class HitTimeline:
+    """
+    Hits and misses over the song in a fixed number of buckets. When a note
+    lands past the last bucket, neighbouring buckets are paired up and the
+    bucket width doubles, so any song length fits in the same memory.
+    """
+
+    def __init__(self, buckets: int = config.TIMELINE_BUCKETS, width: float = 0.5):
+        self.width = width
+        self.hits = [0] * buckets
+        self.misses = [0] * buckets
+        self.used = 0
+
+    def add(self, t: float, hit: bool) -> None:
+        i = int(max(t, 0.0) / self.width)
+        while i >= len(self.hits):
+            self._halve()
+            i = int(max(t, 0.0) / self.width)
+        (self.hits if hit else self.misses)[i] += 1
+        self.used = max(self.used, i + 1)
+
+    def _halve(self) -> None:
+        n = len(self.hits)
+        for counts in (self.hits, self.misses):
+            counts[:] = [a + b for a, b in zip(counts[0::2], counts[1::2])]
+            counts += [0] * (n - len(counts))
+        self.width *= 2
+        self.used = (self.used + 1) // 2
+
+
+class RunTelemetry:
+    """
+    Everything measured about one play, fed by the judge's listeners.
+    The run's percentiles are P² estimates: no offsets are stored.
+    """
+
+    def __init__(self) -> None:
+        self.stats = OffsetStats()
+        self.timeline = HitTimeline()
+        self.median = P2Quantile(0.5)
+        # Of the absolute offset: how far off the worst 5% of presses are
+        self.spread = P2Quantile(0.95)
+
+    def add(self, j: Judgement) -> None:
+        self.stats.add(j)
+        self.timeline.add(j.target_time, j.is_hit)
+        if j.offset is not None:
+            self.median.add(j.offset)
+            self.spread.add(abs(j.offset))
+
+    def summary(self) -> Dict[str, float]:
+        summary = self.stats.summary()
+        summary["p50"] = self.median.value * 1000
+        summary["p95"] = self.spread.value * 1000
+        return summary
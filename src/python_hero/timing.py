@@ -0,0 +1,96 @@
+# src/python_hero/timing.py
+from __future__ import annotations
+import time
+from typing import Callable, Optional
+
+import numpy as np
+from . import config
+
+
+def target_hz(frame_mode: str = config.FRAME_MODE) -> float:
+    """Render rate for a FRAME_MODE; 0 means the pacer never waits."""
+    return float(config.FRAME_MODES.get(frame_mode, config.FPS))
+
+
+class FramePacer:
+    """
+    Holds frames to a steady rate.
+    Sleeps in short slices (running `poll` in between) until a small margin
+    before the deadline, then spins the rest of the way, like
+    Clock.tick_busy_loop but without burning the whole frame.
+    """
+
+    def __init__(
+        self,
+        hz: float,
+        spin: float = config.PACER_SPIN_MS / 1000.0,
+        poll_interval: float = 1.0 / config.INPUT_POLL_HZ,
+    ):
+        self.spin = spin
+        self.poll_interval = poll_interval
+        self.period = 0.0
+        self.deadline = time.perf_counter()
+        self.set_target(hz)
+
+    def set_target(self, hz: float) -> None:
+        self.period = 1.0 / hz if hz > 0 else 0.0
+
+    def wait(
+        self, poll: Optional[Callable[[], bool]] = None, wake_on_input: bool = False
+    ) -> None:
+        """
+        Waits for the next frame. `poll` returns True when input arrived;
+        with `wake_on_input` that ends the wait early (used by idle menus).
+        """
+        if self.period <= 0:
+            # Uncapped / vsync: the display flip is the only limiter
+            if poll:
+                poll()
+            self.deadline = time.perf_counter()
+            return
+
+        self.deadline += self.period
+        now = time.perf_counter()
+        if now >= self.deadline:
+            # Fell behind: start a fresh schedule instead of racing to catch up
+            self.deadline = now
+            if poll:
+                poll()
+            return
+
+        # 1. Coarse phase: sleep in slices, keeping input sampled
+        while True:
+            if poll and poll() and wake_on_input:
+                self.deadline = time.perf_counter()
+                return
+            remaining = self.deadline - time.perf_counter()
+            if remaining <= self.spin:
+                break
+            time.sleep(min(remaining - self.spin, self.poll_interval))
+
+        # 2. Fine phase: spin for sub-millisecond accuracy
+        while time.perf_counter() < self.deadline:
+            pass
+
+
+class FrameStats:
+    """Fixed-size ring buffer of recent frame times (seconds)."""
+
+    def __init__(self, capacity: int = 600):
+        self.samples = np.zeros(capacity, dtype=np.float64)
+        self.count = 0
+
+    def record(self, frame_time: float) -> None:
+        self.samples[self.count % self.samples.size] = frame_time
+        self.count += 1
+
+    def window(self) -> np.ndarray:
+        return self.samples[: min(self.count, self.samples.size)]
+
+    def summary(self) -> str:
+        """Rate and jitter of the recent frames (percentiles: see the profiler)."""
+        w = self.window()
+        if not w.size:
+            return "no frames"
+        ms = w * 1000.0
+        return f"{1.0 / w.mean():.1f} FPS  mean {ms.mean():.2f}  sd {ms.std():.2f} ms"
@@ -0,0 +1,50 @@
+import os
+
+from src.python_hero import charts
+from src.python_hero.charts import (
+    _read_header,
+    compiled_path,
+    ensure_compiled,
+    load_chart_arrays,
+    save_chart_to_path,
+)
+
+
+def _touch(path, ns):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + ns))
+
+
+def _no_compile(chart_path):
+    raise AssertionError(f"recompiled {chart_path.name}")
+
+
+def test_touched_chart_is_hashed_once_then_trusted(tmp_path, monkeypatch):
+    chart_path = tmp_path / "song_chart_01.txt"
+    save_chart_to_path(chart_path, [(0, 1.0), (1, 2.0)])
+    bin_path = compiled_path(chart_path)
+    _touch(chart_path, 10**9)
+
+    hashed = []
+    source_hash = charts._source_hash
+    monkeypatch.setattr(
+        charts, "_source_hash", lambda data: hashed.append(1) or source_hash(data)
+    )
+    monkeypatch.setattr(charts, "compile_chart", _no_compile)
+
+    ensure_compiled(chart_path)
+    assert hashed == [1]
+    assert _read_header(bin_path)[5] == chart_path.stat().st_mtime_ns
+    ensure_compiled(chart_path)
+    assert hashed == [1]
+
+
+def test_edited_chart_is_recompiled(tmp_path):
+    chart_path = tmp_path / "song_chart_01.txt"
+    save_chart_to_path(chart_path, [(0, 1.0), (1, 2.0)])
+    chart_path.write_text("2 0.5000\n3 1.5000\n")
+    _touch(chart_path, 10**9)
+
+    lanes, times = load_chart_arrays(chart_path)
+    assert lanes.tolist() == [2, 3]
+    assert times.tolist() == [0.5, 1.5]
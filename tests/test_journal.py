@@ -0,0 +1,62 @@
+import errno
+import os
+
+import pytest
+
+from src.python_hero import config, journal
+from src.python_hero.charts import load_chart_from_path
+from src.python_hero.journal import RecordingJournal, read_journal
+
+
+def _disk_full(fd):
+    raise OSError(errno.ENOSPC, os.strerror(errno.ENOSPC))
+
+
+@pytest.fixture
+def failing_fsync(monkeypatch):
+    monkeypatch.setattr(config, "JOURNAL_FLUSH_INTERVAL", 0.01)
+    monkeypatch.setattr(journal.os, "fsync", _disk_full)
+
+
+def _record(tmp_path, presses=5):
+    take = RecordingJournal(tmp_path / "song_chart_01.txt")
+    for i in range(presses):
+        take.append(i % 5, i * 0.25)
+    return take
+
+
+def test_failed_flush_still_finishes_and_saves_from_memory(tmp_path, failing_fsync):
+    take = _record(tmp_path)
+    take._thread.join(0.1)
+    assert take._thread.is_alive()
+
+    take.finish(save=True)
+    assert take.done.wait(2.0)
+    assert take.error is None
+    assert load_chart_from_path(take.chart_path) == take.notes()
+    assert not take.path.exists()
+
+
+def test_failed_flush_on_quit_keeps_the_journal(tmp_path, failing_fsync):
+    take = _record(tmp_path)
+    take.close()
+    assert take.done.is_set()
+    assert take.error is not None
+    # Whatever reached the file is still there to recover
+    assert take.path.exists()
+    assert read_journal(take.path) is not None
+
+
+def test_discard_after_failed_flush_removes_the_journal(tmp_path, failing_fsync):
+    take = _record(tmp_path)
+    take.finish(save=False)
+    assert take.done.wait(2.0)
+    assert not take.path.exists()
+    assert not take.chart_path.exists()
+
+
+def test_journal_round_trip(tmp_path):
+    take = _record(tmp_path, presses=12)
+    take.close()
+    assert take.error is None
+    assert read_journal(take.path) == take.notes()
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from src.python_hero.charts import ChartReader, save_chart_to_path
+from src.python_hero.gameplay import NoteTrack
+from src.python_hero.judge import Judge
+
+# Exact in binary, so presses land right on the edges
+WINDOWS = [("perfect", 0.0625), ("great", 0.125), ("good", 0.1875), ("miss", 0.25)]
+
+
+def _judge(notes):
+    judge = Judge(NoteTrack.from_notes(notes), WINDOWS)
+    seen = []
+    judge.listeners.append(seen.append)
+    return judge, seen
+
+
+@pytest.mark.parametrize(
+    "offset, grade",
+    [
+        (0.0, "perfect"),
+        (-0.0625, "perfect"),
+        (0.0625, "perfect"),
+        (0.125, "great"),
+        (-0.1875, "good"),
+        (0.1875, "good"),
+        (0.25, "miss"),
+        (-0.25, "miss"),
+    ],
+)
+def test_window_edges_belong_to_the_tighter_grade(offset, grade):
+    judge, _ = _judge([(0, 1.0)])
+    j = judge.press(0, 1.0 + offset)
+    assert (j.grade, j.offset, j.note_index) == (grade, offset, 0)
+
+
+@pytest.mark.parametrize("offset", [-0.25 - 2**-10, 0.25 + 2**-10])
+def test_presses_outside_the_miss_window_are_not_judged(offset):
+    judge, seen = _judge([(0, 1.0)])
+    assert judge.press(0, 1.0 + offset) is None
+    assert seen == []
+
+
+def test_lanes_keep_their_own_queues():
+    judge, _ = _judge([(0, 1.0), (1, 1.0), (2, 1.5)])
+    assert judge.press(3, 1.0) is None
+    assert judge.press(1, 1.0).note_index == 1
+    # Each note is judged once: the lane 1 note is gone
+    assert judge.press(1, 1.0) is None
+    assert judge.press(0, 1.0).note_index == 0
+    assert judge.press(2, 1.5).note_index == 2
+    assert judge.press(7, 1.5) is None
+
+
+def test_closest_pending_note_wins():
+    judge, _ = _judge([(0, 1.0), (0, 1.25)])
+    assert judge.press(0, 1.1875).note_index == 1
+    assert judge.press(0, 1.1875).note_index == 0
+
+
+def test_expire_misses_only_unplayed_notes_past_the_window():
+    judge, seen = _judge([(0, 1.0), (1, 1.0), (0, 2.0)])
+    judge.press(0, 1.0)
+    assert judge.expire(1.25) == 0
+    assert judge.expire(1.25 + 2**-10) == 1
+    assert [(j.grade, j.note_index) for j in seen] == [("perfect", 0), ("miss", 1)]
+    # An expired note cannot be hit any more
+    assert judge.press(1, 1.0) is None
+    assert judge.expire(float("inf")) == 1
+
+
+def test_streamed_track_judges_like_a_full_one(tmp_path):
+    rng = np.random.default_rng(9)
+    times = np.round(np.cumsum(rng.uniform(0.02, 0.3, 5000)), 4)
+    lanes = rng.integers(0, 5, times.size)
+    chart_path = tmp_path / "song_chart_01.txt"
+    save_chart_to_path(chart_path, list(zip(lanes.tolist(), times.tolist())))
+    presses = sorted(
+        (float(t + rng.normal(0, 0.08)), int(lane))
+        for lane, t in zip(lanes, times)
+        if rng.random() < 0.9
+    )
+
+    results = []
+    for track in (
+        NoteTrack(lanes, times),
+        NoteTrack.stream(ChartReader(chart_path)),
+    ):
+        judge = Judge(track, WINDOWS)
+        seen = []
+        judge.listeners.append(seen.append)
+        # Frame by frame, as the game loop does
+        for t, lane in presses:
+            track.spawn(t)
+            judge.expire(t)
+            track.cleanup(t)
+            judge.press(lane, t)
+        judge.expire(float("inf"))
+        track.close()
+        results.append([(j.grade, j.note_index, j.offset) for j in seen])
+    assert results[0] == results[1]
+    assert len(results[0]) == times.size
@@ -0,0 +1,45 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from src.python_hero import config
+from src.python_hero.app import App
+from src.python_hero.headless import FakeMusic
+from src.python_hero.profiler import PROFILER
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    # Save data, the font cache and the assets are scratch folders
+    monkeypatch.chdir(tmp_path)
+    app = App(music=FakeMusic(1.0), assets_dir=tmp_path / "assets")
+    app.wait_until_loaded()
+    yield app
+    app.prefetch.close()
+    app.data.close()
+    pygame.quit()
+
+
+@pytest.mark.parametrize("mode", ["uncapped", "vsync"])
+def test_overlay_in_game_without_a_frame_rate(app, monkeypatch, mode):
+    monkeypatch.setitem(config.FRAME_MODES, config.FRAME_MODE, config.FRAME_MODES[mode])
+    app.state = "game"
+    assert app._frame_rate(0.0) == 0.0
+
+    # No frames measured yet: the FPS budget
+    assert app._frame_budget_ms(0.0) == pytest.approx(1000.0 / config.FPS)
+    for _ in range(10):
+        app.frame_stats.record(0.004)
+    assert app._frame_budget_ms(0.0) == pytest.approx(4.0)
+    assert app.frame_stats.summary() == "250.0 FPS  mean 4.00  sd 0.00 ms"
+
+    PROFILER.toggle()
+    try:
+        app._draw_profiler(0.0)
+    finally:
+        PROFILER.toggle()
+    assert app.profiler_panel is not None
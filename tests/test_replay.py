@@ -0,0 +1,68 @@
+import numpy as np
+
+from src.python_hero.charts import (
+    ChartReader,
+    load_chart_arrays,
+    save_chart_to_path,
+)
+from src.python_hero.gameplay import NoteTrack
+from src.python_hero.replay import Ghost, Replay, play_back, quantize
+
+
+def _chart_and_run(tmp_path, notes=3000, seed=7):
+    rng = np.random.default_rng(seed)
+    times = np.cumsum(rng.uniform(0.05, 0.4, notes))
+    lanes = rng.integers(0, 5, notes)
+    chart_path = tmp_path / "song_chart_01.txt"
+    save_chart_to_path(chart_path, list(zip(lanes.tolist(), times.tolist())))
+
+    # Mostly close presses, some sloppy ones and some stray ones
+    presses = []
+    for lane, t in zip(lanes.tolist(), times.tolist()):
+        if rng.random() < 0.8:
+            presses.append((lane, quantize(t + rng.normal(0, 0.06))))
+        if rng.random() < 0.1:
+            presses.append((int(rng.integers(0, 5)), quantize(t + 0.5)))
+    presses.sort(key=lambda p: p[1])
+    return chart_path, Replay(bytes(16), "P1", 0, notes, presses)
+
+
+def test_ghost_streams_the_same_score_as_a_full_play_back(tmp_path):
+    chart_path, replay = _chart_and_run(tmp_path)
+    full = NoteTrack(*load_chart_arrays(chart_path))
+    hit_times = np.sort([j.judged_at for j in play_back(replay, full) if j.is_hit])
+
+    ghost = Ghost(replay, NoteTrack.stream(ChartReader(chart_path)))
+    try:
+        for t in np.arange(0.0, replay.presses[-1][1] + 2.0, 1 / 60):
+            expected = int(np.searchsorted(hit_times, t, side="right"))
+            assert ghost.score_at(t) == expected
+            # Only a window around the song time is held, never the chart
+            assert ghost.track.times.size < 200
+    finally:
+        ghost.close()
+    assert ghost.hits == hit_times.size
+
+
+def test_codec_round_trip_with_backwards_steps():
+    rng = np.random.default_rng(3)
+    times = np.cumsum(rng.exponential(0.15, 2000))
+    # Clock slew: some presses land before the previous one
+    times[rng.random(times.size) < 0.05] -= 0.02
+    presses = [
+        (int(lane), quantize(t))
+        for lane, t in zip(rng.integers(0, 5, times.size), times)
+    ]
+    # Long gaps and the first press before zero take multi-byte varints
+    presses[:0] = [(4, quantize(-0.75)), (0, quantize(600.0))]
+    replay = Replay(b"0123456789abcdef", "Näme", 1500, 2000, presses, 1.7e9)
+
+    decoded = Replay.decode(replay.encode())
+    assert decoded == replay
+    deltas = np.diff([t for _, t in decoded.presses])
+    assert (deltas < 0).any()
+
+
+def test_codec_empty_run():
+    replay = Replay(bytes(16), "", 0, 0, [], 0.0)
+    assert Replay.decode(replay.encode()) == replay
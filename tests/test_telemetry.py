@@ -0,0 +1,101 @@
+from dataclasses import asdict
+
+import numpy as np
+import pytest
+
+from src.python_hero import config
+from src.python_hero.judge import Judgement
+from src.python_hero.telemetry import OffsetStats, P2Quantile, Welford
+
+
+def _offsets(n=20_000, seed=11):
+    """Press offsets (seconds) inside the miss window, slightly late on average."""
+    rng = np.random.default_rng(seed)
+    reach = config.MISS_WINDOW_MS / 1000.0 - 1e-6
+    return np.clip(rng.normal(0.004, 0.035, n), -reach, reach)
+
+
+def _judgements(offsets, seed=5):
+    lanes = np.random.default_rng(seed).integers(
+        0, len(config.LANE_COLORS), offsets.size
+    )
+    return [
+        Judgement("great", int(lane), i, 1.0 + i, 1.0 + i + off, float(off))
+        for i, (lane, off) in enumerate(zip(lanes, offsets))
+    ], lanes
+
+
+def test_welford_matches_numpy_and_merges_exactly():
+    xs = _offsets()
+    full, left, right = Welford(), Welford(), Welford()
+    for x in xs:
+        full.add(x)
+    for x in xs[:7000]:
+        left.add(x)
+    for x in xs[7000:]:
+        right.add(x)
+    left.merge(right)
+
+    for w in (full, left):
+        assert w.count == xs.size
+        assert w.mean == pytest.approx(xs.mean(), abs=1e-12)
+        assert w.std == pytest.approx(np.std(xs, ddof=1), rel=1e-9)
+
+
+@pytest.mark.parametrize("p", [0.05, 0.5, 0.95, 0.99])
+def test_p2_quantile_tracks_numpy_percentile(p):
+    xs = _offsets()
+    q = P2Quantile(p)
+    for x in xs:
+        q.add(x)
+    # Five markers, no samples: within a few percent of the spread
+    assert q.value == pytest.approx(np.percentile(xs, p * 100), abs=0.05 * xs.std())
+
+
+def test_p2_quantile_is_exact_before_five_samples():
+    q = P2Quantile(0.5)
+    for x in (0.3, -0.1, 0.2):
+        q.add(x)
+    assert q.value == 0.2
+
+
+def test_offset_stats_match_numpy():
+    xs = _offsets()
+    judgements, lanes = _judgements(xs)
+    stats = OffsetStats()
+    for j in judgements:
+        stats.add(j)
+    stats.add(Judgement("miss", 0, -1, 0.5, 0.8))
+
+    assert stats.offsets.std == pytest.approx(np.std(xs, ddof=1), rel=1e-9)
+    for lane, w in enumerate(stats.lanes):
+        assert w.std == pytest.approx(np.std(xs[lanes == lane], ddof=1), rel=1e-9)
+    assert stats.misses == 1
+    assert stats.early_ratio == pytest.approx((xs < 0).mean())
+
+    # Histogram percentiles: within one bin
+    bin_s = config.OFFSET_BIN_MS / 1000.0
+    assert stats.quantile(0.5) == pytest.approx(np.percentile(xs, 50), abs=bin_s)
+    assert stats.quantile(0.95, absolute=True) == pytest.approx(
+        np.percentile(np.abs(xs), 95), abs=bin_s
+    )
+
+
+def test_offset_stats_merge_and_reload_like_one_run():
+    xs = _offsets()
+    judgements, _ = _judgements(xs)
+    whole, first, second = OffsetStats(), OffsetStats(), OffsetStats()
+    for j in judgements:
+        whole.add(j)
+    for j in judgements[:5000]:
+        first.add(j)
+    for j in judgements[5000:]:
+        second.add(j)
+
+    # As saved with the profile
+    merged = OffsetStats.from_dict(asdict(first))
+    merged.merge(second)
+    assert merged.histogram == whole.histogram
+    assert (merged.early, merged.late) == (whole.early, whole.late)
+    assert merged.offsets.std == pytest.approx(whole.offsets.std, rel=1e-9)
+    assert merged.summary() == pytest.approx(whole.summary())